@@ -0,0 +1,52 @@
+"""Load test of `pokemaster2.db.aio`."""
+import asyncio
+import os
+import random
+import time
+
+import numpy as np
+import peewee
+import pytest
+
+from pokemaster2.db import default, io, tables
+from pokemaster2.db.aio import AsyncPokedex
+
+# Number of concurrent requests per round.
+REQUESTS = int(os.environ.get("POKEMASTER2_BENCH_REQUESTS", "5000"))
+# Fail if the 99th percentile latency exceeds this, in seconds.
+P99_BUDGET = float(os.environ.get("POKEMASTER2_BENCH_P99", "2.0"))
+
+
+@pytest.fixture(scope="module")
+def pokedex_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("aio") / "pokedex.sqlite3"
+    database = peewee.SqliteDatabase(str(path))
+    io.load(database, csv_dir=default.csv_dir())
+    with database.bind_ctx(tables.MODELS):
+        identifiers = [pokemon.identifier for pokemon in tables.Pokemon.select()]
+    database.close()
+    return str(path), identifiers
+
+
+async def _concurrent_requests(path, identifiers):
+    async def timed(identifier):
+        start = time.perf_counter()
+        await pokedex.get_pokemon(identifier)
+        return time.perf_counter() - start
+
+    async with AsyncPokedex(path) as pokedex:
+        return await asyncio.gather(*(timed(identifier) for identifier in identifiers))
+
+
+def test_concurrent_get_pokemon(benchmark, pokedex_path):
+    path, identifiers = pokedex_path
+    requests = random.Random(0).choices(identifiers, k=REQUESTS)
+    latencies = []
+
+    def run():
+        latencies.extend(asyncio.run(_concurrent_requests(path, requests)))
+
+    benchmark.pedantic(run, rounds=3, iterations=1)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    benchmark.extra_info.update(requests=REQUESTS, p50=p50, p99=p99)
+    assert p99 < P99_BUDGET
@@ -0,0 +1,51 @@
+"""Benchmarks for `pokemaster2.db.arrays`."""
+import numpy as np
+import pytest
+
+from pokemaster2.db import arrays
+
+POKEMON = 800
+VERSION_GROUPS = 20
+MOVES_PER_POKEMON = 20
+POPULATION = 1_000_000
+
+
+@pytest.fixture(scope="module")
+def learnset():
+    rng = np.random.default_rng(0)
+    pokemon, version_groups, _ = np.meshgrid(
+        np.arange(1, POKEMON + 1),
+        np.arange(1, VERSION_GROUPS + 1),
+        np.arange(MOVES_PER_POKEMON),
+        indexing="ij",
+    )
+    size = pokemon.size
+    rows = np.stack(
+        [
+            pokemon.ravel(),
+            version_groups.ravel(),
+            rng.integers(1, 500, size),
+            rng.integers(1, 101, size),
+            np.zeros(size, dtype=np.int64),
+        ],
+        axis=1,
+    )
+    return arrays.Learnset.from_rows(rows)
+
+
+def test_learnset_movesets(benchmark, learnset):
+    """Pick the moves of a million wild Pokémon."""
+    rng = np.random.default_rng(1)
+    pokemon_ids = rng.integers(1, POKEMON + 1, POPULATION)
+    levels = rng.integers(1, 101, POPULATION)
+    benchmark(learnset.movesets, pokemon_ids, 8, levels)
+
+
+def test_learnset_learned_many(benchmark, learnset):
+    """Level up a million Pokémon by 1 to 10 levels."""
+    rng = np.random.default_rng(2)
+    pokemon_ids = rng.integers(1, POKEMON + 1, POPULATION)
+    levels = rng.integers(1, 91, POPULATION)
+    benchmark(
+        learnset.learned_many, pokemon_ids, 8, levels, levels + rng.integers(1, 11, POPULATION)
+    )
@@ -0,0 +1,49 @@
+"""Benchmarks for `pokemaster2.battle`."""
+import numpy as np
+
+from pokemaster2 import battle, damage
+from pokemaster2.battle import MoveTable, Team
+from pokemaster2.db.arrays import TypeChart
+
+BATTLES = 10_000
+TEAMS = 100
+MOVES = 200
+TYPES = 18
+
+
+def test_run(benchmark):
+    """10k battles of random teams of 6, with the greedy policy."""
+    rng = np.random.default_rng(0)
+    chart = TypeChart.from_rows(
+        [
+            [attacking, defending, rng.choice([0, 50, 100, 200], p=[0.02, 0.2, 0.6, 0.18])]
+            for attacking in range(1, TYPES + 1)
+            for defending in range(1, TYPES + 1)
+        ]
+    )
+    moves = MoveTable.create(
+        ids=np.arange(1, MOVES + 1),
+        power=rng.integers(0, 150, MOVES),
+        type_id=rng.integers(1, TYPES + 1, MOVES),
+        damage_class=rng.choice([1, damage.PHYSICAL, damage.SPECIAL], MOVES),
+        accuracy=rng.choice([0, 70, 90, 100], MOVES),
+        ailment=rng.choice(5, MOVES, p=[0.8, 0.05, 0.05, 0.05, 0.05]),
+        effect_chance=rng.choice([0, 10, 30, 100], MOVES),
+    )
+    teams = [
+        Team(
+            stats=rng.integers(50, 400, (battle.TEAM_SIZE, 6)),
+            levels=np.full(battle.TEAM_SIZE, 50),
+            types=np.stack(
+                [
+                    rng.integers(1, TYPES + 1, battle.TEAM_SIZE),
+                    rng.integers(0, TYPES + 1, battle.TEAM_SIZE),
+                ],
+                axis=1,
+            ),
+            moves=rng.integers(1, MOVES + 1, (battle.TEAM_SIZE, battle.MOVES_PER_POKEMON)),
+        )
+        for _ in range(TEAMS)
+    ]
+    matchups = rng.integers(0, TEAMS, (BATTLES, 2))
+    benchmark.pedantic(battle.run, args=(teams, matchups, moves, chart), rounds=3)
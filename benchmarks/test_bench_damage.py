@@ -0,0 +1,39 @@
+"""Benchmarks for `pokemaster2.damage`."""
+import numpy as np
+
+from pokemaster2 import damage
+from pokemaster2.db.arrays import TypeChart
+
+SPECIES = 800
+MOVES = 100
+TYPES = 18
+
+
+def test_damage_ranges(benchmark):
+    """Every species against every species, with 100 moves: 64M pairings."""
+    rng = np.random.default_rng(0)
+    chart = TypeChart.from_rows(
+        [
+            [attacking, defending, rng.choice([0, 50, 100, 200], p=[0.02, 0.2, 0.6, 0.18])]
+            for attacking in range(1, TYPES + 1)
+            for defending in range(1, TYPES + 1)
+        ]
+    )
+    stats = rng.integers(20, 400, size=(SPECIES, 6))
+    types = np.stack(
+        [rng.integers(1, TYPES + 1, SPECIES), rng.integers(0, TYPES + 1, SPECIES)], axis=1
+    )
+    benchmark.pedantic(
+        damage.damage_ranges,
+        args=(
+            stats,
+            types,
+            stats,
+            types,
+            rng.integers(0, 150, MOVES),
+            rng.integers(1, TYPES + 1, MOVES),
+            rng.integers(1, 4, MOVES),
+            chart,
+        ),
+        rounds=3,
+    )
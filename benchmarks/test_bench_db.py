@@ -0,0 +1,61 @@
+"""Benchmarks for `pokemaster2.db`."""
+import os
+
+import peewee
+import pytest
+
+from pokemaster2.db import default, io, search, synthetic, tables
+
+# Comma-separated numbers of rows per table of the synthetic datasets,
+# e.g. `POKEMASTER2_BENCH_SCALES=10000,1000000`.
+SCALES = [int(scale) for scale in os.environ.get("POKEMASTER2_BENCH_SCALES", "10000").split(",")]
+
+
+def _load(csv_dir: str = None, **kwargs) -> peewee.SqliteDatabase:
+    database = peewee.SqliteDatabase(":memory:")
+    io.load(database, csv_dir=csv_dir or default.csv_dir(), **kwargs)
+    return database
+
+
+@pytest.fixture(scope="module")
+def loaded_db():
+    database = _load()
+    yield database
+    database.close()
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=lambda scale: f"{scale}rows")
+def synthetic_dir(request, tmp_path_factory):
+    csv_dir = tmp_path_factory.mktemp(f"synthetic-{request.param}")
+    synthetic.generate(csv_dir, request.param)
+    return str(csv_dir)
+
+
+def test_load_bundled_csv(benchmark):
+    benchmark.pedantic(_load, rounds=5, iterations=1)
+
+
+def test_load_synthetic(benchmark, synthetic_dir):
+    benchmark.pedantic(lambda: _load(synthetic_dir).close(), rounds=3, iterations=1)
+
+
+def test_load_synthetic_checkpointed(benchmark, synthetic_dir):
+    """Compare with `test_load_synthetic`: the cost of committing checkpoints."""
+    benchmark.pedantic(
+        lambda: _load(synthetic_dir, checkpoint=10000).close(), rounds=3, iterations=1
+    )
+
+
+def test_generate_synthetic(benchmark, tmp_path):
+    benchmark.pedantic(synthetic.generate, args=(tmp_path, 10000), rounds=3, iterations=1)
+
+
+def test_get_pokemon(benchmark, loaded_db):
+    database = loaded_db
+    with database.bind_ctx(tables.MODELS):
+        benchmark(lambda: list(tables.get_pokemon("pikachu")))
+
+
+@pytest.mark.parametrize("text", ["pi", "chu", "mr. mime"])
+def test_search(benchmark, loaded_db, text):
+    benchmark(search.search, text, 10, loaded_db)
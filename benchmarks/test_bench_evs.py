@@ -0,0 +1,34 @@
+"""Benchmarks for `pokemaster2.evs`."""
+from pokemaster2 import evs
+from pokemaster2.pokemon import Stats
+
+GARCHOMP = dict(
+    base_stats=Stats(108, 130, 95, 80, 85, 102),
+    iv=Stats(31, 31, 31, 31, 31, 31),
+    nature="jolly",
+)
+
+
+def test_optimize_speed_then_bulk_and_attack(benchmark):
+    benchmark(
+        evs.optimize,
+        50,
+        **GARCHOMP,
+        minimums=Stats(0, 0, 0, 0, 0, 160),
+        maximize=["hp", "atk"],
+    )
+
+
+def test_optimize_constraint(benchmark):
+    def bulky(stats):
+        return (stats[:, 0] * stats[:, 2] >= 100_000) & (stats[:, 0] * stats[:, 4] >= 90_000)
+
+    benchmark(
+        evs.optimize,
+        100,
+        **GARCHOMP,
+        minimums=Stats(0, 0, 0, 0, 0, 280),
+        maximize=["atk"],
+        constraint=bulky,
+        constrained=["hp", "def_", "spdef"],
+    )
@@ -0,0 +1,21 @@
+"""Benchmarks for `pokemaster2.ivs`."""
+import numpy as np
+
+from pokemaster2 import ivs
+
+BATCH = 10_000
+OBSERVATIONS = 3
+
+
+def test_candidate_ivs(benchmark):
+    """Check a batch of Pokémon observed at 3 levels each."""
+    rng = np.random.default_rng(0)
+    base_stats = rng.integers(5, 256, size=(BATCH, 6))
+    natures = rng.integers(0, 25, size=BATCH)
+    levels = np.sort(rng.integers(1, 101, size=(BATCH, OBSERVATIONS)), axis=1)
+    evs = np.sort(rng.integers(0, 256, size=(BATCH, OBSERVATIONS, 6)), axis=1)
+    true_ivs = rng.integers(0, 32, size=(BATCH, 1, 6))
+    stats = ivs.calc_stats(
+        levels, base_stats[:, np.newaxis], true_ivs, evs, natures[:, np.newaxis]
+    )
+    benchmark(ivs.candidate_ivs, base_stats, natures, levels, stats, evs)
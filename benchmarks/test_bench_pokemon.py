@@ -0,0 +1,58 @@
+"""Benchmarks for `pokemaster2.pokemon`."""
+from pokemaster2.pokemon import BasePokemon, Stats, _calc_stats, refresh
+
+BASE_STATS = Stats(108, 130, 95, 80, 85, 102)
+IV = Stats(24, 12, 30, 16, 23, 5)
+EV = Stats(74, 190, 91, 48, 84, 23)
+
+
+def test_stats_add(benchmark):
+    benchmark(Stats.__add__, IV, EV)
+
+
+def test_stats_floordiv(benchmark):
+    benchmark(Stats.__floordiv__, EV, 4)
+
+
+def test_create_iv(benchmark):
+    benchmark(Stats.create_iv, 0x5EE9629C)
+
+
+def test_calc_stats(benchmark):
+    benchmark(_calc_stats, 78, BASE_STATS, IV, EV, "adamant")
+
+
+def _population(n):
+    return [
+        BasePokemon(
+            national_id=445,
+            species="garchomp",
+            types=["dragon", "ground"],
+            item_held=None,
+            exp=0,
+            level=level % 100 + 1,
+            base_stats=BASE_STATS,
+            iv=IV,
+            current_stats=Stats.zeros(),
+            ev=EV,
+            pid=0,
+            gender="male",
+            nature="adamant",
+            ability="sand-veil",
+        )
+        for level in range(n)
+    ]
+
+
+def test_ev_training(benchmark):
+    """1000 EV gains on a population of 1000, stats refreshed once."""
+    population = _population(1000)
+    refresh(population)
+    gain = Stats(0, 1, 0, 0, 0, 0)
+
+    def train():
+        for member in population:
+            member.gain_ev(gain)
+        refresh(population)
+
+    benchmark(train)
@@ -0,0 +1,39 @@
+"""Benchmarks for `pokemaster2.prng`."""
+import numpy as np
+
+from pokemaster2.prng import PRNG, MersenneTwister, mt_outputs
+
+
+def test_call(benchmark):
+    prng = PRNG(0x1A56B091)
+    benchmark(prng)
+
+
+def test_next(benchmark):
+    prng = PRNG(0x1A56B091)
+    benchmark(prng.next_, 1000)
+
+
+def test_next_array(benchmark):
+    prng = PRNG(0x1A56B091)
+    benchmark(prng.next_array, 1000)
+
+
+def test_generate_pid_and_iv(benchmark):
+    prng = PRNG(0x560B9CE3)
+    benchmark(prng.generate_pid_and_iv, 2)
+
+
+def test_next_array_gen_5(benchmark):
+    prng = PRNG(0x0123456789ABCDEF, gen=5)
+    benchmark(prng.next_array, 1000)
+
+
+def test_mersenne_twister_next_array(benchmark):
+    mt = MersenneTwister(0x1A56B091)
+    benchmark(mt.next_array, 1000)
+
+
+def test_mt_outputs(benchmark):
+    seeds = np.arange(10_000, dtype=np.uint32)
+    benchmark(mt_outputs, seeds, 8)
@@ -0,0 +1,13 @@
+"""Benchmarks for `pokemaster2.seeds`."""
+from pokemaster2 import seeds
+from pokemaster2.pokemon import Stats
+
+
+def test_search_year(benchmark):
+    """A year-wide search over 100 delays and 10 frames: 6 million frames."""
+
+    def run():
+        hits = seeds.search(2008, range(600, 700), frames=10, min_ivs=Stats(30, 0, 30, 30, 30, 30))
+        return seeds.best(hits)
+
+    benchmark.pedantic(run, rounds=3, iterations=1)
@@ -23,6 +23,11 @@ def test_pokemon_species():
         id=1,
         identifier="test-species",
         evolves_from=None,
+        generation_id=1,
+        evolution_chain_id=1,
+        color_id=1,
+        shape_id=1,
+        growth_rate_id=1,
         gender_rate=8,
         capture_rate=255,
         base_happiness=0,
@@ -50,6 +55,32 @@ def test_pokemon():
     )
 
 
+@pytest.fixture
+def species_db(test_db):
+    """A database with two species, one of them with NULLs."""
+    for i in (1, 2):
+        PokemonSpecies.create(
+            id=i,
+            identifier=f"species-{i}",
+            evolves_from_species_id=None if i == 1 else 1,
+            generation_id=1,
+            evolution_chain_id=1,
+            color_id=1,
+            shape_id=1,
+            growth_rate_id=1,
+            gender_rate=1,
+            capture_rate=45,
+            base_happiness=70,
+            is_baby=i == 2,
+            hatch_counter=20,
+            has_gender_differences=False,
+            forms_switchable=False,
+            order=i,
+            conquest_order=None if i == 1 else 7,
+        )
+    yield test_db
+
+
 @pytest.fixture(scope="session")
 def test_csv_dir(tmp_path_factory):
     """Create a temp path for `data/csv`."""
@@ -0,0 +1 @@
+An asyncio facade, `pokemaster2.db.aio.AsyncPokedex`, that runs Pokédex queries on a thread pool of read-only connections and coalesces concurrent lookups into batched queries.
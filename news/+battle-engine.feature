@@ -0,0 +1 @@
+Battle engine, `pokemaster2.battle.run`: plays many single battles of 6 against 6 at once as arrays, with statuses, stat stages and greedy or random move choices, optionally in worker processes, with results independent of the chunking thanks to a PRNG substream per battle.
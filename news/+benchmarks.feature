@@ -0,0 +1 @@
+A pytest-benchmark suite (`inv bench`, `inv bench-compare`, `nox -s bench`) covering the PRNG, `Stats`, stat calculation and database loading.
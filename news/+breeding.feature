@@ -0,0 +1 @@
+Batch egg generation with IV inheritance and baby-species resolution, plus a batched hatch-step scheduler.
@@ -0,0 +1 @@
+Gen. 3 capture-probability calculator with scalar, array and Monte Carlo APIs.
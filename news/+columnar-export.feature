@@ -0,0 +1 @@
+An `export` command writing tables to Parquet, Arrow or npz files, and `PokedexSnapshot` to memory-map Arrow/npz exports back.
@@ -0,0 +1 @@
+Damage calculator, `pokemaster2.damage.damage_ranges`: the damage range and KO chance of every attacker, defender and move at once, on top of a `type_efficacy` table and its dense matrix, `pokemaster2.db.arrays.TypeChart`.
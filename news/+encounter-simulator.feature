@@ -0,0 +1 @@
+Monte Carlo wild-encounter simulator with reproducible, jump-ahead PRNG substreams across worker processes.
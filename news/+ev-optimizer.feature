@@ -0,0 +1 @@
+EV spread optimizer, `pokemaster2.evs.optimize`: the Pareto-optimal legal spreads reaching stat minimums and multi-stat benchmarks, enumerated over the breakpoints of the stat formula with NumPy.
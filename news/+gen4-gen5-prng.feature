@@ -0,0 +1 @@
+Gen. 4 and 5 random number generators: `PRNG(gen=4)` and the 64-bit `PRNG(gen=5)`, the Mersenne Twister `MersenneTwister`, and array functions (`lcg64_seeds`, `lcg64_outputs`, `mt_outputs`) with jump-ahead for scanning many seeds at once.
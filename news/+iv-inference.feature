@@ -0,0 +1 @@
+IV inference, `pokemaster2.ivs`: batch stat calculation and the IV ranges consistent with stats observed at one or more levels, for thousands of Pokémon at once.
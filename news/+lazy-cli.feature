@@ -0,0 +1 @@
+The CLI imports the database layer only when a subcommand runs, so `--help` and `--version` start faster.
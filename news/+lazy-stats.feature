@@ -0,0 +1 @@
+`BasePokemon.stats` is computed lazily and cached until its level, base stats, IVs, EVs or nature change; `pokemaster2.pokemon.refresh` recomputes the stale stats of a population in one batch.
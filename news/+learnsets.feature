@@ -0,0 +1 @@
+Move and learnset tables (`moves`, `pokemon_moves`, `pokemon_move_methods`), and `pokemaster2.db.arrays.Learnset`, an in-memory index of level-up moves bisected by level, to pick the moves of wild Pokémon or level up a whole population without a query per Pokémon.
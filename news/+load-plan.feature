@@ -0,0 +1 @@
+More veekun tables (regions, generations, versions, growth rates, evolution chains, colors, shapes, habitats, damage classes, stats, types, Pokémon stats and types), with table names matching the veekun CSV files; `io.load` loads tables in foreign-key phases, can read CSV files in parallel (`pokemaster2 load -j N`), and creates tables without CSV files empty.
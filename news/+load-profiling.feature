@@ -0,0 +1 @@
+`load --profile`, `--profile-json` and `--cprofile` report wall/CPU time, rows/s, batches and peak RSS per table and load phase.
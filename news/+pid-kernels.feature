@@ -0,0 +1 @@
+Vectorized shiny, Hidden Power and characteristic kernels for batches of PIDs and IV genes.
@@ -0,0 +1 @@
+A `query` command that streams table rows to stdout as csv, tsv or jsonl, with filters, column selection, `--limit` and `--batch-size`.
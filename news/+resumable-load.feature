@@ -0,0 +1 @@
+Resumable loads, `pokemaster2 load --checkpoint N` and `--resume`: commit every N rows and at the end of every table, record the byte offset and line reached in each CSV file in a `load_checkpoints` table, and continue an interrupted load from there.
@@ -0,0 +1 @@
+Type-ahead search over Pokémon and species identifiers (`pokemaster2.db.search.search`, `pokemaster2 search`), backed by an SQLite FTS5 trigram index that `io.load` refreshes per table.
@@ -0,0 +1 @@
+Gen. 4 initial seed search, `pokemaster2.seeds.search`, over dates, times and delays, with NumPy and optional worker processes; hits are streamed best first and mapped back to the times that produce them.
@@ -0,0 +1 @@
+Shared-memory Pokédex, `pokemaster2.db.shared.publish_pokedex`: publishes the species, type chart and learnset arrays, plus population arrays, once in shared memory, for worker processes to attach to as read-only NumPy views without copying.
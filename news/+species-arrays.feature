@@ -0,0 +1 @@
+Vectorized gender, ability slot and nature derivation for batches of PIDs, backed by dense per-species arrays.
@@ -0,0 +1 @@
+A deterministic synthetic dataset generator, `pokemaster2.db.synthetic`, writing valid CSVs for every table at up to 10^8 rows for load and query stress tests.
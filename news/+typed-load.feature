@@ -0,0 +1 @@
+`io.load` converts CSV values to the column types with a compiled per-table converter, stores empty nullable values as NULL, and reports bad rows with their line numbers (`strict=True` stops at the first one).
@@ -58,6 +58,14 @@ def tests(session: Session) -> None:
             session.notify("coverage")
 
 
+@nox.session(python="3.10")
+def bench(session: Session) -> None:
+    """Run the benchmarks; extra arguments are passed to `inv bench`."""
+    session.install(".")
+    install_with_constraints(session, "invoke", "pytest", "pytest-benchmark")
+    session.run("inv", "bench", *session.posargs)
+
+
 @nox.session
 def coverage(session: Session) -> None:
     """Produce the coverage report."""
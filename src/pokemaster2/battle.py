@@ -0,0 +1,744 @@
+"""Simulate many single battles at once.
+
+Battles are stored as arrays with a leading axis of battles, then an axis
+of the two sides, so `step` plays one turn of every battle with a fixed
+number of NumPy operations, whatever the number of battles.
+
+Each turn, both active Pokémon use a move, the one with the higher
+priority first, then the faster one. A move may miss, deals damage with
+the formula of `damage.hit_damage`, and may inflict a status or change
+stat stages. Burned and poisoned Pokémon lose 1/8 of their HP at the end
+of the turn, and a side whose active Pokémon faints sends out the next
+Pokémon of its team. Critical hits, PP, abilities, items and switching
+by choice are left out.
+
+Every turn of every battle draws the same random numbers from the Gen. 3
+PRNG of the battle, used or not:
+
+    [move] [move] [speed tie] then for each of the two actions:
+    [paralysis] [accuracy] [roll] [effect] [sleep turns]
+
+so battle `b` of a run always uses the `b`-th block of `max_turns` turns
+of one PRNG stream, found by jump-ahead. A battle gives the same result
+alone or among millions, and in any number of worker processes.
+"""
+import concurrent.futures
+from typing import Any, Dict, Sequence, Tuple, Type, TypeVar
+
+import attr
+import numpy as np
+import peewee
+from numpy.typing import ArrayLike
+
+from pokemaster2.damage import MAX_ROLL, MIN_ROLL, PHYSICAL, ROLLS, SPECIAL, hit_damage
+from pokemaster2.db.arrays import TypeChart
+from pokemaster2.db.tables import Move
+from pokemaster2.pokemon import STAT_NAMES, BasePokemon
+from pokemaster2.prng import lcg_jump, lcg_outputs, lcg_seeds
+
+M = TypeVar("M", bound="MoveTable")
+T = TypeVar("T", bound="Team")
+B = TypeVar("B", bound="Battles")
+R = TypeVar("R", bound="BattleResult")
+
+TEAM_SIZE = 6
+MOVES_PER_POKEMON = 4
+
+# Statuses.
+HEALTHY, BURNED, PARALYZED, POISONED, ASLEEP = range(5)
+# Stat stages of the active Pokémon: the stats but HP, then accuracy and evasion.
+ATK, DEF, SPATK, SPDEF, SPD, ACCURACY, EVASION = range(7)
+MAX_STAGE = 6
+
+# Winners of battles that are not over, or ended in a draw.
+ONGOING = -1
+DRAW = 2
+
+POLICIES = ("greedy", "random")
+
+_SIDES = np.array([0, 1])
+_CALLS_PER_ACTION = 5
+CALLS_PER_TURN = 3 + 2 * _CALLS_PER_ACTION
+# Battles are compacted once fewer than this share of them go on.
+_COMPACT_RATIO = 0.5
+# Statuses that cost HP at the end of every turn.
+_DAMAGING_STATUSES = (BURNED, POISONED)
+
+
+def _stage_ratio(stats: np.ndarray, stages: np.ndarray, base: int = 2) -> np.ndarray:
+    """Apply stat stages: x (2 + stage) / 2 when raised, x 2 / (2 - stage) when lowered."""
+    return stats * np.maximum(base, base + stages) // np.maximum(base, base - stages)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class MoveTable:
+    """The battle data of moves, indexed by move id.
+
+    Index 0 and ids missing from the table are empty move slots. The
+    effect of a move, a status and a stat stage change, happens when the
+    move hits, with a chance of `effect_chance` percent.
+
+    Attributes:
+        power: Base power; 0 for moves dealing no direct damage.
+        type_id: Type ids.
+        damage_class: `damage.PHYSICAL`, `damage.SPECIAL`, or anything
+            else for status moves.
+        accuracy: Accuracy in percent; 0 for moves that never miss.
+        priority: Priority brackets.
+        ailment: The status inflicted on the target, e.g. `BURNED`.
+        stage: The stat stage changed, e.g. `ATK`; -1 for none.
+        stage_change: The number of stages to add.
+        stage_self: Whether the stage change applies to the user instead
+            of the target.
+        effect_chance: Chance of the effect, in percent.
+    """
+
+    power: np.ndarray
+    type_id: np.ndarray
+    damage_class: np.ndarray
+    accuracy: np.ndarray
+    priority: np.ndarray
+    ailment: np.ndarray
+    stage: np.ndarray
+    stage_change: np.ndarray
+    stage_self: np.ndarray
+    effect_chance: np.ndarray
+
+    @classmethod
+    def create(
+        cls: Type[M],
+        ids: ArrayLike,
+        power: ArrayLike,
+        type_id: ArrayLike,
+        damage_class: ArrayLike,
+        accuracy: ArrayLike = 0,
+        priority: ArrayLike = 0,
+        ailment: ArrayLike = HEALTHY,
+        stage: ArrayLike = -1,
+        stage_change: ArrayLike = 0,
+        stage_self: ArrayLike = False,
+        effect_chance: ArrayLike = 0,
+    ) -> M:
+        """Build the table from columns of moves.
+
+        Arguments but `ids` broadcast against it; see the attributes.
+
+        Args:
+            ids: Move ids.
+            power: Base power.
+            type_id: Type ids.
+            damage_class: Damage class ids.
+            accuracy: Accuracy in percent, 0 to never miss.
+            priority: Priority brackets.
+            ailment: Statuses inflicted.
+            stage: Stat stages changed.
+            stage_change: Stages added.
+            stage_self: Whether the user gets the stage change.
+            effect_chance: Chance of the effects, in percent.
+
+        Returns:
+            A `MoveTable` instance.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        size = int(ids.max()) + 1 if len(ids) else 1
+        columns = {}
+        for name, values, dtype, padding in (
+            ("power", power, np.int32, 0),
+            ("type_id", type_id, np.int32, 0),
+            ("damage_class", damage_class, np.int8, 0),
+            ("accuracy", accuracy, np.int16, 0),
+            ("priority", priority, np.int8, 0),
+            ("ailment", ailment, np.int8, HEALTHY),
+            ("stage", stage, np.int8, -1),
+            ("stage_change", stage_change, np.int8, 0),
+            ("stage_self", stage_self, bool, False),
+            ("effect_chance", effect_chance, np.int16, 0),
+        ):
+            column = np.full(size, padding, dtype=dtype)
+            column[ids] = np.broadcast_to(values, ids.shape)
+            columns[name] = column
+        return cls(**columns)
+
+    @classmethod
+    def from_database(cls: Type[M]) -> M:
+        """Read `Move` from its bound database.
+
+        The schema has no data on the effects of moves yet, so moves read
+        from the database have none.
+
+        Returns:
+            A `MoveTable` instance.
+        """
+        rows = np.array(
+            list(
+                Move.select(
+                    Move.id,
+                    peewee.fn.COALESCE(Move.power, 0),
+                    Move.type_id,
+                    Move.damage_class_id,
+                    peewee.fn.COALESCE(Move.accuracy, 0),
+                    Move.priority,
+                ).tuples()
+            ),
+            dtype=np.int64,
+        ).reshape(-1, 6)
+        return cls.create(*rows.T)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Team:
+    """A team of up to 6 Pokémon, as arrays padded to `TEAM_SIZE`.
+
+    Empty slots have 0 HP, so they count as fainted.
+
+    Attributes:
+        stats: Stats, shape `(6, 6)`, in the order of `STAT_NAMES`.
+        levels: Levels, shape `(6,)`.
+        types: Type ids, shape `(6, 2)`; 0 for no second type.
+        moves: Move ids, shape `(6, 4)`; 0 for empty move slots.
+    """
+
+    stats: np.ndarray
+    levels: np.ndarray
+    types: np.ndarray
+    moves: np.ndarray
+
+    @classmethod
+    def from_pokemon(
+        cls: Type[T],
+        pokemon: Sequence[BasePokemon],
+        moves: Sequence[Sequence[int]],
+        chart: TypeChart,
+    ) -> T:
+        """Build a team from Pokémon.
+
+        Args:
+            pokemon: Up to 6 Pokémon. Their `stats` and `level` are used,
+                and they start the battle at full HP.
+            moves: Up to 4 move ids for each Pokémon.
+            chart: The type chart, to find the ids of the `types` of the
+                Pokémon.
+
+        Raises:
+            ValueError: if there are too many Pokémon or moves, or if the
+                moves are not given for every Pokémon.
+
+        Returns:
+            A `Team` instance.
+        """
+        if len(pokemon) > TEAM_SIZE or any(len(known) > MOVES_PER_POKEMON for known in moves):
+            raise ValueError(
+                f"Teams have at most {TEAM_SIZE} Pokémon of {MOVES_PER_POKEMON} moves."
+            )
+        if len(moves) != len(pokemon):
+            raise ValueError(f"Got moves for {len(moves)} of {len(pokemon)} Pokémon.")
+        stats = np.zeros((TEAM_SIZE, 6), dtype=np.int32)
+        levels = np.ones(TEAM_SIZE, dtype=np.int32)
+        types = np.zeros((TEAM_SIZE, 2), dtype=np.int32)
+        move_ids = np.zeros((TEAM_SIZE, MOVES_PER_POKEMON), dtype=np.int32)
+        for slot, (member, known) in enumerate(zip(pokemon, moves)):
+            stats[slot] = [getattr(member.stats, stat) for stat in STAT_NAMES]
+            levels[slot] = member.level
+            types[slot] = chart.type_ids([member.types])[0]
+            move_ids[slot, : len(known)] = known
+        return cls(stats=stats, levels=levels, types=types, moves=move_ids)
+
+
+@attr.s(auto_attribs=True)
+class Battles:
+    """The state of many battles.
+
+    Arrays have a leading axis of battles, then an axis of the two
+    sides. Pokémon only leave the field when they faint, so the Pokémon
+    of a team before the active one have fainted, and the ones after it
+    are untouched: only the active Pokémon have a state of their own.
+
+    Attributes:
+        teams: The `Team` arrays of both sides, with shapes `(n, 2, 6, ...)`:
+            `(stats, levels, types, moves)`.
+        active: Team slot of the active Pokémon, shape `(n, 2)`.
+        stats: Stats of the active Pokémon, shape `(n, 2, 6)`.
+        levels: Levels of the active Pokémon, shape `(n, 2)`.
+        types: Type ids of the active Pokémon, shape `(n, 2, 2)`.
+        moves: Move ids of the active Pokémon, shape `(n, 2, 4)`.
+        hp: HP of the active Pokémon, shape `(n, 2)`.
+        status: Status of the active Pokémon, shape `(n, 2)`.
+        sleep: Turns of sleep left of the active Pokémon, shape `(n, 2)`.
+        stages: Stat stages of the active Pokémon, shape `(n, 2, 7)`.
+        seeds: The current state of the PRNG of every battle.
+        turns: Number of turns played.
+        winners: The side that won, `DRAW`, or `ONGOING`.
+    """
+
+    teams: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    active: np.ndarray
+    stats: np.ndarray
+    levels: np.ndarray
+    types: np.ndarray
+    moves: np.ndarray
+    hp: np.ndarray
+    status: np.ndarray
+    sleep: np.ndarray
+    stages: np.ndarray
+    seeds: np.ndarray
+    turns: np.ndarray
+    winners: np.ndarray
+
+    @classmethod
+    def create(cls: Type[B], teams: Sequence[Team], matchups: ArrayLike, seeds: ArrayLike) -> B:
+        """Start battles between teams.
+
+        Args:
+            teams: The teams.
+            matchups: Indices into `teams` of the two sides of every
+                battle, shape `(n, 2)`.
+            seeds: The seed of every battle, shape `(n,)`.
+
+        Returns:
+            A `Battles` instance, before the first turn.
+        """
+        matchups = np.asarray(matchups, dtype=np.int64).reshape(-1, 2)
+        n = len(matchups)
+
+        def stack(name: str) -> np.ndarray:
+            return np.stack([getattr(team, name) for team in teams])[matchups]
+
+        battles = cls(
+            teams=(stack("stats"), stack("levels"), stack("types"), stack("moves")),
+            active=np.full((n, 2), -1, dtype=np.int64),
+            stats=np.zeros((n, 2, 6), dtype=np.int32),
+            levels=np.ones((n, 2), dtype=np.int32),
+            types=np.zeros((n, 2, 2), dtype=np.int32),
+            moves=np.zeros((n, 2, MOVES_PER_POKEMON), dtype=np.int32),
+            hp=np.zeros((n, 2), dtype=np.int32),
+            status=np.zeros((n, 2), dtype=np.int8),
+            sleep=np.zeros((n, 2), dtype=np.int8),
+            stages=np.zeros((n, 2, 7), dtype=np.int8),
+            seeds=np.asarray(seeds, dtype=np.uint32).reshape(n),
+            turns=np.zeros(n, dtype=np.int32),
+            winners=np.full(n, ONGOING, dtype=np.int8),
+        )
+        battles._send_out(np.ones((n, 2), dtype=bool))
+        return battles
+
+    @property
+    def ongoing(self: B) -> np.ndarray:
+        """Whether every battle is still going on."""
+        return self.winners == ONGOING
+
+    def survivors(self: B) -> np.ndarray:
+        """Count the Pokémon of every side that have not fainted.
+
+        Returns:
+            An array of shape `(n, 2)`.
+        """
+        behind = (self.teams[0][..., 0] > 0) & (
+            np.arange(TEAM_SIZE) > self.active[..., np.newaxis]
+        )
+        return behind.sum(axis=-1) + (self.hp > 0)
+
+    def take(self: B, index: np.ndarray) -> B:
+        """Copy some of the battles.
+
+        Args:
+            index: Indices of the battles.
+
+        Returns:
+            A `Battles` instance.
+        """
+        changes: Dict[str, Any] = {
+            field.name: (
+                tuple(array[index] for array in self.teams)
+                if field.name == "teams"
+                else getattr(self, field.name)[index]
+            )
+            for field in attr.fields(type(self))
+        }
+        return attr.evolve(self, **changes)
+
+    def put(self: B, index: np.ndarray, battles: B) -> None:
+        """Replace some of the battles, e.g. with battles from `take`.
+
+        Args:
+            index: Indices of the battles to replace.
+            battles: The new battles, one per index.
+        """
+        for field in attr.fields(type(self)):
+            if field.name != "teams":
+                getattr(self, field.name)[index] = getattr(battles, field.name)
+
+    def _send_out(self: B, fainted: np.ndarray) -> None:
+        """Replace fainted active Pokémon with the next able one, and end battles."""
+        battles, sides = np.nonzero(fainted)
+        team_stats, team_levels, team_types, team_moves = self.teams
+        able = (team_stats[battles, sides, :, 0] > 0) & (
+            np.arange(TEAM_SIZE) > self.active[battles, sides, np.newaxis]
+        )
+        slots = able.argmax(axis=-1)
+        left = able.any(axis=-1)
+        battles, sides, slots = battles[left], sides[left], slots[left]
+        self.active[battles, sides] = slots
+        self.stats[battles, sides] = team_stats[battles, sides, slots]
+        self.levels[battles, sides] = team_levels[battles, sides, slots]
+        self.types[battles, sides] = team_types[battles, sides, slots]
+        self.moves[battles, sides] = team_moves[battles, sides, slots]
+        self.hp[battles, sides] = self.stats[battles, sides, 0]
+        self.status[battles, sides] = HEALTHY
+        self.sleep[battles, sides] = 0
+        self.stages[battles, sides] = 0
+
+        lost = self.hp == 0
+        ending = self.ongoing & lost.any(axis=-1)
+        # Side 0 losing means side 1 won.
+        self.winners[ending] = np.where(lost[ending].all(axis=-1), DRAW, lost[ending, 0])
+
+    def step(self: B, moves: MoveTable, chart: TypeChart, policy: str = "greedy") -> None:
+        """Play one turn of every battle still going on.
+
+        Args:
+            moves: The moves the Pokémon know.
+            chart: The type chart.
+            policy: How Pokémon pick their moves: `"greedy"` picks the
+                move with the highest expected damage, the first move
+                if none deals damage; `"random"` picks any known move.
+
+        Raises:
+            ValueError: if the policy is unknown.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, not one of {POLICIES}.")
+        draws = lcg_outputs(self.seeds, CALLS_PER_TURN).astype(np.int32)
+        a, c = lcg_jump(CALLS_PER_TURN)
+        # `uint32` arithmetic wraps around like the LCG.
+        self.seeds = self.seeds * np.uint32(a) + np.uint32(c)
+        ongoing = self.ongoing
+        chosen = self._choose(moves, chart, policy, draws[:, :2])
+
+        # Priority first, then speed, then a coin flip.
+        priority = moves.priority[chosen]
+        speed = _stage_ratio(self.stats[..., 5], self.stages[..., SPD])
+        speed = np.where(self.status == PARALYZED, speed // 4, speed)
+        second_first = (priority[:, 1] > priority[:, 0]) | (
+            (priority[:, 1] == priority[:, 0])
+            & (
+                (speed[:, 1] > speed[:, 0])
+                | ((speed[:, 1] == speed[:, 0]) & (draws[:, 2] & 1 == 1))
+            )
+        )
+        first = second_first.astype(np.int64)
+        for action, users in enumerate((first, 1 - first)):
+            offset = 3 + action * _CALLS_PER_ACTION
+            self._act(
+                users, chosen, moves, chart, ongoing, draws[:, offset : offset + _CALLS_PER_ACTION]
+            )
+
+        # Burn and poison.
+        hurt = ongoing[:, np.newaxis] & np.isin(self.status, _DAMAGING_STATUSES) & (self.hp > 0)
+        loss = np.maximum(self.stats[..., 0] // 8, 1)
+        self.hp = np.where(hurt, np.maximum(self.hp - loss, 0), self.hp)
+
+        self.turns += ongoing
+        self._send_out(ongoing[:, np.newaxis] & (self.hp == 0))
+
+    def _choose(
+        self: B, moves: MoveTable, chart: TypeChart, policy: str, draws: np.ndarray
+    ) -> np.ndarray:
+        """Pick the move of both active Pokémon, shape `(n, 2)`."""
+        usable = self.moves > 0
+        if policy == "random":
+            picks = draws % np.maximum(usable.sum(axis=-1), 1)
+            positions = (usable.cumsum(axis=-1) > picks[..., np.newaxis]).argmax(axis=-1)
+        else:
+            # One row per move; flat arrays are much faster than broadcasting
+            # against a trailing axis of 4 moves.
+            def rows(array: np.ndarray) -> np.ndarray:
+                return np.repeat(array, MOVES_PER_POKEMON, axis=1)
+
+            def flat(array: np.ndarray) -> np.ndarray:
+                return array.reshape(-1, array.shape[-1])
+
+            stats, stages, types = rows(self.stats), rows(self.stages), rows(self.types)
+            expected = _move_damage(
+                moves,
+                chart,
+                self.moves.reshape(-1),
+                rows(self.levels).reshape(-1),
+                (flat(stats), flat(stages), flat(types)),
+                (flat(stats[:, ::-1]), flat(stages[:, ::-1]), flat(types[:, ::-1])),
+                MAX_ROLL,
+            ).reshape(self.moves.shape)
+            accuracy = moves.accuracy[self.moves]
+            positions = (expected * np.where(accuracy == 0, 100, accuracy)).argmax(axis=-1)
+        return np.take_along_axis(self.moves, positions[..., np.newaxis], axis=-1)[..., 0]
+
+    def _act(
+        self: B,
+        users: np.ndarray,
+        chosen: np.ndarray,
+        moves: MoveTable,
+        chart: TypeChart,
+        ongoing: np.ndarray,
+        draws: np.ndarray,
+    ) -> None:
+        """Let the active Pokémon of one side per battle use its move."""
+        paralysis, accuracy_draw, roll, effect_draw, sleep_turns = draws.T
+        # Flat indices into the arrays of shape `(n, 2, ...)`.
+        user = np.arange(len(users)) * 2 + users
+        target = user ^ 1
+        hp, status, sleep = self.hp.reshape(-1), self.status.reshape(-1), self.sleep.reshape(-1)
+        stats, stages = self.stats.reshape(-1, 6), self.stages.reshape(-1, 7)
+        move = chosen.reshape(-1)[user]
+        acting = ongoing & (hp[user] > 0) & (move > 0)
+
+        user_status = status[user]
+        asleep = acting & (user_status == ASLEEP)
+        woke = asleep & (sleep[user] == 0)
+        status[user] = np.where(woke, HEALTHY, user_status)
+        sleep[user] -= asleep & ~woke
+        acting &= ~asleep | woke
+        acting &= (user_status != PARALYZED) | (paralysis % 4 != 0)
+
+        user_stages, target_stages = stages[user], stages[target]
+        accuracy = moves.accuracy[move].astype(np.int32)
+        stage = np.clip(
+            user_stages[:, ACCURACY].astype(np.int32) - target_stages[:, EVASION],
+            -MAX_STAGE,
+            MAX_STAGE,
+        )
+        hits = acting & (
+            (accuracy == 0) | (accuracy_draw % 100 < _stage_ratio(accuracy, stage, 3))
+        )
+
+        damage = _move_damage(
+            moves,
+            chart,
+            move,
+            self.levels.reshape(-1)[user],
+            (stats[user], user_stages, self.types.reshape(-1, 2)[user]),
+            (stats[target], target_stages, self.types.reshape(-1, 2)[target]),
+            MIN_ROLL + roll % ROLLS,
+        )
+        burned = (user_status == BURNED) & (moves.damage_class[move] == PHYSICAL)
+        damage = np.where(burned & (damage > 0), np.maximum(damage // 2, 1), damage)
+        target_hp = np.where(hits, np.maximum(hp[target] - damage, 0), hp[target])
+        hp[target] = target_hp
+
+        effect = hits & (effect_draw % 100 < moves.effect_chance[move])
+        ailment = moves.ailment[move]
+        target_status = status[target]
+        afflicted = effect & (ailment != HEALTHY) & (target_status == HEALTHY) & (target_hp > 0)
+        status[target] = np.where(afflicted, ailment, target_status)
+        asleep = afflicted & (ailment == ASLEEP)
+        sleep[target] = np.where(asleep, 1 + sleep_turns % 4, sleep[target])
+
+        changing = effect & (moves.stage[move] >= 0)
+        pokemon = np.where(moves.stage_self[move], user, target)[changing]
+        index = (pokemon, moves.stage[move][changing])
+        stages[index] = np.clip(
+            stages[index] + moves.stage_change[move][changing], -MAX_STAGE, MAX_STAGE
+        )
+
+
+def _move_damage(
+    moves: MoveTable,
+    chart: TypeChart,
+    move_ids: np.ndarray,
+    levels: np.ndarray,
+    user: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    target: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    roll: ArrayLike,
+) -> np.ndarray:
+    """The damage of moves, elementwise; 0 for moves dealing no damage.
+
+    `user` and `target` are `(stats, stages, types)` tuples, with
+    trailing axes of 6 stats, 7 stages and 2 types.
+    """
+    (stats, stages, types), (target_stats, target_stages, target_types) = user, target
+    classes = moves.damage_class[move_ids]
+    physical = classes == PHYSICAL
+    power = moves.power[move_ids]
+    attack = np.where(
+        physical,
+        _stage_ratio(stats[..., 1], stages[..., ATK]),
+        _stage_ratio(stats[..., 3], stages[..., SPATK]),
+    )
+    defense = np.where(
+        physical,
+        _stage_ratio(target_stats[..., 2], target_stages[..., DEF]),
+        _stage_ratio(target_stats[..., 4], target_stages[..., SPDEF]),
+    )
+    move_types = moves.type_id[move_ids]
+    damage = hit_damage(
+        levels,
+        power,
+        attack,
+        # Fainted and empty slots have no stats.
+        np.maximum(defense, 1),
+        roll,
+        (types[..., 0] == move_types) | (types[..., 1] == move_types),
+        chart.multipliers[move_types, target_types[..., 0]],
+        chart.multipliers[move_types, target_types[..., 1]],
+    )
+    damaging = (physical | (classes == SPECIAL)) & (power > 0)
+    return np.where(damaging, damage, 0)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class BattleResult:
+    """The outcome of battles.
+
+    Attributes:
+        winners: The side that won every battle, 0 or 1, or `DRAW`.
+        turns: The number of turns of every battle.
+        survivors: The number of Pokémon of every side that did not
+            faint, shape `(n, 2)`.
+    """
+
+    winners: np.ndarray
+    turns: np.ndarray
+    survivors: np.ndarray
+
+    @property
+    def wins(self: R) -> np.ndarray:
+        """The number of wins of side 0, wins of side 1, and draws."""
+        return np.bincount(self.winners, minlength=DRAW + 1)
+
+
+def battle_seeds(seed: int, n: int, max_turns: int = 100) -> np.ndarray:
+    """Compute the seeds of the battles of a run.
+
+    Battle `b` starts `b * max_turns * CALLS_PER_TURN` steps into the PRNG
+    stream of `seed`, so no two battles share random numbers.
+
+    Args:
+        seed: Seed of the PRNG stream.
+        n: Number of battles.
+        max_turns: The turn limit of the battles.
+
+    Raises:
+        ValueError: if the stream would wrap around the PRNG period.
+
+    Returns:
+        A `uint32` array of seeds.
+    """
+    stride = max_turns * CALLS_PER_TURN
+    if n * stride > 1 << 32:
+        raise ValueError(f"{n} battles of {max_turns} turns exceed the period of the PRNG.")
+    return lcg_seeds(seed, n, stride)
+
+
+def simulate(
+    battles: Battles,
+    moves: MoveTable,
+    chart: TypeChart,
+    max_turns: int = 100,
+    policy: str = "greedy",
+) -> BattleResult:
+    """Play battles to the end.
+
+    Args:
+        battles: The battles, updated in place.
+        moves: The moves the Pokémon know.
+        chart: The type chart.
+        max_turns: Battles still going on after this many turns are
+            draws.
+        policy: How Pokémon pick their moves, see `Battles.step`.
+
+    Returns:
+        A `BattleResult` instance.
+    """
+    battles.winners[battles.ongoing & (battles.turns >= max_turns)] = DRAW
+    index = np.flatnonzero(battles.ongoing)
+    part = battles.take(index)
+    while len(index):
+        part.step(moves, chart, policy)
+        part.winners[part.ongoing & (part.turns >= max_turns)] = DRAW
+        ongoing = part.ongoing
+        if ongoing.sum() < len(index) * _COMPACT_RATIO:
+            # Stop computing the battles that are over.
+            battles.put(index, part)
+            index, part = index[ongoing], part.take(np.flatnonzero(ongoing))
+    return BattleResult(
+        winners=battles.winners, turns=battles.turns, survivors=battles.survivors()
+    )
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class _Job:
+    """A chunk of battles, cheap to send to workers."""
+
+    teams: Tuple[Team, ...]
+    matchups: np.ndarray
+    seeds: np.ndarray
+    moves: MoveTable
+    chart: TypeChart
+    max_turns: int
+    policy: str
+
+
+def _run_chunk(job: _Job) -> BattleResult:
+    battles = Battles.create(job.teams, job.matchups, job.seeds)
+    return simulate(battles, job.moves, job.chart, job.max_turns, job.policy)
+
+
+def run(
+    teams: Sequence[Team],
+    matchups: ArrayLike,
+    moves: MoveTable,
+    chart: TypeChart,
+    seed: int = 0,
+    max_turns: int = 100,
+    policy: str = "greedy",
+    workers: int = 1,
+    chunk_size: int = 4096,
+) -> BattleResult:
+    """Play many battles between teams.
+
+    Battle `b` can be replayed alone, e.g. to inspect it turn by turn,
+    from `Battles.create(teams, matchups[b : b + 1], seeds[b : b + 1])`
+    where `seeds = battle_seeds(seed, len(matchups), max_turns)`.
+
+    Args:
+        teams: The teams.
+        matchups: Indices into `teams` of the two sides of every
+            battle, shape `(n, 2)`.
+        moves: The moves the Pokémon know.
+        chart: The type chart.
+        seed: Seed of the PRNG stream the battles draw from; see
+            `battle_seeds`.
+        max_turns: Battles still going on after this many turns are
+            draws.
+        policy: How Pokémon pick their moves, see `Battles.step`.
+        workers: Number of worker processes. 1 runs in this process.
+        chunk_size: Number of battles per unit of work. Has no effect on
+            the results.
+
+    Returns:
+        A `BattleResult` instance, in the order of `matchups`.
+    """
+    matchups = np.asarray(matchups, dtype=np.int64).reshape(-1, 2)
+    seeds = battle_seeds(seed, len(matchups), max_turns)
+    jobs = [
+        _Job(
+            teams=tuple(teams),
+            matchups=matchups[start : start + chunk_size],
+            seeds=seeds[start : start + chunk_size],
+            moves=moves,
+            chart=chart,
+            max_turns=max_turns,
+            policy=policy,
+        )
+        for start in range(0, len(matchups), chunk_size)
+    ]
+    if workers == 1:
+        results = list(map(_run_chunk, jobs))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_run_chunk, jobs))
+    return BattleResult(
+        winners=np.concatenate([result.winners for result in results] or [np.zeros(0, np.int8)]),
+        turns=np.concatenate([result.turns for result in results] or [np.zeros(0, np.int32)]),
+        survivors=np.concatenate(
+            [result.survivors for result in results] or [np.zeros((0, 2), np.int64)]
+        ),
+    )
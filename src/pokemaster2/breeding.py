@@ -0,0 +1,173 @@
+"""Egg generation and hatching, on whole batches of eggs at once.
+
+Every egg draws a fixed number of random numbers from one Gen. 3 PRNG
+stream:
+
+    [PID] [PID] [IVs] [IVs] [stat] [stat] [stat] [parent] [parent] [parent]
+
+The two IV numbers produce random IVs like Method 1. Then three distinct
+stats are picked, and each one is inherited from a random parent.
+
+An egg hatches after 255 × (hatch_counter + 1) steps, see
+`PokemonSpecies.hatch_counter`.
+"""
+from typing import Optional, TypeVar, Union
+
+import attr
+import numpy as np
+
+from pokemaster2 import personality
+from pokemaster2.db.arrays import SpeciesArrays
+from pokemaster2.prng import PRNG, lcg_outputs, lcg_seeds
+
+E = TypeVar("E", bound="EggBatch")
+
+ArrayLike = Union[int, np.ndarray]
+
+DITTO = 132
+CALLS_PER_EGG = 10
+_INHERITED_STATS = 3
+_MAX_EVOLUTION_DEPTH = 8
+
+
+@attr.s(auto_attribs=True, eq=False)
+class EggBatch:
+    """A batch of eggs, stored column-wise.
+
+    Attributes:
+        species_ids: The species each egg hatches into.
+        pids: Personality values.
+        genes: IV genes, see `Stats.create_iv`.
+        steps_remaining: Steps left before each egg hatches.
+    """
+
+    species_ids: np.ndarray
+    pids: np.ndarray
+    genes: np.ndarray
+    steps_remaining: np.ndarray
+
+    def __len__(self: E) -> int:
+        """Number of eggs in the batch."""
+        return len(self.species_ids)
+
+    @property
+    def hatched(self: E) -> np.ndarray:
+        """Mask of the eggs that have hatched."""
+        return self.steps_remaining <= 0
+
+    def advance(self: E, steps: ArrayLike, multiplier: int = 1) -> np.ndarray:
+        """Walk a number of steps with every egg that has not hatched yet.
+
+        Args:
+            steps: Steps walked, a scalar or one value per egg.
+            multiplier: 2 if a party Pokémon has Flame Body or Magma Armor.
+
+        Returns:
+            Mask of the eggs that hatched during these steps.
+        """
+        before = self.hatched
+        self.steps_remaining = np.where(
+            before, self.steps_remaining, self.steps_remaining - np.asarray(steps) * multiplier
+        )
+        return self.hatched & ~before
+
+
+def hatch_steps(species_ids: ArrayLike, species: SpeciesArrays) -> np.ndarray:
+    """Compute the number of steps an egg of each species needs to hatch.
+
+    Args:
+        species_ids: Species of each egg.
+        species: The species parameter arrays.
+
+    Returns:
+        An `int64` array of steps.
+    """
+    return 255 * (species.hatch_counter[np.asarray(species_ids)].astype(np.int64) + 1)
+
+
+def baby_species(species_ids: ArrayLike, species: SpeciesArrays) -> np.ndarray:
+    """Resolve each species to the lowest stage of its evolution family.
+
+    Args:
+        species_ids: Species ids.
+        species: The species parameter arrays.
+
+    Returns:
+        An `int32` array of species ids.
+    """
+    babies = np.asarray(species_ids, dtype=np.int32).copy()
+    for _ in range(_MAX_EVOLUTION_DEPTH):
+        parents = species.evolves_from[babies]
+        if not parents.any():
+            break
+        babies = np.where(parents > 0, parents, babies)
+    return babies
+
+
+def _pick_distinct(draws: np.ndarray, choices: int) -> np.ndarray:
+    """Pick a distinct column per draw, without replacement, per row."""
+    rows, picks = draws.shape
+    available = np.ones((rows, choices), dtype=bool)
+    picked = np.empty((rows, picks), dtype=np.int64)
+    for i in range(picks):
+        k = draws[:, i] % (choices - i)
+        column = np.argmax(np.cumsum(available, axis=1) > k[:, np.newaxis], axis=1)
+        available[np.arange(rows), column] = False
+        picked[:, i] = column
+    return picked
+
+
+def breed(
+    mother_species: ArrayLike,
+    father_species: ArrayLike,
+    mother_genes: ArrayLike,
+    father_genes: ArrayLike,
+    species: SpeciesArrays,
+    prng: Optional[PRNG] = None,
+) -> EggBatch:
+    """Produce one egg per pair of parents.
+
+    The egg belongs to the baby species of the mother, or of the father
+    if the mother is a Ditto.
+
+    Args:
+        mother_species: Species of each mother.
+        father_species: Species of each father.
+        mother_genes: IV genes of each mother.
+        father_genes: IV genes of each father.
+        species: The species parameter arrays.
+        prng: The random number generator, advanced by `CALLS_PER_EGG`
+            per egg. A fresh `PRNG()` if omitted.
+
+    Returns:
+        An `EggBatch` instance.
+    """
+    prng = prng or PRNG()
+    mother_species, father_species, mother_genes, father_genes = np.broadcast_arrays(
+        *np.atleast_1d(mother_species, father_species, mother_genes, father_genes)
+    )
+    n = len(mother_species)
+
+    draws = lcg_outputs(lcg_seeds(prng.seed, n, stride=CALLS_PER_EGG), CALLS_PER_EGG)
+    draws = draws.astype(np.uint32)
+    prng.jump(n * CALLS_PER_EGG)
+
+    pids = draws[:, 0] | draws[:, 1] << 16
+    ivs = personality.unpack_ivs(draws[:, 2] | draws[:, 3] << 16)
+    parent_ivs = np.stack(
+        [personality.unpack_ivs(mother_genes), personality.unpack_ivs(father_genes)], axis=1
+    )
+    stats = _pick_distinct(draws[:, 4 : 4 + _INHERITED_STATS], choices=6)
+    parents = draws[:, 4 + _INHERITED_STATS :] % 2
+    rows = np.arange(n)[:, np.newaxis]
+    ivs[rows, stats] = parent_ivs[rows, parents, stats]
+
+    species_ids = baby_species(
+        np.where(mother_species == DITTO, father_species, mother_species), species
+    )
+    return EggBatch(
+        species_ids=species_ids,
+        pids=pids,
+        genes=personality.pack_ivs(ivs),
+        steps_remaining=hatch_steps(species_ids, species),
+    )
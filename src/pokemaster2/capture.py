@@ -0,0 +1,220 @@
+"""Gen. 3 capture mechanics.
+
+A thrown ball first computes the catch odds
+
+    odds = (capture_rate * ball / 10) * (3 * max_hp - 2 * hp) / (3 * max_hp)
+
+which is then multiplied by the status bonus. Odds above 254 always
+catch; otherwise the ball shakes up to four times and each shake
+succeeds iff a random number is less than
+
+    1048560 / sqrt(sqrt(16711680 / odds))
+
+All arithmetic is integer arithmetic, as in the games. Ball and status
+bonuses are in tenths.
+
+References:
+    https://bulbapedia.bulbagarden.net/wiki/Catch_rate#Generation_III_and_IV
+"""
+import math
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from pokemaster2.prng import PRNG
+
+ArrayLike = Union[int, Sequence[int], np.ndarray]
+
+MASTER_BALL = 0
+
+BALL_BONUSES = {
+    "master-ball": MASTER_BALL,
+    "poke-ball": 10,
+    "great-ball": 15,
+    "ultra-ball": 20,
+    "safari-ball": 15,
+}
+
+STATUS_BONUSES = {
+    "none": 10,
+    "sleep": 20,
+    "freeze": 20,
+    "poison": 15,
+    "burn": 15,
+    "paralysis": 15,
+}
+
+
+def shake_threshold(
+    capture_rate: int,
+    hp: int,
+    max_hp: int,
+    ball: Union[str, int] = "poke-ball",
+    status: Union[str, int] = "none",
+) -> int:
+    """Compute the threshold a random number must stay under per shake.
+
+    Args:
+        capture_rate: The species' capture rate.
+        hp: The target's current HP.
+        max_hp: The target's maximum HP.
+        ball: A key of `BALL_BONUSES`, or a bonus in tenths.
+        status: A key of `STATUS_BONUSES`, or a bonus in tenths.
+
+    Returns:
+        A threshold between 0 and 0x10000; 0x10000 means a sure catch.
+    """
+    ball = BALL_BONUSES[ball] if isinstance(ball, str) else ball
+    status = STATUS_BONUSES[status] if isinstance(status, str) else status
+    if ball == MASTER_BALL:
+        return 0x10000
+    odds = (capture_rate * ball // 10) * (3 * max_hp - 2 * hp) // (3 * max_hp)
+    odds = odds * status // 10
+    if odds > 254:
+        return 0x10000
+    if odds <= 0:
+        return 0
+    return 1048560 // math.isqrt(math.isqrt(16711680 // odds))
+
+
+def capture_probability(
+    capture_rate: int,
+    hp: int,
+    max_hp: int,
+    ball: Union[str, int] = "poke-ball",
+    status: Union[str, int] = "none",
+) -> float:
+    """Compute the exact probability of a single ball catching the target.
+
+    Args:
+        capture_rate: The species' capture rate.
+        hp: The target's current HP.
+        max_hp: The target's maximum HP.
+        ball: A key of `BALL_BONUSES`, or a bonus in tenths.
+        status: A key of `STATUS_BONUSES`, or a bonus in tenths.
+
+    Returns:
+        The capture probability.
+    """
+    return (shake_threshold(capture_rate, hp, max_hp, ball, status) / 0x10000) ** 4
+
+
+def _isqrt(x: np.ndarray) -> np.ndarray:
+    """Integer square root of a non-negative `int64` array."""
+    root = np.floor(np.sqrt(x)).astype(np.int64)
+    root -= root * root > x
+    root += (root + 1) * (root + 1) <= x
+    return root
+
+
+def shake_thresholds(
+    capture_rate: ArrayLike,
+    hp: ArrayLike,
+    max_hp: ArrayLike,
+    ball: ArrayLike = 10,
+    status: ArrayLike = 10,
+) -> np.ndarray:
+    """Array version of `shake_threshold`; arguments are broadcast.
+
+    Args:
+        capture_rate: Capture rates.
+        hp: Current HP.
+        max_hp: Maximum HP.
+        ball: Ball bonuses in tenths, `MASTER_BALL` for a sure catch.
+        status: Status bonuses in tenths.
+
+    Returns:
+        An `int64` array of thresholds.
+    """
+    capture_rate, hp, max_hp, ball, status = (
+        np.asarray(value, dtype=np.int64) for value in (capture_rate, hp, max_hp, ball, status)
+    )
+    odds = (capture_rate * ball // 10) * (3 * max_hp - 2 * hp) // (3 * max_hp)
+    odds = odds * status // 10
+    safe_odds = np.clip(odds, 1, 254)
+    thresholds = 1048560 // _isqrt(_isqrt(16711680 // safe_odds))
+    thresholds = np.where(odds <= 0, 0, thresholds)
+    return np.where((odds > 254) | (ball == MASTER_BALL), 0x10000, thresholds)
+
+
+def capture_probabilities(
+    capture_rate: ArrayLike,
+    hp: ArrayLike,
+    max_hp: ArrayLike,
+    ball: ArrayLike = 10,
+    status: ArrayLike = 10,
+) -> np.ndarray:
+    """Array version of `capture_probability`; arguments are broadcast.
+
+    Args:
+        capture_rate: Capture rates.
+        hp: Current HP.
+        max_hp: Maximum HP.
+        ball: Ball bonuses in tenths, `MASTER_BALL` for a sure catch.
+        status: Status bonuses in tenths.
+
+    Returns:
+        A `float64` array of capture probabilities.
+    """
+    return (shake_thresholds(capture_rate, hp, max_hp, ball, status) / 0x10000) ** 4
+
+
+def capture_table(
+    capture_rates: ArrayLike,
+    hp_percents: Optional[ArrayLike] = None,
+    balls: ArrayLike = (10, 15, 20),
+    status: int = 10,
+) -> np.ndarray:
+    """Tabulate capture probabilities for every species, HP and ball.
+
+    HP is expressed in percent of a 100 max HP.
+
+    Args:
+        capture_rates: Capture rate of each species.
+        hp_percents: Remaining HP buckets, defaults to 1..100.
+        balls: Ball bonuses in tenths.
+        status: Status bonus in tenths, shared by the whole table.
+
+    Returns:
+        An array of shape `(species, hp buckets, balls)`.
+    """
+    if hp_percents is None:
+        hp_percents = np.arange(1, 101)
+    return capture_probabilities(
+        np.asarray(capture_rates)[:, np.newaxis, np.newaxis],
+        np.asarray(hp_percents)[np.newaxis, :, np.newaxis],
+        100,
+        np.asarray(balls)[np.newaxis, np.newaxis, :],
+        status,
+    )
+
+
+def simulate_capture(
+    capture_rate: int,
+    hp: int,
+    max_hp: int,
+    ball: Union[str, int] = "poke-ball",
+    status: Union[str, int] = "none",
+    trials: int = 10000,
+    prng: Optional[PRNG] = None,
+) -> float:
+    """Estimate the capture probability by throwing balls with a `PRNG`.
+
+    Every throw draws four random numbers, one per shake.
+
+    Args:
+        capture_rate: The species' capture rate.
+        hp: The target's current HP.
+        max_hp: The target's maximum HP.
+        ball: A key of `BALL_BONUSES`, or a bonus in tenths.
+        status: A key of `STATUS_BONUSES`, or a bonus in tenths.
+        trials: Number of throws.
+        prng: The random number generator, a fresh `PRNG()` if omitted.
+
+    Returns:
+        The fraction of successful throws.
+    """
+    prng = prng or PRNG()
+    threshold = shake_threshold(capture_rate, hp, max_hp, ball, status)
+    shakes = prng.next_array(4 * trials).reshape(trials, 4)
+    return float((shakes < threshold).all(axis=1).mean())
@@ -1,10 +1,14 @@
-"""Console script for pokemaster2."""
+"""Console script for pokemaster2.
+
+Only `click` is imported at module level, so that `--help` and
+`--version` stay fast. Each subcommand imports what it needs.
+"""
+
+from typing import Sequence
 
 import click
-from loguru import logger
 
 from pokemaster2 import __version__
-from pokemaster2.db import io
 
 
 @click.group()
@@ -22,9 +26,35 @@ def main() -> int:
 @click.option("-D", "--drop-tables", type=bool, default=True)
 @click.option("-S", "--safe", type=bool, default=True)
 @click.option("-R", "--recursive", type=bool, default=True)
-def cli_load(csv_dir: str, uri: str, drop_tables: bool, safe: bool, recursive: bool) -> None:
+@click.option("-j", "--workers", type=int, default=1, help="Threads reading CSV files.")
+@click.option(
+    "--checkpoint", type=int, default=None, help="Commit every N rows, so the load can resume."
+)
+@click.option("--resume", is_flag=True, help="Continue an interrupted checkpointed load.")
+@click.option("--profile", is_flag=True, help="Print timings of every table and phase.")
+@click.option("--profile-json", default=None, help="Write the timings to a JSON file.")
+@click.option("--cprofile", default=None, help="Write cProfile stats of the insert loop.")
+def cli_load(
+    csv_dir: str,
+    uri: str,
+    drop_tables: bool,
+    safe: bool,
+    recursive: bool,
+    workers: int,
+    checkpoint: int,
+    resume: bool,
+    profile: bool,
+    profile_json: str,
+    cprofile: str,
+) -> None:
     """Load Pokédex data into a database from CSV files."""
+    from loguru import logger
+
+    from pokemaster2.db import io
+    from pokemaster2.db.profiling import LoadProfiler
+
     logger.info("Running command `load`.")
+    profiler = LoadProfiler(cprofile=cprofile is not None)
     io.load(
         database=io.get_database(uri),
         csv_dir=io.get_csv_dir(csv_dir),
@@ -32,10 +62,94 @@ def cli_load(csv_dir: str, uri: str, drop_tables: bool, safe: bool, recursive: b
         drop_tables=drop_tables,
         safe=safe,
         recursive=recursive,
+        profiler=profiler,
+        workers=workers,
+        checkpoint=checkpoint,
+        resume=resume,
     )
     logger.debug("Successfully loaded database.")
+
+    if profile:
+        click.echo(profiler.format_table())
+    if profile_json is not None:
+        with open(profile_json, "w") as report:
+            report.write(profiler.to_json())
+    if cprofile is not None:
+        profiler.dump_cprofile(cprofile)
     return 0
 
 
+@main.command("query")
+@click.argument("table")
+@click.option("-U", "--uri", default=None)
+@click.option("-c", "--columns", default=None, help="Comma-separated columns to output.")
+@click.option("-w", "--where", multiple=True, help="Filter such as `species_id>=10`.")
+@click.option("-f", "--format", "fmt", type=click.Choice(["csv", "jsonl", "tsv"]), default="csv")
+@click.option("-n", "--limit", type=int, default=None)
+@click.option("-b", "--batch-size", type=int, default=1000)
+@click.option("--header/--no-header", default=True)
+def cli_query(
+    table: str,
+    uri: str,
+    columns: str,
+    where: Sequence[str],
+    fmt: str,
+    limit: int,
+    batch_size: int,
+    header: bool,
+) -> None:
+    """Stream rows of a Pokédex table to stdout."""
+    from pokemaster2.db import io, query
+
+    try:
+        model = query.get_model(table)
+        wanted = [name.strip() for name in columns.split(",")] if columns else None
+        select, names = query.select(model, wanted, filters=where, limit=limit)
+    except ValueError as error:
+        raise click.BadParameter(str(error)) from error
+
+    rows = query.stream_rows(io.get_database(uri), select, batch_size=batch_size)
+    query.write_rows(rows, names, fmt, click.get_text_stream("stdout"), header=header)
+
+
+@main.command("search")
+@click.argument("text")
+@click.option("-U", "--uri", default=None)
+@click.option("-n", "--limit", type=int, default=10)
+def cli_search(text: str, uri: str, limit: int) -> None:
+    """Find Pokémon and species by a fragment of their identifier."""
+    from pokemaster2.db import io, search
+
+    for row in search.search(text, limit=limit, database=io.get_database(uri)):
+        click.echo(f"{row._meta.table_name}\t{row.id}\t{row.identifier}")
+
+
+@main.command("export")
+@click.option("-U", "--uri", default=None)
+@click.option("-o", "--out-dir", default=".", help="Directory to write the files to.")
+@click.option(
+    "-f", "--format", "fmt", type=click.Choice(["parquet", "arrow", "npz"]), default="parquet"
+)
+@click.option("-t", "--table", "table_names", multiple=True, help="Tables to export.")
+@click.option("--chunk-size", type=int, default=65536)
+def cli_export(
+    uri: str, out_dir: str, fmt: str, table_names: Sequence[str], chunk_size: int
+) -> None:
+    """Export Pokédex tables into columnar files."""
+    from pokemaster2.db import export, io, query
+
+    try:
+        models = [query.get_model(name) for name in table_names] or None
+    except ValueError as error:
+        raise click.BadParameter(str(error)) from error
+
+    try:
+        paths = export.export(io.get_database(uri), out_dir, fmt, models, chunk_size=chunk_size)
+    except ImportError as error:
+        raise click.UsageError(str(error)) from error
+    for path in paths:
+        click.echo(str(path))
+
+
 if __name__ == "__main__":
     main()  # pragma: no cover
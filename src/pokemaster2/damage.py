@@ -0,0 +1,237 @@
+"""Damage ranges and KO chances of whole matchup grids.
+
+A damaging move rolls one of 16 random factors, 85% to 100%, so a hit
+deals one of 16 amounts. `damage_ranges` evaluates the Gen. 4 damage
+formula for every attacker, defender and move at once:
+
+    base = ((2 * level // 5 + 2) * power * attack // defense) // 50 + 2
+    damage = base * roll // 100, then x 1.5 for STAB, then x the type
+    effectiveness against each type of the defender, flooring each time
+
+Critical hits, abilities, items and weather are left out. The damage is
+at least 1, unless the defender is immune.
+
+The lowest and highest damage only need the lowest and highest rolls.
+Since the damage grows with the roll, the number of rolls that knock the
+defender out is found by bisecting the rolls, and only for the pairings
+whose range straddles the defender's HP.
+"""
+from typing import Optional, Tuple, TypeVar
+
+import attr
+import numpy as np
+from numpy.typing import ArrayLike
+
+from pokemaster2.db.arrays import TypeChart
+
+D = TypeVar("D", bound="DamageRange")
+
+# Ids of the damage classes in the `move_damage_classes` table.
+PHYSICAL = 2
+SPECIAL = 3
+
+MIN_ROLL = 85
+MAX_ROLL = 100
+ROLLS = MAX_ROLL - MIN_ROLL + 1
+
+# Columns of the stat arrays, in the order of `STAT_NAMES`.
+_HP, _ATK, _DEF, _SPATK, _SPDEF = 0, 1, 2, 3, 4
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class DamageRange:
+    """The damage of every attacker, defender and move.
+
+    All arrays have the shape `(attackers, defenders, moves)`.
+
+    Attributes:
+        low: The damage of the lowest roll.
+        high: The damage of the highest roll.
+        ko_rolls: The number of rolls, out of 16, whose damage is at
+            least the HP of the defender.
+    """
+
+    low: np.ndarray
+    high: np.ndarray
+    ko_rolls: np.ndarray
+
+    @property
+    def ko_chance(self: D) -> np.ndarray:
+        """The probability that one hit knocks the defender out."""
+        return self.ko_rolls / ROLLS
+
+
+def _factors(stats: np.ndarray, physical: np.ndarray, columns: Tuple[int, int]) -> np.ndarray:
+    """The attack or defense stat used by each move, shape `(n, moves)`."""
+    return np.where(physical, stats[:, columns[0], np.newaxis], stats[:, columns[1], np.newaxis])
+
+
+def _damage(
+    base: np.ndarray,
+    roll: ArrayLike,
+    stab: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+    floor: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Apply the roll, STAB and the effectiveness of both types, in halves."""
+    # Operations on 0-d arrays return scalars, which cannot be updated in place.
+    damage = np.asarray(np.multiply(base, roll, out=out))
+    damage //= 100
+    for halves in (stab, first, second):
+        damage *= halves
+        damage >>= 1
+    return np.maximum(damage, floor, out=damage)
+
+
+def hit_damage(
+    level: ArrayLike,
+    power: ArrayLike,
+    attack: ArrayLike,
+    defense: ArrayLike,
+    roll: ArrayLike,
+    stab: ArrayLike,
+    first: ArrayLike,
+    second: ArrayLike,
+) -> np.ndarray:
+    """Compute the damage of single hits; the elementwise `damage_ranges`.
+
+    Arguments broadcast against each other.
+
+    Args:
+        level: Level of the attackers.
+        power: Power of the moves.
+        attack: The attack stat used by the moves.
+        defense: The defense stat used against the moves.
+        roll: The random factors, 85 to 100.
+        stab: Whether the moves get the same-type attack bonus.
+        first: The multiplier against the first type of the defenders.
+        second: The multiplier against their second type; 1 if none.
+
+    Returns:
+        An `int32` array of damage.
+    """
+    level = np.asarray(level, dtype=np.int32)
+    power, attack, defense = (np.asarray(value) for value in (power, attack, defense))
+    base = (2 * level // 5 + 2) * power * attack // (50 * defense) + 2
+    first, second = ((np.asarray(halves) * 2).astype(np.int32) for halves in (first, second))
+    stab = 2 + np.asarray(stab, dtype=np.int32)
+    return _damage(base, roll, stab, first, second, (first * second > 0).astype(np.int32))
+
+
+def damage_ranges(
+    attackers: ArrayLike,
+    attacker_types: ArrayLike,
+    defenders: ArrayLike,
+    defender_types: ArrayLike,
+    power: ArrayLike,
+    move_types: ArrayLike,
+    damage_classes: ArrayLike,
+    chart: TypeChart,
+    level: ArrayLike = 50,
+    block_size: int = 8,
+) -> DamageRange:
+    """Compute the damage of every move of every attacker on every defender.
+
+    Usage:
+        >>> chart = TypeChart.from_rows([[11, 10, 200]])  # water on fire
+        >>> result = damage_ranges(
+        ...     attackers=[[155, 104, 120, 105, 125, 98]],  # blastoise
+        ...     attacker_types=[[11, 0]],
+        ...     defenders=[[153, 104, 98, 129, 105, 120]],  # charizard
+        ...     defender_types=[[10, 3]],
+        ...     power=[90],  # surf
+        ...     move_types=[11],
+        ...     damage_classes=[SPECIAL],
+        ...     chart=chart,
+        ... )
+        >>> result.low.item(), result.high.item(), result.ko_chance.item()
+        (102, 122, 0.0)
+
+    Args:
+        attackers: Stats of the attackers, shape `(a, 6)`, in the order
+            of `STAT_NAMES`.
+        attacker_types: Type ids of the attackers, shape `(a, 2)`; 0 for
+            no second type. See `TypeChart.type_ids`.
+        defenders: Stats of the defenders, shape `(d, 6)`. The HP
+            column is their current HP.
+        defender_types: Type ids of the defenders, shape `(d, 2)`.
+        power: Power of the moves, shape `(m,)`; 0 for moves without a
+            fixed power.
+        move_types: Type ids of the moves, shape `(m,)`.
+        damage_classes: Damage class ids of the moves, shape `(m,)`:
+            `PHYSICAL`, `SPECIAL`, or anything else for status moves,
+            which deal no damage.
+        chart: The type chart.
+        level: Level of the attackers, shape `()` or `(a,)`.
+        block_size: Number of attackers computed at a time. Bounds the
+            memory of the temporary arrays; has no effect on the result.
+
+    Returns:
+        A `DamageRange` of `int32` damage and `int8` numbers of rolls,
+        of shape `(a, d, m)`.
+    """
+    attackers = np.asarray(attackers, dtype=np.int32).reshape(-1, 6)
+    defenders = np.asarray(defenders, dtype=np.int32).reshape(-1, 6)
+    attacker_types = np.asarray(attacker_types, dtype=np.int64).reshape(-1, 2)
+    defender_types = np.asarray(defender_types, dtype=np.int64).reshape(-1, 2)
+    move_types = np.asarray(move_types, dtype=np.int64)
+    damage_classes = np.asarray(damage_classes)
+    levels = np.broadcast_to(np.asarray(level, dtype=np.int32), attackers.shape[:1])
+
+    physical = damage_classes == PHYSICAL
+    damaging = (physical | (damage_classes == SPECIAL)) & (np.asarray(power) > 0)
+    power = np.where(damaging, power, 0).astype(np.int32)
+
+    # Per attacker and move; STAB in halves: 2 or 3.
+    numerators = (
+        (2 * levels // 5 + 2)[:, np.newaxis]
+        * power
+        * _factors(attackers, physical, (_ATK, _SPATK))
+    )
+    stabs = 2 + (attacker_types[:, :, np.newaxis] == move_types).any(axis=1).astype(np.int32)
+    # Per defender and move; effectiveness in halves: 0, 1, 2 or 4. The
+    # two floor divisions of the base damage are one division by 50 x D.
+    divisors = 50 * _factors(defenders, physical, (_DEF, _SPDEF))
+    first, second = (
+        (chart.multipliers[move_types, defender_types[:, [slot]]] * 2).astype(np.int32)
+        for slot in (0, 1)
+    )
+    first *= damaging
+    floor = (first * second > 0).astype(np.int32)
+    hp = defenders[:, _HP, np.newaxis]
+
+    shape = (len(attackers), len(defenders), len(move_types))
+    low = np.empty(shape, dtype=np.int32)
+    high = np.empty(shape, dtype=np.int32)
+    ko_rolls = np.empty(shape, dtype=np.int8)
+    for start in range(0, len(attackers), block_size):
+        block = slice(start, start + block_size)
+        base = numerators[block, np.newaxis, :] // divisors
+        base += 2
+        stab = stabs[block, np.newaxis, :]
+        _damage(base, MIN_ROLL, stab, first, second, floor, out=low[block])
+        _damage(base, MAX_ROLL, stab, first, second, floor, out=high[block])
+        np.multiply(low[block] >= hp, ROLLS, out=ko_rolls[block], casting="unsafe")
+
+        # Bisect the rolls of the pairings that only some rolls knock out:
+        # the first knocking roll is one of rolls 1 to 15.
+        straddling = np.flatnonzero((low[block] < hp) & (high[block] >= hp))
+        if not len(straddling):
+            continue
+        index = np.unravel_index(straddling, base.shape)
+        args = [
+            np.broadcast_to(array, base.shape)[index]
+            for array in (base, stab, first, second, floor, hp)
+        ]
+        lower = np.ones(len(straddling), dtype=np.int32)
+        upper = np.full(len(straddling), ROLLS - 1, dtype=np.int32)
+        for _ in range(int(np.ceil(np.log2(ROLLS - 1)))):
+            middle = (lower + upper) >> 1
+            knocks = _damage(args[0], MIN_ROLL + middle, *args[1:5]) >= args[5]
+            upper = np.where(knocks, middle, upper)
+            lower = np.where(knocks, lower, middle + 1)
+        ko_rolls[block].reshape(-1)[straddling] = ROLLS - lower
+
+    return DamageRange(low=low, high=high, ko_rolls=ko_rolls)
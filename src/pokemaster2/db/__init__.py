@@ -1,7 +1,19 @@
 """Database stuff."""
 
 __all__ = (
+    "aio",
+    "arrays",
+    "checkpoint",
+    "convert",
     "default",
+    "export",
     "io",
+    "plan",
+    "profiling",
+    "query",
+    "search",
+    "shared",
+    "snapshot",
+    "synthetic",
     "tables",
 )
@@ -0,0 +1,214 @@
+"""An asyncio facade over the Pokédex queries.
+
+`peewee` and `sqlite3` calls block, so `AsyncPokedex` runs them on its own
+bounded thread pool, where every thread reads through its own read-only
+connection to the database file. The event loop only awaits the results.
+
+Concurrent lookups are coalesced: while a Pokémon is being fetched,
+other requests for the same identifier wait for that query instead of
+starting their own, and the distinct identifiers requested during one
+iteration of the event loop are fetched together, with one query per
+batch of up to 500 identifiers.
+"""
+import asyncio
+import functools
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple, TypeVar
+
+import attr
+import peewee
+
+from pokemaster2.db import search, tables
+
+A = TypeVar("A", bound="AsyncPokedex")
+K = TypeVar("K", bound=Hashable)
+
+# Stay below SQLite's limit on the number of bound parameters.
+_MAX_IDENTIFIERS_PER_QUERY = 500
+
+
+@attr.s(auto_attribs=True, eq=False)
+class AsyncPokedex:
+    """Run Pokédex queries without blocking the event loop.
+
+    Usage:
+        >>> async def main():  # doctest: +SKIP
+        ...     async with AsyncPokedex("pokedex.sqlite3") as pokedex:
+        ...         (pikachu,) = await pokedex.get_pokemon("pikachu")
+        ...         return pikachu.species.capture_rate
+        >>> asyncio.run(main())  # doctest: +SKIP
+        190
+
+    Attributes:
+        path: The SQLite database file, e.g. written by `pokemaster2 load`.
+        max_workers: Number of threads, and so of connections.
+        queries: Number of queries run so far.
+    """
+
+    path: str
+    max_workers: int = 4
+    queries: int = attr.ib(default=0, init=False)
+    _database: peewee.SqliteDatabase = attr.ib(init=False, repr=False)
+    _executor: ThreadPoolExecutor = attr.ib(init=False, repr=False)
+    _pending: Dict[Hashable, asyncio.Future] = attr.ib(factory=dict, init=False, repr=False)
+    _queued: Dict[Callable, Dict[Hashable, asyncio.Future]] = attr.ib(
+        factory=dict, init=False, repr=False
+    )
+    _connections: List[sqlite3.Connection] = attr.ib(factory=list, init=False, repr=False)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+
+    def __attrs_post_init__(self: A) -> None:
+        """Open the database read-only and start the thread pool."""
+        uri = f"{Path(self.path).resolve().as_uri()}?mode=ro"
+        # `peewee` keeps one connection per thread.
+        self._database = peewee.SqliteDatabase(uri, uri=True, check_same_thread=False)
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="pokedex")
+
+    async def __aenter__(self: A) -> A:
+        """Use the Pokédex as an async context manager."""
+        return self
+
+    async def __aexit__(self: A, *exc_info: Any) -> None:
+        """Close the Pokédex."""
+        self.close()
+
+    def close(self: A) -> None:
+        """Wait for running queries, then stop the threads and close the connections."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+    def _connect(self: A) -> None:
+        """Open the connection of the current worker thread, once."""
+        if self._database.connect(reuse_if_open=True):
+            with self._lock:
+                self._connections.append(self._database.connection())
+
+    def _run(self: A, function: Callable, *args: Any) -> Any:
+        """Run a query in a worker thread."""
+        self._connect()
+        result = function(*args)
+        with self._lock:
+            self.queries += 1
+        return result
+
+    def _query_pokemon(self: A, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], list]:
+        """Fetch the Pokémon, with their species, of `("pokemon", identifier)` keys."""
+        found: Dict[Tuple[str, str], list] = {key: [] for key in keys}
+        query = (
+            tables.Pokemon.select(tables.Pokemon, tables.PokemonSpecies)
+            .join(
+                tables.PokemonSpecies,
+                on=(tables.Pokemon.species_id == tables.PokemonSpecies.id),
+            )
+            .where(tables.Pokemon.identifier.in_([identifier for _, identifier in keys]))
+            .order_by(tables.Pokemon.id)
+            .bind(self._database)
+        )
+        for pokemon in query:
+            found["pokemon", pokemon.identifier].append(pokemon)
+        return found
+
+    def _query_search(
+        self: A, keys: List[Tuple[str, str, int]]
+    ) -> Dict[Tuple[str, str, int], list]:
+        """Run the searches of `("search", text, limit)` keys."""
+        found: Dict[Tuple[str, str, int], list] = {}
+        for key in keys:
+            _, text, limit = key
+            found[key] = search.search(text, limit=limit, database=self._database)
+        return found
+
+    def _coalesce(
+        self: A,
+        keys: Iterable[K],
+        query: Callable[[List[K]], Dict[K, Any]],
+    ) -> Dict[K, asyncio.Future]:
+        """Get a future for every key, querying only the keys not in flight.
+
+        Keys requested during the same iteration of the event loop are
+        queued and fetched together by `_flush`. `query` receives a list
+        of keys and returns a result per key; keys of different kinds of
+        queries must differ.
+        """
+        loop = asyncio.get_running_loop()
+        futures: Dict[K, asyncio.Future] = {}
+        for key in dict.fromkeys(keys):
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = loop.create_future()
+                if not self._queued.get(query):
+                    loop.call_soon(self._flush, query)
+                self._queued.setdefault(query, {})[key] = future
+            futures[key] = future
+        return futures
+
+    def _flush(self: A, query: Callable[[List[Any]], Dict[Any, Any]]) -> None:
+        """Send the queued keys of a query to the worker threads, in batches."""
+        loop = asyncio.get_running_loop()
+        queued = list(self._queued.pop(query, {}).items())
+        for start in range(0, len(queued), _MAX_IDENTIFIERS_PER_QUERY):
+            waiters = dict(queued[start : start + _MAX_IDENTIFIERS_PER_QUERY])
+            batch = loop.run_in_executor(self._executor, self._run, query, list(waiters))
+            batch.add_done_callback(functools.partial(self._resolve, waiters))
+
+    def _resolve(self: A, waiters: Dict[Hashable, asyncio.Future], batch: Future) -> None:
+        """Hand the result of a batch to the futures of its keys."""
+        for key, waiter in waiters.items():
+            if self._pending.get(key) is waiter:
+                del self._pending[key]
+            if waiter.done():
+                continue
+            if batch.cancelled():
+                waiter.cancel()
+                continue
+            error = batch.exception()
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(batch.result()[key])
+
+    async def get_many(self: A, identifiers: Iterable[str]) -> Dict[str, List[tables.Pokemon]]:
+        """Fetch the Pokémon of many identifiers.
+
+        Args:
+            identifiers: Pokémon identifiers, e.g. `"pikachu"`.
+
+        Returns:
+            A dict of identifier to the list of matching `Pokemon`, with
+            their species loaded. Unknown identifiers map to `[]`.
+        """
+        futures = self._coalesce(
+            (("pokemon", identifier) for identifier in identifiers), self._query_pokemon
+        )
+        results = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        return {key[1]: list(result) for key, result in zip(futures, results)}
+
+    async def get_pokemon(self: A, identifier: str) -> List[tables.Pokemon]:
+        """Fetch the Pokémon of an identifier, like `tables.get_pokemon`.
+
+        Args:
+            identifier: A Pokémon identifier, e.g. `"pikachu"`.
+
+        Returns:
+            The list of matching `Pokemon`, with their species loaded.
+        """
+        return (await self.get_many([identifier]))[identifier]
+
+    async def search(self: A, text: str, limit: int = 10) -> List[search.SearchResult]:
+        """Run `search.search`, coalescing identical searches.
+
+        Args:
+            text: A prefix or fragment of an identifier.
+            limit: Maximum number of results.
+
+        Returns:
+            A list of `Pokemon` and `PokemonSpecies` instances, best first.
+        """
+        (future,) = self._coalesce([("search", text, limit)], self._query_search).values()
+        return list(await asyncio.shield(future))
@@ -0,0 +1,449 @@
+"""Dense, array-backed views of Pokédex tables.
+
+Looking up a species row through `peewee` for every Pokémon is far too
+slow when millions of Pokémon are created at once. The classes in this
+module read a table once and store each column in a NumPy array indexed
+by the row's primary key, so per-Pokémon lookups become array indexing.
+`Learnset` keeps its rows sorted instead, and finds runs of them by
+bisection.
+"""
+import functools
+from typing import Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+import attr
+import numpy as np
+import peewee
+from numpy.typing import ArrayLike
+
+from pokemaster2.db.tables import PokemonMove, PokemonSpecies
+from pokemaster2.db.tables import Type as TypeModel
+from pokemaster2.db.tables import TypeEfficacy
+
+S = TypeVar("S", bound="SpeciesArrays")
+C = TypeVar("C", bound="TypeChart")
+L = TypeVar("L", bound="Learnset")
+
+# Id of the "level-up" method in the `pokemon_move_methods` table.
+LEVEL_UP = 1
+# Learnset keys pack a Pokémon id, a version group id and a level.
+_LEVEL_BITS = 8
+_VERSION_GROUP_BITS = 16
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SpeciesArrays:
+    """Per-species parameters, indexed by species id.
+
+    Index 0 and ids missing from the table are padded: `known` is False,
+    `gender_rate` is -1 (genderless) and everything else is 0.
+    """
+
+    known: np.ndarray
+    gender_rate: np.ndarray
+    capture_rate: np.ndarray
+    hatch_counter: np.ndarray
+    is_baby: np.ndarray
+    evolves_from: np.ndarray
+
+    @classmethod
+    def from_rows(cls: Type[S], rows: ArrayLike) -> S:
+        """Build the arrays from an integer matrix of species rows.
+
+        Args:
+            rows: An `(n, 6)` integer array whose columns are `id`,
+                `gender_rate`, `capture_rate`, `hatch_counter`, `is_baby`
+                and `evolves_from_species_id` (0 for no pre-evolution).
+
+        Returns:
+            A `SpeciesArrays` instance.
+        """
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1, 6)
+        size = int(rows[:, 0].max()) + 1 if len(rows) else 1
+        ids = rows[:, 0]
+
+        known = np.zeros(size, dtype=bool)
+        gender_rate = np.full(size, -1, dtype=np.int8)
+        capture_rate = np.zeros(size, dtype=np.int16)
+        hatch_counter = np.zeros(size, dtype=np.int16)
+        is_baby = np.zeros(size, dtype=bool)
+        evolves_from = np.zeros(size, dtype=np.int32)
+
+        known[ids] = True
+        gender_rate[ids] = rows[:, 1]
+        capture_rate[ids] = rows[:, 2]
+        hatch_counter[ids] = rows[:, 3]
+        is_baby[ids] = rows[:, 4].astype(bool)
+        evolves_from[ids] = rows[:, 5]
+
+        return cls(
+            known=known,
+            gender_rate=gender_rate,
+            capture_rate=capture_rate,
+            hatch_counter=hatch_counter,
+            is_baby=is_baby,
+            evolves_from=evolves_from,
+        )
+
+    @classmethod
+    def from_database(cls: Type[S]) -> S:
+        """Read `PokemonSpecies` from its bound database.
+
+        Returns:
+            A `SpeciesArrays` instance.
+        """
+        query = PokemonSpecies.select(
+            PokemonSpecies.id,
+            PokemonSpecies.gender_rate,
+            PokemonSpecies.capture_rate,
+            PokemonSpecies.hatch_counter,
+            PokemonSpecies.is_baby,
+            peewee.fn.COALESCE(PokemonSpecies.evolves_from_species_id, 0),
+        ).tuples()
+        return cls.from_rows(np.array(list(query), dtype=np.int64))
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class TypeChart:
+    """The type chart as a dense matrix of damage multipliers.
+
+    `multipliers[damage_type_id, target_type_id]` is the multiplier of a
+    move of the first type against a Pokémon of the second one, e.g. 2.0
+    for water against fire. Index 0 stands for "no type", e.g. the second
+    type of a single-typed Pokémon, and pairs missing from the table are
+    neutral: both are padded with 1.0.
+
+    Attributes:
+        multipliers: A square `float64` matrix, indexed by type ids.
+        identifiers: The identifier of every type id; `""` for ids
+            missing from the types table.
+    """
+
+    multipliers: np.ndarray
+    identifiers: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_rows(cls: Type[C], rows: ArrayLike, identifiers: Sequence[str] = ()) -> C:
+        """Build the matrix from an integer matrix of type efficacy rows.
+
+        Args:
+            rows: An `(n, 3)` integer array whose columns are
+                `damage_type_id`, `target_type_id` and `damage_factor`
+                (a percentage).
+            identifiers: The identifier of every type id, index 0 being
+                unused.
+
+        Returns:
+            A `TypeChart` instance.
+        """
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1, 3)
+        size = max(int(rows[:, :2].max()) + 1 if len(rows) else 1, len(identifiers))
+        multipliers = np.ones((size, size), dtype=np.float64)
+        multipliers[rows[:, 0], rows[:, 1]] = rows[:, 2] / 100
+        identifiers = tuple(identifiers) + ("",) * (size - len(identifiers))
+        return cls(multipliers=multipliers, identifiers=identifiers)
+
+    @classmethod
+    def from_database(cls: Type[C]) -> C:
+        """Read `Type` and `TypeEfficacy` from their bound database.
+
+        Returns:
+            A `TypeChart` instance.
+        """
+        types = dict(TypeModel.select(TypeModel.id, TypeModel.identifier).tuples())
+        identifiers = [types.get(i, "") for i in range(max(types, default=0) + 1)]
+        query = TypeEfficacy.select(
+            TypeEfficacy.damage_type_id,
+            TypeEfficacy.target_type_id,
+            TypeEfficacy.damage_factor,
+        ).tuples()
+        return cls.from_rows(np.array(list(query), dtype=np.int64), identifiers)
+
+    def type_ids(self: C, types: Iterable[Sequence[str]]) -> np.ndarray:
+        """Convert the types of Pokémon, e.g. `BasePokemon.types`, to ids.
+
+        Args:
+            types: One or two type identifiers per Pokémon.
+
+        Raises:
+            KeyError: if a type is not in the chart.
+
+        Returns:
+            An `(n, 2)` `int64` array of type ids, 0 for no second type.
+        """
+        ids = {identifier: i for i, identifier in enumerate(self.identifiers) if identifier}
+        rows = [[ids[identifier] for identifier in pair] + [0] * (2 - len(pair)) for pair in types]
+        return np.array(rows, dtype=np.int64).reshape(-1, 2)
+
+    def effectiveness(self: C, move_types: np.ndarray, target_types: np.ndarray) -> np.ndarray:
+        """The multipliers of moves against dual-typed Pokémon.
+
+        Args:
+            move_types: Type ids of the moves.
+            target_types: Type ids of the targets, with a trailing axis
+                of 2 types. Broadcasts against `move_types`.
+
+        Returns:
+            A `float64` array: the product of the multipliers against
+            both types of the target.
+        """
+        move_types = np.asarray(move_types)
+        target_types = np.asarray(target_types)
+        return (
+            self.multipliers[move_types, target_types[..., 0]]
+            * self.multipliers[move_types, target_types[..., 1]]
+        )
+
+
+def _learnset_keys(
+    pokemon_ids: ArrayLike, version_group_ids: ArrayLike, levels: ArrayLike
+) -> np.ndarray:
+    return (
+        np.asarray(pokemon_ids, dtype=np.int64) << (_VERSION_GROUP_BITS + _LEVEL_BITS)
+        | np.asarray(version_group_ids, dtype=np.int64) << _LEVEL_BITS
+        | np.asarray(levels, dtype=np.int64)
+    )
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Learnset:
+    """The level-up moves of every Pokémon in every version group.
+
+    The moves of a Pokémon in a version group are a contiguous run of
+    `moves`, in the order they are learned. `keys` packs the Pokémon id,
+    the version group id and the level of every move into one sorted
+    integer, so the moves learned between two levels are found by
+    bisecting `keys`.
+
+    Attributes:
+        keys: The sorted `int64` keys of the moves.
+        levels: The level each move is learned at.
+        moves: The move ids.
+    """
+
+    keys: np.ndarray
+    levels: np.ndarray
+    moves: np.ndarray
+
+    @classmethod
+    def from_rows(cls: Type[L], rows: ArrayLike) -> L:
+        """Build the index from an integer matrix of learnset rows.
+
+        Args:
+            rows: An `(n, 5)` integer array whose columns are
+                `pokemon_id`, `version_group_id`, `move_id`, `level` and
+                `order` (the order of moves learned at the same level).
+
+        Returns:
+            A `Learnset` instance.
+        """
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1, 5)
+        keys = _learnset_keys(rows[:, 0], rows[:, 1], rows[:, 3])
+        order = np.lexsort((rows[:, 2], rows[:, 4], keys))
+        return cls(
+            keys=keys[order],
+            levels=rows[order, 3].astype(np.int16),
+            moves=rows[order, 2].astype(np.int32),
+        )
+
+    @classmethod
+    def from_database(cls: Type[L], method: int = LEVEL_UP) -> L:
+        """Read `PokemonMove` from its bound database.
+
+        Args:
+            method: The `pokemon_move_methods` id of the moves to index.
+
+        Returns:
+            A `Learnset` instance.
+        """
+        query = (
+            PokemonMove.select(
+                PokemonMove.pokemon_id,
+                PokemonMove.version_group_id,
+                PokemonMove.move_id,
+                PokemonMove.level,
+                peewee.fn.COALESCE(PokemonMove.order, 0),
+            )
+            .where(PokemonMove.pokemon_move_method_id == method)
+            .tuples()
+        )
+        return cls.from_rows(np.array(list(query), dtype=np.int64))
+
+    def spans(
+        self: L,
+        pokemon_ids: ArrayLike,
+        version_group_ids: ArrayLike,
+        low: ArrayLike,
+        high: ArrayLike,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the runs of moves learned above a level and up to another.
+
+        Arguments broadcast against each other.
+
+        Args:
+            pokemon_ids: Pokémon ids.
+            version_group_ids: Version group ids.
+            low: Moves must be learned above this level; -1 for all.
+            high: Moves must be learned at or below this level.
+
+        Returns:
+            The `start` and `stop` indices of the runs, into `moves`.
+        """
+        start = np.searchsorted(
+            self.keys, _learnset_keys(pokemon_ids, version_group_ids, np.add(low, 1)), "left"
+        )
+        stop = np.searchsorted(
+            self.keys, _learnset_keys(pokemon_ids, version_group_ids, high), "right"
+        )
+        return start, np.maximum(start, stop)
+
+    def learned(self: L, pokemon_id: int, version_group_id: int, low: int, high: int) -> List[int]:
+        """Find the moves learned when leveling up from `low` to `high`.
+
+        Args:
+            pokemon_id: The Pokémon id.
+            version_group_id: The version group id.
+            low: The level before, whose moves are not included; -1 to
+                include every move up to `high`.
+            high: The level after.
+
+        Returns:
+            The move ids, in the order they are learned.
+        """
+        start, stop = self.spans(pokemon_id, version_group_id, low, high)
+        return self.moves[int(start) : int(stop)].tolist()
+
+    def learned_many(
+        self: L,
+        pokemon_ids: ArrayLike,
+        version_group_ids: ArrayLike,
+        low: ArrayLike,
+        high: ArrayLike,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the moves a whole population learns when leveling up.
+
+        Arguments broadcast against each other.
+
+        Args:
+            pokemon_ids: Pokémon ids.
+            version_group_ids: Version group ids.
+            low: The levels before, see `learned`.
+            high: The levels after.
+
+        Returns:
+            The index of the Pokémon learning each move, and the move
+            ids, grouped by Pokémon in the order they are learned.
+        """
+        start, stop = (
+            array.ravel() for array in self.spans(pokemon_ids, version_group_ids, low, high)
+        )
+        counts = stop - start
+        owners = np.repeat(np.arange(len(counts)), counts)
+        # Index of every move within its run, plus the start of the run.
+        positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return owners, self.moves[positions + start[owners]]
+
+    def movesets(
+        self: L,
+        pokemon_ids: ArrayLike,
+        version_group_ids: ArrayLike,
+        levels: ArrayLike,
+        size: int = 4,
+    ) -> np.ndarray:
+        """Pick the moves of wild Pokémon: the last moves learned by their level.
+
+        Pokémon of the same id, version group and level get the same
+        moves, so each distinct combination is looked up once.
+
+        Args:
+            pokemon_ids: Pokémon ids.
+            version_group_ids: Version group ids.
+            levels: Levels of the Pokémon.
+            size: Number of moves per Pokémon.
+
+        Returns:
+            An `int32` array of move ids of shape `(..., size)`, in the
+            order they were learned, padded with 0 at the end.
+        """
+        keys = _learnset_keys(pokemon_ids, version_group_ids, levels)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        stops = np.searchsorted(self.keys, unique, "right")
+        starts = np.searchsorted(self.keys, unique >> _LEVEL_BITS << _LEVEL_BITS, "left")
+        table = np.zeros((len(unique), size), dtype=np.int32)
+        for row, (start, stop) in enumerate(zip(starts.tolist(), stops.tolist())):
+            # A move learned at several levels only takes one slot.
+            moves = list(dict.fromkeys(reversed(self.moves[start:stop].tolist())))[:size]
+            table[row, : len(moves)] = moves[::-1]
+        return table[inverse.reshape(keys.shape)]
+
+
+def get_species_arrays(database: Optional[peewee.Database] = None) -> SpeciesArrays:
+    """Return the cached `SpeciesArrays` for a database.
+
+    The arrays are read once per database. Call `clear_cache()` after
+    the species table has been reloaded.
+
+    Args:
+        database: The database `PokemonSpecies` is bound to. Defaults to
+            the model's current database.
+
+    Returns:
+        A `SpeciesArrays` instance.
+    """
+    return _cached_species_arrays(database or PokemonSpecies._meta.database)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_species_arrays(database: peewee.Database) -> SpeciesArrays:
+    with database.bind_ctx([PokemonSpecies], bind_refs=False, bind_backrefs=False):
+        return SpeciesArrays.from_database()
+
+
+def get_type_chart(database: Optional[peewee.Database] = None) -> TypeChart:
+    """Return the cached `TypeChart` for a database.
+
+    The chart is read once per database. Call `clear_cache()` after the
+    type tables have been reloaded.
+
+    Args:
+        database: The database `TypeEfficacy` is bound to. Defaults to
+            the model's current database.
+
+    Returns:
+        A `TypeChart` instance.
+    """
+    return _cached_type_chart(database or TypeEfficacy._meta.database)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_type_chart(database: peewee.Database) -> TypeChart:
+    with database.bind_ctx([TypeModel, TypeEfficacy], bind_refs=False, bind_backrefs=False):
+        return TypeChart.from_database()
+
+
+def get_learnset(database: Optional[peewee.Database] = None) -> Learnset:
+    """Return the cached level-up `Learnset` for a database.
+
+    The index is read once per database. Call `clear_cache()` after the
+    `pokemon_moves` table has been reloaded.
+
+    Args:
+        database: The database `PokemonMove` is bound to. Defaults to the
+            model's current database.
+
+    Returns:
+        A `Learnset` instance.
+    """
+    return _cached_learnset(database or PokemonMove._meta.database)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_learnset(database: peewee.Database) -> Learnset:
+    with database.bind_ctx([PokemonMove], bind_refs=False, bind_backrefs=False):
+        return Learnset.from_database()
+
+
+def clear_cache() -> None:
+    """Forget every cached `SpeciesArrays`, `TypeChart` and `Learnset`."""
+    _cached_species_arrays.cache_clear()
+    _cached_type_chart.cache_clear()
+    _cached_learnset.cache_clear()
@@ -0,0 +1,218 @@
+"""Checkpoints of `pokemaster2.db.io.load`, to resume interrupted loads.
+
+A plain load is one transaction: interrupting it near the end throws all
+of its work away. A checkpointed load commits every `rows` rows and at
+the end of every table instead. Each commit also records, in the
+`load_checkpoints` table, how far the CSV file of the table was read:
+the byte offset and the line number of its first unread line, and
+whether the table is done.
+
+Resuming a load skips the tables that are done, and seeks the CSV files
+of the others to their last checkpoint. The rows inserted after it were
+rolled back with the interrupted transaction, so they are read again.
+"""
+import contextlib
+import itertools
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple, Type, TypeVar
+
+import attr
+import peewee
+
+from pokemaster2.db.tables import BaseModel
+
+C = TypeVar("C", bound="Checkpointer")
+T = TypeVar("T", bound="TrackedLines")
+
+# Rows per transaction of a resumed load, if not given.
+DEFAULT_ROWS = 100_000
+
+# The byte offset and line number of the first unread line of a file.
+Position = Tuple[int, int]
+
+
+class LoadCheckpoint(BaseModel):
+    """The progress of a checkpointed load on one table."""
+
+    table = peewee.CharField(primary_key=True, help_text="The name of the table")
+    offset = peewee.IntegerField(help_text="Byte offset of the first unread line of the CSV")
+    line = peewee.IntegerField(help_text="Number of lines of the CSV read, header included")
+    done = peewee.BooleanField(help_text="True if the whole CSV is in the table")
+
+    class Meta:
+        """Not part of the veekun schema."""
+
+        table_name = "load_checkpoints"
+
+
+class TrackedLines:
+    """The lines of a CSV file opened in binary mode, and their positions.
+
+    Text files cannot tell their position while they are iterated over,
+    so the file is read as bytes, in blocks of whole lines. Each block is
+    split into lines and decoded, and the offsets of its line ends are
+    kept, so the position after any line of the current block is known.
+    The header is always read first, even when starting from a
+    checkpoint.
+
+    Attributes:
+        header: The header line.
+    """
+
+    def __init__(
+        self: T, file: BinaryIO, position: Optional[Position] = None, block_size: int = 1 << 16
+    ) -> None:
+        """Start reading a file after its header, or at a position.
+
+        Args:
+            file: The file, opened in binary mode.
+            position: Where to continue, past the header.
+            block_size: Approximate number of bytes read at a time.
+        """
+        self._file = file
+        self._block_size = block_size
+        header = file.readline()
+        self.header = header.decode("utf-8")
+        offset, line = len(header), 1 if header else 0
+        if position is not None and position[0] > offset:
+            offset, line = position
+            file.seek(offset)
+        self._start_line = line
+        # The line number at the start of the current block, and the
+        # offset after each of its lines, starting with the block start.
+        self._block_line = line
+        self._ends = [offset]
+
+    @property
+    def position(self: T) -> Position:
+        """The byte offset and line number after the lines read so far.
+
+        Lines are read ahead in blocks: this is the end of the file once
+        the iterator is exhausted.
+        """
+        return self._ends[-1], self._block_line + len(self._ends) - 1
+
+    def position_of(self: T, lines: int) -> Position:
+        """The position after the first lines of the iterator.
+
+        Args:
+            lines: Number of lines taken from the iterator, header
+                included, e.g. `csv.reader.line_num`.
+
+        Returns:
+            The byte offset and line number of the next line.
+        """
+        line = self._start_line + lines - 1
+        return self._ends[line - self._block_line], line
+
+    def __iter__(self: T) -> Iterator[str]:
+        header = [self.header] if self.header else []
+        return itertools.chain(header, itertools.chain.from_iterable(self._blocks()))
+
+    def _blocks(self: T) -> Iterator[Iterator[str]]:
+        while True:
+            block = self._file.read(self._block_size)
+            if not block:
+                return
+            if not block.endswith(b"\n"):
+                block += self._file.readline()
+            lines = block.splitlines(keepends=True)
+            self._block_line += len(self._ends) - 1
+            self._ends = list(itertools.accumulate(map(len, lines), initial=self._ends[-1]))
+            yield map(bytes.decode, lines)
+
+
+@attr.s(auto_attribs=True)
+class Checkpointer:
+    """Commits a checkpointed load, recording the progress of every table.
+
+    Attributes:
+        database: The database being loaded.
+        rows: Commit once this many rows were inserted since the last
+            commit; 0 to commit at the end of tables only.
+        checkpoints: The last checkpoint of every table, by table name.
+    """
+
+    database: peewee.Database
+    rows: int = DEFAULT_ROWS
+    checkpoints: Dict[str, LoadCheckpoint] = attr.Factory(dict)
+    _pending: int = attr.ib(default=0, init=False)
+
+    @classmethod
+    def start(cls: Type[C], database: peewee.Database, rows: int, resume: bool = False) -> C:
+        """Prepare the checkpoints of a load.
+
+        Args:
+            database: The database to load.
+            rows: See `Checkpointer.rows`.
+            resume: Keep the checkpoints of the last load, to continue it.
+                Otherwise they are forgotten.
+
+        Returns:
+            A `Checkpointer` instance.
+        """
+        database.bind([LoadCheckpoint])
+        LoadCheckpoint.create_table(safe=True)
+        if not resume:
+            LoadCheckpoint.delete().execute()
+        checkpoints = {checkpoint.table: checkpoint for checkpoint in LoadCheckpoint.select()}
+        return cls(database=database, rows=rows, checkpoints=checkpoints)
+
+    def started(self: C, table: str) -> bool:
+        """Whether some rows of a table were committed."""
+        return table in self.checkpoints
+
+    def done(self: C, table: str) -> bool:
+        """Whether all the rows of a table were committed."""
+        return table in self.checkpoints and self.checkpoints[table].done
+
+    def position(self: C, table: str) -> Optional[Position]:
+        """Where to continue reading the CSV file of a table, if it was started."""
+        checkpoint = self.checkpoints.get(table)
+        return None if checkpoint is None else (checkpoint.offset, checkpoint.line)
+
+    @contextlib.contextmanager
+    def transaction(self: C) -> Iterator[None]:
+        """Run a load in transactions committed at the checkpoints.
+
+        Yields:
+            Nothing. Rows inserted since the last checkpoint are rolled
+            back if the load is interrupted.
+        """
+        with self.database.manual_commit():
+            self.database.begin()
+            try:
+                yield
+            except BaseException:
+                self.database.rollback()
+                raise
+            self.database.commit()
+
+    def advance(self: C, table: str, rows: int, position: Position) -> None:
+        """Count inserted rows, and commit if a checkpoint is due.
+
+        Args:
+            table: The table name.
+            rows: Number of rows just inserted.
+            position: The position in the CSV file after these rows.
+        """
+        self._pending += rows
+        if self.rows and self._pending >= self.rows:
+            self._commit(table, position, done=False)
+
+    def finish(self: C, table: str, position: Position) -> None:
+        """Commit the last rows of a table.
+
+        Args:
+            table: The table name.
+            position: The end of the CSV file.
+        """
+        self._commit(table, position, done=True)
+
+    def _commit(self: C, table: str, position: Position, done: bool) -> None:
+        offset, line = position
+        checkpoint = LoadCheckpoint(table=table, offset=offset, line=line, done=done)
+        LoadCheckpoint.replace(**checkpoint.__data__).execute()
+        self.database.commit()
+        self.database.begin()
+        self.checkpoints[table] = checkpoint
+        self._pending = 0
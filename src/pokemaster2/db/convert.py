@@ -0,0 +1,201 @@
+"""Convert CSV rows into typed tuples before inserting them.
+
+`csv.reader` yields strings only. `RowConverter.compile` builds, once
+per table, a Python function that turns a raw row into a tuple of the
+column types derived from the `peewee` fields:
+
+* integers and foreign keys become `int`;
+* booleans become `0` or `1`, from `0`/`1` or `false`/`true`;
+* empty values of nullable columns become `None` (NULL);
+* everything else is kept as `str`.
+
+The function is generated as a single expression, so converting a row
+costs one Python call and no per-column dispatch. Rows that cannot be
+converted are reported as `RowError`, with the line number of the CSV
+file, and skipped.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Type, TypeVar
+
+import attr
+import peewee
+
+from pokemaster2.db import tables
+
+E = TypeVar("E", bound="RowError")
+R = TypeVar("R", bound="RowConverter")
+
+BOOLEANS = {"0": 0, "1": 1, "false": 0, "true": 1, "False": 0, "True": 1}
+
+
+def field_kind(field: peewee.Field) -> str:
+    """Classify a field as `"bool"`, `"int"` or `"str"`.
+
+    Args:
+        field: The field.
+
+    Returns:
+        str
+    """
+    if isinstance(field, peewee.ForeignKeyField):
+        field = field.rel_field
+    if isinstance(field, peewee.BooleanField):
+        return "bool"
+    if isinstance(field, peewee.IntegerField):
+        return "int"
+    return "str"
+
+
+def _expression(field: peewee.Field, index: int) -> str:
+    """Python source converting `row[index]` to the type of `field`."""
+    value = f"row[{index}]"
+    kind = field_kind(field)
+    if kind == "int":
+        converted = f"int({value})"
+    elif kind == "bool":
+        converted = f"BOOLEANS[{value}]"
+    else:
+        return f"({value} or None)" if field.null else value
+    if field.null:
+        return f"(None if {value} == '' else {converted})"
+    return converted
+
+
+class RowError(ValueError):
+    """A CSV row that cannot be converted."""
+
+    def __init__(
+        self: E, table: str, line: int, column: Optional[str], value: str, reason: str
+    ) -> None:
+        """Describe the bad row."""
+        self.table = table
+        self.line = line
+        self.column = column
+        self.value = value
+        self.reason = reason
+        where = f"column {column!r}" if column else "row"
+        super().__init__(f"{table}.csv, line {line}, {where}: {reason} ({value!r})")
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class RowConverter:
+    """A compiled converter from raw CSV rows to typed tuples.
+
+    Usage:
+        >>> header = [field.column_name for field in tables.Pokemon._meta.sorted_fields]
+        >>> converter = RowConverter.compile(tables.Pokemon, header)
+        >>> converter.convert(["25", "pikachu", "25", "4", "60", "112", "32", "1"])
+        (25, 'pikachu', 25, 4, 60, 112, 32, 1)
+    """
+
+    model: Type[tables.BaseModel]
+    fields: List[peewee.Field]
+    indexes: List[int]
+    width: int
+    convert: Callable[[Sequence[str]], tuple] = attr.ib(repr=False)
+
+    @classmethod
+    def compile(cls: Type[R], model: Type[tables.BaseModel], header: Sequence[str]) -> R:
+        """Build the converter of a table for a CSV header.
+
+        CSV columns that are not fields of the model are ignored.
+
+        Args:
+            model: The model class.
+            header: The column names of the CSV file.
+
+        Raises:
+            ValueError: if a required column is missing from the header.
+
+        Returns:
+            A `RowConverter` instance.
+        """
+        positions = {name: index for index, name in enumerate(header)}
+        fields, indexes = [], []
+        for field in model._meta.sorted_fields:
+            index = positions.get(field.column_name)
+            if index is None:
+                if not field.null and field.default is None:
+                    raise ValueError(
+                        f"{model._meta.table_name}.csv has no column {field.column_name!r}."
+                    )
+                continue
+            fields.append(field)
+            indexes.append(index)
+
+        items = ", ".join(_expression(field, index) for field, index in zip(fields, indexes))
+        source = f"def convert(row):\n    return ({items},)\n"
+        namespace: Dict[str, Any] = {"BOOLEANS": BOOLEANS}
+        code = compile(source, f"<{model._meta.table_name} converter>", "exec")
+        exec(code, namespace)  # noqa: S102
+        return cls(
+            model=model,
+            fields=fields,
+            indexes=indexes,
+            width=len(header),
+            convert=namespace["convert"],
+        )
+
+    @property
+    def columns(self: R) -> List[str]:
+        """Names of the columns of the converted tuples."""
+        return [field.column_name for field in self.fields]
+
+    def explain(self: R, row: Sequence[str], line: int) -> RowError:
+        """Find out why a row cannot be converted.
+
+        Args:
+            row: The raw row.
+            line: Its line number in the CSV file.
+
+        Returns:
+            A `RowError` naming the offending column.
+        """
+        table = self.model._meta.table_name
+        if len(row) != self.width:
+            return RowError(table, line, None, ",".join(row), f"expected {self.width} columns")
+        for field, index in zip(self.fields, self.indexes):
+            value = row[index]
+            kind = field_kind(field)
+            if value == "" and not field.null and kind != "str":
+                return RowError(table, line, field.column_name, value, "value is required")
+            if value == "" and field.null:
+                continue
+            if kind == "int":
+                try:
+                    int(value)
+                except ValueError:
+                    return RowError(table, line, field.column_name, value, "not an integer")
+            elif kind == "bool" and value not in BOOLEANS:
+                return RowError(table, line, field.column_name, value, "not a boolean")
+        return RowError(table, line, None, ",".join(row), "cannot convert")  # pragma: no cover
+
+    def convert_rows(
+        self: R,
+        rows: Iterable[Sequence[str]],
+        line_numbers: Callable[[], int],
+        errors: Optional[List[RowError]] = None,
+    ) -> Iterator[tuple]:
+        """Convert rows, skipping the bad ones.
+
+        Args:
+            rows: Raw rows, e.g. a `csv.reader` past its header.
+            line_numbers: Returns the line number of the last row read,
+                e.g. `lambda: reader.line_num`.
+            errors: Bad rows are appended to this list. If omitted, the
+                first bad row raises its `RowError`.
+
+        Raises:
+            RowError: if a row is bad and no `errors` list is given.
+
+        Yields:
+            Typed tuples, in the order of `columns`.
+        """
+        convert = self.convert
+        for row in rows:
+            try:
+                yield convert(row)
+            except (ValueError, KeyError, IndexError):
+                error = self.explain(row, line_numbers())
+                if errors is None:
+                    raise error from None
+                errors.append(error)
@@ -0,0 +1,246 @@
+"""Export Pokédex tables into typed columnar files.
+
+Three formats are supported:
+
+* `parquet` and `arrow` (Arrow IPC file), which need `pyarrow`
+  (`pip install pokemaster2[arrow]`);
+* `npz`, an uncompressed NumPy archive with one array per column. NULLs
+  are stored in an extra boolean `<column>.mask` array for nullable
+  columns.
+
+Tables are read from the SQLite cursor in chunks and written chunk by
+chunk. The column types are taken from the `peewee` field definitions.
+"""
+import tempfile
+import zipfile
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+import numpy as np
+import peewee
+
+from pokemaster2.db import query, tables
+from pokemaster2.db.convert import field_kind
+
+FORMATS = ("parquet", "arrow", "npz")
+SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow", "npz": ".npz"}
+MASK_SUFFIX = ".mask"
+
+
+class Column(NamedTuple):
+    """The name and type of an exported column.
+
+    String columns have the unsized dtype `<U0`: SQLite does not enforce
+    `max_length`, so `npz` exports size them from the longest value.
+    """
+
+    name: str
+    kind: str
+    nullable: bool
+    dtype: np.dtype
+
+
+def columns(model: Type[tables.BaseModel]) -> List[Column]:
+    """Derive the exported columns of a model from its fields.
+
+    Args:
+        model: The model class.
+
+    Returns:
+        A list of `Column`, in the order of `model._meta.sorted_fields`.
+    """
+    result = []
+    for field in model._meta.sorted_fields:
+        kind = field_kind(field)
+        dtype: np.dtype
+        if kind == "bool":
+            dtype = np.dtype(bool)
+        elif kind == "int":
+            dtype = np.dtype(np.int64)
+        else:
+            dtype = np.dtype(str)
+        result.append(Column(field.column_name, kind, field.null, dtype))
+    return result
+
+
+def _import_pyarrow() -> ModuleType:
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as error:  # pragma: no cover
+        raise ImportError(
+            "Exporting to parquet or arrow requires pyarrow: pip install pokemaster2[arrow]"
+        ) from error
+    return pyarrow
+
+
+def read_chunks(
+    database: peewee.Database, model: Type[tables.BaseModel], chunk_size: int = 65536
+) -> Iterator[List[tuple]]:
+    """Read a table in chunks of rows, straight from the SQLite cursor.
+
+    Args:
+        database: The database to read from.
+        model: The table to read.
+        chunk_size: Number of rows per chunk.
+
+    Yields:
+        Lists of at most `chunk_size` raw rows.
+    """
+    select, _ = query.select(model)
+    cursor = database.execute(select)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def _arrow_schema(pyarrow: ModuleType, table_columns: Sequence[Column]) -> Any:
+    types = {"bool": pyarrow.bool_(), "int": pyarrow.int64(), "str": pyarrow.string()}
+    return pyarrow.schema(
+        [
+            pyarrow.field(column.name, types[column.kind], column.nullable)
+            for column in table_columns
+        ]
+    )
+
+
+def _export_arrow(
+    database: peewee.Database,
+    model: Type[tables.BaseModel],
+    path: Path,
+    fmt: str,
+    chunk_size: int,
+) -> None:
+    pyarrow = _import_pyarrow()
+    table_columns = columns(model)
+    schema = _arrow_schema(pyarrow, table_columns)
+    if fmt == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(str(path), schema)
+    else:
+        writer = pyarrow.ipc.new_file(str(path), schema)
+    with writer:
+        for rows in read_chunks(database, model, chunk_size):
+            arrays = []
+            for values, column, field in zip(zip(*rows), table_columns, schema):
+                if column.kind == "bool":
+                    # SQLite stores booleans as 0 and 1.
+                    values = tuple(None if value is None else bool(value) for value in values)
+                arrays.append(pyarrow.array(values, type=field.type))
+            writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+
+
+def _open_npy(path: Path, dtype: np.dtype, count: int) -> np.ndarray:
+    """Create a `.npy` file of `count` items; memory-mapped unless empty."""
+    if count == 0:
+        empty = np.empty(0, dtype=dtype)
+        np.save(path, empty)
+        return empty
+    return np.lib.format.open_memmap(path, "w+", dtype, (count,))
+
+
+def _count_and_dtypes(
+    database: peewee.Database, model: Type[tables.BaseModel], table_columns: Sequence[Column]
+) -> Tuple[int, List[np.dtype]]:
+    """Count the rows of a table, and size its string columns from the data."""
+    lengths = [
+        peewee.fn.MAX(peewee.fn.LENGTH(model._meta.columns[column.name]))
+        for column in table_columns
+        if column.kind == "str"
+    ]
+    select = model.select(peewee.fn.COUNT(peewee.SQL("*")), *lengths)
+    count, *widths = database.execute(select).fetchone()
+    # Empty or all-NULL columns still need a nonzero width.
+    remaining = iter(widths)
+    dtypes = [
+        np.dtype(f"<U{next(remaining) or 1}") if column.kind == "str" else column.dtype
+        for column in table_columns
+    ]
+    return count, dtypes
+
+
+def _write_npy_columns(
+    database: peewee.Database, model: Type[tables.BaseModel], tmp_dir: Path, chunk_size: int
+) -> List[Path]:
+    """Write every column (and NULL mask) of a table into its own `.npy` file."""
+    table_columns = columns(model)
+    count, dtypes = _count_and_dtypes(database, model, table_columns)
+    paths: List[Path] = []
+    arrays: List[np.ndarray] = []
+    masks: List[Optional[np.ndarray]] = []
+    for column, dtype in zip(table_columns, dtypes):
+        paths.append(tmp_dir / f"{column.name}.npy")
+        arrays.append(_open_npy(paths[-1], dtype, count))
+        masks.append(None)
+        if column.nullable:
+            paths.append(tmp_dir / f"{column.name}{MASK_SUFFIX}.npy")
+            masks[-1] = _open_npy(paths[-1], np.dtype(bool), count)
+
+    start = 0
+    for rows in read_chunks(database, model, chunk_size):
+        end = start + len(rows)
+        for values, column, array, mask in zip(zip(*rows), table_columns, arrays, masks):
+            if mask is not None:
+                mask[start:end] = [value is None for value in values]
+                fill = "" if column.kind == "str" else 0
+                values = tuple(fill if value is None else value for value in values)
+            array[start:end] = values
+        start = end
+
+    for npy in (*arrays, *masks):
+        if isinstance(npy, np.memmap):
+            npy.flush()
+    return paths
+
+
+def _export_npz(
+    database: peewee.Database, model: Type[tables.BaseModel], path: Path, chunk_size: int
+) -> None:
+    with tempfile.TemporaryDirectory(dir=path.parent) as tmp_dir:
+        npy_paths = _write_npy_columns(database, model, Path(tmp_dir), chunk_size)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for npy_path in npy_paths:
+                archive.write(npy_path, npy_path.name)
+
+
+def export(
+    database: peewee.Database,
+    out_dir: str,
+    fmt: str,
+    models: Optional[Sequence[Type[tables.BaseModel]]] = None,
+    chunk_size: int = 65536,
+) -> List[Path]:
+    """Export tables into one columnar file each.
+
+    Args:
+        database: The database to read from.
+        out_dir: Directory the files are written to; created if missing.
+        fmt: One of `FORMATS`.
+        models: Tables to export. If omitted, all tables are exported.
+        chunk_size: Number of rows read and written at a time.
+
+    Raises:
+        ValueError: if the format is unknown.
+
+    Returns:
+        The paths of the written files.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}. Choose from: {', '.join(FORMATS)}.")
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for model in models or tables.MODELS:
+        path = out_path / f"{model._meta.table_name}{SUFFIXES[fmt]}"
+        if fmt == "npz":
+            _export_npz(database, model, path, chunk_size)
+        else:
+            _export_arrow(database, model, path, fmt, chunk_size)
+        paths.append(path)
+    return paths
@@ -1,15 +1,30 @@
 """Load csv files into database."""
+import contextlib
 import csv
+import queue
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
 
 import peewee
 from loguru import logger
 
-from pokemaster2.db import default, tables
+from pokemaster2.db import default, search, tables
+from pokemaster2.db.checkpoint import DEFAULT_ROWS, Checkpointer, Position, TrackedLines
+from pokemaster2.db.convert import RowConverter, RowError
+from pokemaster2.db.plan import LoadPlan
+from pokemaster2.db.profiling import LoadProfiler
 
 # from playhouse import db_url
 
+# Marks the end of a prefetched iterator.
+_DONE = object()
+
+# An INSERT statement, a batch of rows for it, and the position in the
+# CSV file after them, if tracked.
+Batch = Tuple[str, List[tuple], Optional[Position]]
+
 
 def get_database(uri: Optional[str] = None) -> peewee.SqliteDatabase:
     """Connect to and return a database."""
@@ -51,10 +66,19 @@ def load(
     drop_tables: bool = False,
     safe: bool = True,
     recursive: bool = True,
+    profiler: Optional[LoadProfiler] = None,
+    strict: bool = False,
+    workers: int = 1,
+    checkpoint: Optional[int] = None,
+    resume: bool = False,
     # langs: Optional[str] = None,
 ) -> None:
     """Load data from CSV files into the given database.
 
+    Tables are loaded in the phases of a `LoadPlan`, so referenced tables
+    are always loaded first. Tables without a CSV file are created empty;
+    this is only logged as an error for the tables in `models`.
+
     Args:
         database: `peewee` database to use.
         models: List of tables to load. If omitted, all tables are loaded.
@@ -63,15 +87,54 @@ def load(
         safe: Load can be faster if set to False, but can corrupt the db
             if it crashes / interrupted.
         recursive: Load all dependent tables if set to True.
+        profiler: Records timings of every table and phase, if given.
+        strict: Stop at the first CSV row that cannot be converted to the
+            column types. Otherwise bad rows are logged and skipped.
+        workers: Number of threads reading and converting the CSV files
+            of a phase while its rows are inserted. Inserts always run in
+            the calling thread.
+        checkpoint: Commit every `checkpoint` rows and at the end of
+            every table, recording the progress of the load so that it
+            can be resumed; 0 to commit at the end of tables only. The
+            whole load is one transaction if omitted. See
+            `pokemaster2.db.checkpoint`. Only `safe` loads survive a crash
+            of the machine.
+        resume: Continue the last checkpointed load: tables it finished
+            are skipped, the others continue from their last checkpoint
+            and are not dropped. Commits every `checkpoint` rows, or
+            every `checkpoint.DEFAULT_ROWS` rows if omitted.
+
+    Raises:
+        RowError: if `strict` is set and a CSV row cannot be converted.
 
     Returns:
         Nothing.
 
     """
+    # Only some tables have bundled CSV files: the others are expected to
+    # be missing unless they were asked for.
+    requested = set(models or ())
     # Use all tables if no table is provided.
-    models = models or tables.MODELS
+    load_plan = LoadPlan.build(models or tables.MODELS, recursive=recursive)
+    models = load_plan.models
+    profiler = profiler or LoadProfiler()
     logger.debug("Tables to be loaded: {tables}", tables=models)
 
+    missing = load_plan.missing(csv_dir)
+    for model in missing:
+        logger.log(
+            "ERROR" if model in requested else "DEBUG",
+            "CSV file not found: {csv_file}",
+            csv_file=f"{model._meta.table_name}.csv",
+        )
+    for model, absent in load_plan.unresolved(missing).items():
+        logger.log(
+            "WARNING" if model in requested else "DEBUG",
+            "Table {table} references tables without data: {absent}",
+            table=model._meta.table_name,
+            absent=", ".join(dependency._meta.table_name for dependency in absent),
+        )
+
     # Load tables faster.
     if not safe:
         database.synchronous = 0
@@ -82,8 +145,16 @@ def load(
             mode=database.journal_mode,
         )
 
+    checkpointer = None
+    transaction = database.atomic()
+    if checkpoint is not None or resume:
+        checkpointer = Checkpointer.start(
+            database, DEFAULT_ROWS if checkpoint is None else checkpoint, resume=resume
+        )
+        transaction = checkpointer.transaction()
+
     logger.debug("Opening database {uri}", uri=database.database)
-    with database.atomic():
+    with transaction, contextlib.ExitStack() as stack:
         logger.debug("Opened database {uri}", uri=database.database)
         # Enable foreign keys
         database.foreign_keys = 1
@@ -95,30 +166,192 @@ def load(
 
         # Drop tables if asked.
         if drop_tables:
-            database.drop_tables(models)
-            logger.debug("Dropped tables: {tables}", tables=models)
+            # Keep the rows of a resumed load.
+            dropped = [
+                model
+                for model in models
+                if checkpointer is None or not checkpointer.started(model._meta.table_name)
+            ]
+            database.drop_tables(dropped)
+            logger.debug("Dropped tables: {tables}", tables=dropped)
 
-        # Create tables.
-        database.create_tables(models)
+        # Create tables. Indexes are built after the rows are inserted,
+        # which is faster than updating them row by row.
+        for model in models:
+            with profiler.phase(model._meta.table_name, "create"):
+                model._schema.create_table(safe=True)
         logger.debug("Tables created.")
 
-        # Run through the CSV files and load the data.
-        for model in models:
-            try:
-                # Read CSV data.
-                csv_file_path = Path(csv_dir) / f"{model._meta.table_name}.csv"
-                csv_dict_reader = csv.DictReader(csv_file_path.open(mode="r"))
+        executor = None
+        if workers > 1:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
 
-                # Insert CSV data to table in batches.
-                # http://docs.peewee-orm.com/en/latest/peewee/querying.html#inserting-rows-in-batches
-                for batch in peewee.chunked(csv_dict_reader, 100):
-                    model.insert_many(batch).execute()
+        # Run through the CSV files and load the data, phase by phase.
+        for phase in load_plan.phases:
+            sources = []
+            for model in phase:
+                table_name = model._meta.table_name
+                if model in missing:
+                    continue
+                if checkpointer is not None and checkpointer.done(table_name):
+                    logger.debug("Table {table} already loaded.", table=table_name)
+                    continue
+                csv_file_path = Path(csv_dir) / f"{table_name}.csv"
+                csv_file: IO
+                lines: Iterable[str]
+                tracked: Optional[TrackedLines] = None
+                if checkpointer is None:
+                    text_file = csv_file_path.open(mode="r", encoding="utf-8", newline="")
+                    csv_file, lines = text_file, text_file
+                else:
+                    binary_file = csv_file_path.open(mode="rb")
+                    tracked = TrackedLines(binary_file, checkpointer.position(table_name))
+                    csv_file, lines = binary_file, tracked
+                stack.enter_context(csv_file)
+                errors: Optional[List[RowError]] = None if strict else []
+                batches = _read_batches(model, lines, errors)
+                if executor is not None:
+                    batches = stack.enter_context(_prefetch(batches, executor))
+                sources.append((model, csv_file, tracked, batches, errors))
 
-                logger.debug("Written table {table} into database.", table=model._meta.table_name)
+            for model, csv_file, tracked, batches, errors in sources:
+                table_name = model._meta.table_name
+                _insert_batches(database, model, batches, profiler, checkpointer)
+                if checkpointer is not None and tracked is not None:
+                    checkpointer.finish(table_name, tracked.position)
+                csv_file.close()
+                for error in errors or ():
+                    logger.warning("Skipped a bad row: {error}", error=error)
+                logger.debug("Written table {table} into database.", table=table_name)
 
-            except IOError:
-                # Log the error and continue the next loop.
-                logger.error("CSV file not found: {csv_file}", csv_file=csv_file_path.name)
-                continue
+            for model in phase:
+                with profiler.phase(model._meta.table_name, "index"):
+                    model._schema.create_indexes(safe=True)
+                if model in search.MODELS:
+                    _refresh_search(database, model, profiler)
 
     return True
+
+
+def _refresh_search(
+    database: peewee.Database, model: Type[tables.BaseModel], profiler: LoadProfiler
+) -> None:
+    """Update the search index entries of a table, if SQLite supports it."""
+    with profiler.phase(model._meta.table_name, "search"):
+        try:
+            search.refresh(database, [model])
+        except peewee.OperationalError as error:
+            logger.warning("Search index not updated: {error}", error=error)
+
+
+def _read_batches(
+    model: Type[tables.BaseModel],
+    csv_file: Union[Iterable[str], TrackedLines],
+    errors: Optional[List[RowError]] = None,
+    batch_size: int = 1000,
+) -> Iterator[Batch]:
+    """Read a CSV file and convert its rows to typed tuples, in batches.
+
+    Yields:
+        The INSERT statement for the columns of the file, a batch of rows
+        for it, and the position after them if `csv_file` tracks it.
+    """
+    reader = csv.reader(csv_file)
+    header = next(reader, None)
+    if header is None:
+        logger.warning("Empty CSV file: {table}.csv", table=model._meta.table_name)
+        return
+    converter = RowConverter.compile(model, header)
+    sql, _ = model.insert({field: None for field in converter.fields}).sql()
+    if isinstance(csv_file, TrackedLines):
+        # Line numbers continue from the checkpoint the file starts at.
+        rows = converter.convert_rows(
+            reader, lambda: csv_file.position_of(reader.line_num)[1], errors
+        )
+        for batch in peewee.chunked(rows, batch_size):
+            yield sql, batch, csv_file.position_of(reader.line_num)
+    else:
+        rows = converter.convert_rows(reader, lambda: reader.line_num, errors)
+        for batch in peewee.chunked(rows, batch_size):
+            yield sql, batch, None
+
+
+@contextlib.contextmanager
+def _prefetch(
+    batches: Iterator[Batch], executor: Executor, depth: int = 4
+) -> Iterator[Iterator[Batch]]:
+    """Consume an iterator in a worker thread, `depth` items ahead.
+
+    Yields:
+        An iterator over the same items. Exceptions raised by `batches`
+        are raised again when the consumer reaches them.
+    """
+    items: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.05)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def produce() -> None:
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+        except Exception as error:  # noqa: B902
+            put(error)
+        else:
+            put(_DONE)
+
+    def consume() -> Iterator[Batch]:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    executor.submit(produce)
+    try:
+        yield consume()
+    finally:
+        stop.set()
+
+
+def _insert_batches(
+    database: peewee.Database,
+    model: Type[tables.BaseModel],
+    batches: Iterable[Batch],
+    profiler: LoadProfiler,
+    checkpointer: Optional[Checkpointer] = None,
+) -> None:
+    """Insert batches of typed tuples, timing parsing and inserting.
+
+    Waiting for the next batch is timed as the `parse` phase, inserting
+    as the `insert` phase, committing checkpoints included. The tuples
+    are passed to `executemany` as they are, without going through the
+    model.
+    """
+    table_name = model._meta.table_name
+    batches = iter(batches)
+    while True:
+        with profiler.phase(table_name, "parse") as record:
+            item = next(batches, None)
+            if item is not None:
+                record.rows += len(item[1])
+                record.batches += 1
+        if item is None:
+            break
+        sql, batch, position = item
+        with profiler.phase(table_name, "insert") as record:
+            database.cursor().executemany(sql, batch)
+            if checkpointer is not None and position is not None:
+                checkpointer.advance(table_name, len(batch), position)
+            record.rows += len(batch)
+            record.batches += 1
@@ -0,0 +1,133 @@
+"""Plan the order in which tables are loaded.
+
+A table can only be loaded once the tables its foreign keys point at
+are loaded. `LoadPlan.build` sorts the tables topologically and groups
+them into phases: the tables of a phase only depend on tables of earlier
+phases, so they can be read in parallel.
+
+If the CSV file of a table is missing, the table is left empty and its
+dependents are still loaded; their references to it are reported as
+unresolved instead of failing the whole load.
+"""
+from pathlib import Path
+from typing import Dict, List, Sequence, Set, Type, TypeVar
+
+import attr
+import peewee
+
+from pokemaster2.db import tables
+
+P = TypeVar("P", bound="LoadPlan")
+
+Model = Type[tables.BaseModel]
+
+
+def dependencies(model: Model) -> Set[Model]:
+    """Find the tables a model references, itself excluded.
+
+    Args:
+        model: The model class.
+
+    Returns:
+        A set of model classes.
+    """
+    return {
+        field.rel_model
+        for field in model._meta.sorted_fields
+        if isinstance(field, peewee.ForeignKeyField) and field.rel_model is not model
+    }
+
+
+def _table_name(model: Model) -> str:
+    return model._meta.table_name
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class LoadPlan:
+    """Tables grouped into phases of foreign-key order.
+
+    Usage:
+        >>> plan = LoadPlan.build([tables.Pokemon])
+        >>> [[model.__name__ for model in phase] for phase in plan.phases][-2:]
+        [['PokemonSpecies'], ['Pokemon']]
+    """
+
+    phases: List[List[Model]]
+
+    @classmethod
+    def build(cls: Type[P], models: Sequence[Model], recursive: bool = True) -> P:
+        """Sort tables into phases.
+
+        Args:
+            models: The tables to load.
+            recursive: Also load the tables referenced by `models`,
+                recursively.
+
+        Raises:
+            ValueError: if foreign keys form a cycle.
+
+        Returns:
+            A `LoadPlan` instance.
+        """
+        selected = set(models)
+        if recursive:
+            pending = list(models)
+            while pending:
+                for dependency in dependencies(pending.pop()):
+                    if dependency not in selected:
+                        selected.add(dependency)
+                        pending.append(dependency)
+
+        remaining: Dict[Model, Set[Model]] = {
+            model: dependencies(model) & selected for model in selected
+        }
+        phases = []
+        while remaining:
+            phase = sorted(
+                (model for model, deps in remaining.items() if not deps), key=_table_name
+            )
+            if not phase:
+                names = ", ".join(sorted(map(_table_name, remaining)))
+                raise ValueError(f"Foreign keys form a cycle between: {names}.")
+            for model in phase:
+                del remaining[model]
+            for deps in remaining.values():
+                deps.difference_update(phase)
+            phases.append(phase)
+        return cls(phases=phases)
+
+    @property
+    def models(self: P) -> List[Model]:
+        """All tables, in load order."""
+        return [model for phase in self.phases for model in phase]
+
+    def missing(self: P, csv_dir: str) -> List[Model]:
+        """Find the tables whose CSV file does not exist.
+
+        Args:
+            csv_dir: Directory the CSV files reside in.
+
+        Returns:
+            A list of model classes, in load order.
+        """
+        return [
+            model
+            for model in self.models
+            if not (Path(csv_dir) / f"{_table_name(model)}.csv").is_file()
+        ]
+
+    def unresolved(self: P, missing: Sequence[Model]) -> Dict[Model, List[Model]]:
+        """Find the tables that reference tables missing their data.
+
+        Args:
+            missing: Tables without data, e.g. from `missing`.
+
+        Returns:
+            A dict of model to the missing tables it references.
+        """
+        result = {}
+        for model in self.models:
+            absent = sorted(dependencies(model) & set(missing), key=_table_name)
+            if absent and model not in missing:
+                result[model] = absent
+        return result
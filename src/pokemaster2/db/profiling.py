@@ -0,0 +1,194 @@
+"""Instrumentation for `pokemaster2.db.io.load`.
+
+`LoadProfiler` records wall and CPU time, row and batch counts for each
+(table, phase) pair, plus the peak resident set size of the process.
+The phases of a load are:
+
+* `create`: creating the table, without its indexes;
+* `parse`: reading and converting CSV rows;
+* `insert`: inserting rows;
+* `index`: building the indexes once the rows are in;
+* `search`: refreshing the search index, for searchable tables.
+
+Setting `cprofile=True` also runs `cProfile` around the `parse` and
+`insert` phases only, which is where a slow load spends its time. The
+insert loop runs in `io._insert_batches`, so sampling profilers such as
+`py-spy` can be filtered on that function name.
+"""
+import contextlib
+import cProfile
+import json
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import attr
+
+P = TypeVar("P", bound="PhaseRecord")
+L = TypeVar("L", bound="LoadProfiler")
+
+_PROFILED_PHASES = ("parse", "insert")
+
+
+@attr.s(auto_attribs=True)
+class PhaseRecord:
+    """Measurements of one phase of loading one table."""
+
+    table: str
+    phase: str
+    wall: float = 0.0
+    cpu: float = 0.0
+    rows: int = 0
+    batches: int = 0
+
+    @property
+    def rows_per_second(self: P) -> Optional[float]:
+        """Throughput of the phase, if it handled any rows."""
+        if not self.rows or not self.wall:
+            return None
+        return self.rows / self.wall
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, if available."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@attr.s(auto_attribs=True)
+class LoadProfiler:
+    """Collect timings of a load, per table and phase.
+
+    Usage:
+        >>> profiler = LoadProfiler()
+        >>> with profiler.phase("pokemon", "insert") as record:
+        ...     record.rows += 100
+        ...     record.batches += 1
+        >>> profiler.records[0].rows
+        100
+    """
+
+    cprofile: bool = False
+    records: List[PhaseRecord] = attr.ib(factory=list)
+    peak_rss: Optional[int] = None
+    _index: Dict[Tuple[str, str], PhaseRecord] = attr.ib(factory=dict, repr=False)
+    _profile: Optional[cProfile.Profile] = attr.ib(default=None, repr=False)
+
+    def __attrs_post_init__(self: L) -> None:
+        """Create the `cProfile` profiler if asked."""
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+
+    @contextlib.contextmanager
+    def phase(self: L, table: str, phase: str) -> Iterator[PhaseRecord]:
+        """Time a phase; repeated phases of a table add up.
+
+        Args:
+            table: The table name.
+            phase: The phase name.
+
+        Yields:
+            The `PhaseRecord`, for the caller to count rows and batches.
+        """
+        record = self._index.get((table, phase))
+        if record is None:
+            record = self._index[(table, phase)] = PhaseRecord(table=table, phase=phase)
+            self.records.append(record)
+
+        profile = self._profile if phase in _PROFILED_PHASES else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile is not None:
+                profile.disable()
+            record.wall += time.perf_counter() - wall
+            record.cpu += time.process_time() - cpu
+            self.peak_rss = peak_rss()
+
+    def dump_cprofile(self: L, path: str) -> None:
+        """Write the `cProfile` statistics, readable by `pstats` or `snakeviz`.
+
+        Args:
+            path: The file to write.
+
+        Raises:
+            ValueError: if the profiler was created without `cprofile=True`.
+        """
+        if self._profile is None:
+            raise ValueError("The profiler was created without cprofile=True.")
+        self._profile.dump_stats(path)
+
+    def report(self: L) -> Dict[str, Any]:
+        """Summarize the measurements as JSON-serializable data.
+
+        Returns:
+            A dict with the per-phase records, per-table totals and the
+            peak RSS in bytes.
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            total = totals.setdefault(
+                record.table, {"wall": 0.0, "cpu": 0.0, "rows": 0, "batches": 0}
+            )
+            total["wall"] += record.wall
+            total["cpu"] += record.cpu
+            total["rows"] = max(total["rows"], record.rows)
+            total["batches"] = max(total["batches"], record.batches)
+        for total in totals.values():
+            total["rows_per_second"] = total["rows"] / total["wall"] if total["wall"] else None
+
+        phases = []
+        for record in self.records:
+            phase = attr.asdict(record)
+            phase["rows_per_second"] = record.rows_per_second
+            phases.append(phase)
+        return {"phases": phases, "tables": totals, "peak_rss": self.peak_rss}
+
+    def to_json(self: L, indent: Optional[int] = 2) -> str:
+        """Serialize `report()` to JSON.
+
+        Args:
+            indent: Passed to `json.dumps`.
+
+        Returns:
+            str
+        """
+        return json.dumps(self.report(), indent=indent)
+
+    def format_table(self: L) -> str:
+        """Render the measurements as a plain-text table.
+
+        Returns:
+            str
+        """
+        header = ("table", "phase", "wall (s)", "cpu (s)", "rows", "batches", "rows/s")
+        lines = [header]
+        for record in self.records:
+            rate = record.rows_per_second
+            lines.append(
+                (
+                    record.table,
+                    record.phase,
+                    f"{record.wall:.4f}",
+                    f"{record.cpu:.4f}",
+                    str(record.rows),
+                    str(record.batches),
+                    f"{rate:,.0f}" if rate else "-",
+                )
+            )
+        widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+        text = [
+            "  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip()
+            for line in lines
+        ]
+        if self.peak_rss is not None:
+            text.append(f"peak RSS: {self.peak_rss / 2 ** 20:.1f} MiB")
+        return "\n".join(text)
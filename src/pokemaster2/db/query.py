@@ -0,0 +1,190 @@
+"""Stream rows of Pokédex tables out of a database.
+
+Rows are read from the SQLite cursor in batches and written out one by
+one, so memory use stays flat no matter how large the table is.
+"""
+import csv
+import json
+from typing import IO, Iterator, List, Optional, Sequence, Tuple, Type
+
+import peewee
+
+from pokemaster2.db import tables
+
+FORMATS = ("csv", "jsonl", "tsv")
+
+_OPERATORS = {
+    "!=": lambda field, value: field != value,
+    ">=": lambda field, value: field >= value,
+    "<=": lambda field, value: field <= value,
+    "=": lambda field, value: field == value,
+    ">": lambda field, value: field > value,
+    "<": lambda field, value: field < value,
+}
+
+
+def get_model(table_name: str) -> Type[tables.BaseModel]:
+    """Find the model of a table.
+
+    Args:
+        table_name: A table name, e.g. `pokemon_species`.
+
+    Raises:
+        ValueError: if no model has this table name.
+
+    Returns:
+        The model class.
+    """
+    for model in tables.MODELS:
+        if model._meta.table_name == table_name:
+            return model
+    names = ", ".join(model._meta.table_name for model in tables.MODELS)
+    raise ValueError(f"Unknown table {table_name!r}. Choose from: {names}.")
+
+
+def get_field(model: Type[tables.BaseModel], column: str) -> peewee.Field:
+    """Find a field of a model by its column name.
+
+    Args:
+        model: The model class.
+        column: A column name, e.g. `species_id`.
+
+    Raises:
+        ValueError: if the model has no such column.
+
+    Returns:
+        The field.
+    """
+    for field in model._meta.sorted_fields:
+        if field.column_name == column:
+            return field
+    names = ", ".join(field.column_name for field in model._meta.sorted_fields)
+    raise ValueError(f"Unknown column {column!r}. Choose from: {names}.")
+
+
+def _coerce(field: peewee.Field, text: str) -> object:
+    if text == "null":
+        return None
+    if isinstance(field, peewee.BooleanField):
+        return text.lower() in ("1", "true", "yes")
+    if isinstance(field, (peewee.IntegerField, peewee.ForeignKeyField)):
+        return int(text)
+    return text
+
+
+def parse_filter(model: Type[tables.BaseModel], expression: str) -> peewee.Expression:
+    """Parse a filter such as `species_id>=10` into a `peewee` expression.
+
+    Supported operators are `=`, `!=`, `<`, `<=`, `>` and `>=`. The value
+    `null` matches NULL, with `=` and `!=` only.
+
+    Args:
+        model: The model class to filter.
+        expression: The filter.
+
+    Raises:
+        ValueError: if the filter cannot be parsed, or orders by null.
+
+    Returns:
+        A `peewee` expression.
+    """
+    for operator, build in _OPERATORS.items():
+        column, found, text = expression.partition(operator)
+        if found:
+            field = get_field(model, column.strip())
+            value = _coerce(field, text.strip())
+            if value is None:
+                if operator not in ("=", "!="):
+                    raise ValueError(f"Cannot compare {column.strip()!r} to null with {operator}.")
+                return field.is_null(operator == "=")
+            return build(field, value)
+    raise ValueError(f"Cannot parse filter {expression!r}.")
+
+
+def select(
+    model: Type[tables.BaseModel],
+    columns: Optional[Sequence[str]] = None,
+    filters: Sequence[str] = (),
+    limit: Optional[int] = None,
+) -> Tuple[peewee.Select, List[str]]:
+    """Build a query over a table.
+
+    Args:
+        model: The model class to query.
+        columns: Columns to select; all columns if omitted.
+        filters: Filters understood by `parse_filter`, combined with AND.
+        limit: Maximum number of rows.
+
+    Returns:
+        The query, and the names of the selected columns.
+    """
+    fields = [get_field(model, column) for column in columns] if columns else None
+    fields = fields or model._meta.sorted_fields
+    query = model.select(*fields).order_by(*model._meta.get_primary_keys())
+    for expression in filters:
+        query = query.where(parse_filter(model, expression))
+    if limit is not None:
+        query = query.limit(limit)
+    return query, [field.column_name for field in fields]
+
+
+def stream_rows(
+    database: peewee.Database, query: peewee.Select, batch_size: int = 1000
+) -> Iterator[tuple]:
+    """Run a query and yield its rows, fetching `batch_size` rows at a time.
+
+    Args:
+        database: The database to run the query against.
+        query: The query.
+        batch_size: Number of rows fetched from the cursor at once.
+
+    Yields:
+        Raw rows as tuples.
+    """
+    cursor = database.execute(query)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def write_rows(
+    rows: Iterator[tuple], columns: Sequence[str], fmt: str, stream: IO[str], header: bool = True
+) -> int:
+    """Write rows to a text stream.
+
+    Args:
+        rows: The rows to write.
+        columns: Column names, in the order of the row values.
+        fmt: One of `FORMATS`.
+        stream: Where to write.
+        header: Write a header line for `csv` and `tsv`.
+
+    Raises:
+        ValueError: if the format is unknown.
+
+    Returns:
+        Number of rows written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}. Choose from: {', '.join(FORMATS)}.")
+
+    count = 0
+    if fmt == "jsonl":
+        for row in rows:
+            stream.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            stream.write("\n")
+            count += 1
+        return count
+
+    writer = csv.writer(stream, delimiter="\t" if fmt == "tsv" else ",", lineterminator="\n")
+    if header:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
@@ -0,0 +1,159 @@
+"""Type-ahead search over Pokémon and species identifiers.
+
+The identifiers of `MODELS` are indexed in an SQLite FTS5 virtual table
+with the `trigram` tokenizer, so any fragment of three characters or
+more is found through the index instead of a `LIKE '%x%'` scan. Shorter
+fragments are matched as prefixes, through the indexes of the
+`identifier` columns.
+
+`io.load` refreshes the entries of every searchable table it loads, so
+reloading one table does not rebuild the whole index.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import peewee
+
+from pokemaster2.db import tables
+
+INDEX_TABLE = "search_index"
+MODELS = (tables.Pokemon, tables.PokemonSpecies)
+_TABLE_NAMES = [model._meta.table_name for model in MODELS]
+
+# The trigram tokenizer only matches fragments of 3 characters or more.
+_MIN_TRIGRAM_LENGTH = 3
+
+SearchResult = Union[tables.Pokemon, tables.PokemonSpecies]
+
+
+def create_index(database: peewee.Database) -> None:
+    """Create the search index if it does not exist.
+
+    Args:
+        database: The database to index.
+    """
+    database.execute_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} "
+        "USING fts5(identifier, table_name UNINDEXED, row_id UNINDEXED, tokenize='trigram')"
+    )
+
+
+def refresh(database: peewee.Database, models: Sequence[Type[tables.BaseModel]] = MODELS) -> None:
+    """Replace the index entries of some tables with their current rows.
+
+    Args:
+        database: The database to index.
+        models: The tables to refresh; tables that are not searchable
+            are ignored.
+    """
+    create_index(database)
+    for model in models:
+        if model not in MODELS:
+            continue
+        table_name = model._meta.table_name
+        database.execute_sql(f"DELETE FROM {INDEX_TABLE} WHERE table_name = ?", (table_name,))
+        database.execute_sql(
+            f"INSERT INTO {INDEX_TABLE} (identifier, table_name, row_id) "
+            f'SELECT identifier, ?, id FROM "{table_name}"',
+            (table_name,),
+        )
+
+
+def normalize(text: str) -> str:
+    """Turn user input into the shape of an identifier.
+
+    Args:
+        text: e.g. `"Mr. Mime"`.
+
+    Returns:
+        e.g. `"mr-mime"`.
+    """
+    return "-".join(text.lower().replace(".", " ").split())
+
+
+def _escape_glob(text: str) -> str:
+    return "".join(f"[{char}]" if char in "*?[" else char for char in text)
+
+
+def _fetch(
+    database: peewee.Database, model: Type[tables.BaseModel], ids: Sequence[int]
+) -> Dict[int, SearchResult]:
+    """Fetch rows by id as model instances, without building a `peewee` query."""
+    fields = model._meta.sorted_fields
+    columns = ", ".join(f'"{field.column_name}"' for field in fields)
+    placeholders = ", ".join("?" * len(ids))
+    cursor = database.execute_sql(
+        f'SELECT {columns} FROM "{model._meta.table_name}" WHERE id IN ({placeholders})', ids
+    )
+    rows = {}
+    for values in cursor:
+        data = {field.name: field.python_value(value) for field, value in zip(fields, values)}
+        row = model(__no_default__=1, **data)
+        row._dirty.clear()
+        rows[row.get_id()] = row
+    return rows
+
+
+def _query(database: peewee.Database, fragment: str, limit: int) -> List[Tuple[str, int]]:
+    """Find the `(table name, id)` of the best matches."""
+    prefix = f"{_escape_glob(fragment)}*"
+    if len(fragment) < _MIN_TRIGRAM_LENGTH:
+        # Too short for trigrams: a prefix search on the identifier indexes.
+        selects = " UNION ALL ".join(
+            f'SELECT ? AS table_name, id AS row_id, identifier FROM "{name}" '
+            "WHERE identifier GLOB ?"
+            for name in _TABLE_NAMES
+        )
+        params = [param for name in _TABLE_NAMES for param in (name, prefix)]
+        return database.execute_sql(
+            f"SELECT table_name, row_id FROM ({selects}) "
+            "ORDER BY identifier = ? DESC, length(identifier), identifier, table_name LIMIT ?",
+            (*params, fragment, limit),
+        ).fetchall()
+
+    phrase = '"{}"'.format(fragment.replace('"', '""'))
+    return database.execute_sql(
+        f"SELECT table_name, row_id FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH ? "
+        "ORDER BY identifier = ? DESC, identifier GLOB ? DESC, rank, "
+        "length(identifier), identifier, table_name LIMIT ?",
+        (phrase, fragment, prefix, limit),
+    ).fetchall()
+
+
+def search(
+    text: str, limit: int = 10, database: Optional[peewee.Database] = None
+) -> List[SearchResult]:
+    """Find Pokémon and species whose identifier contains a fragment.
+
+    Results are ranked: exact matches first, then prefix matches, then
+    by FTS5 rank and identifier length, with Pokémon before species on
+    ties. The index is built on first use if the database has none yet.
+
+    Args:
+        text: A prefix or fragment of an identifier.
+        limit: Maximum number of results.
+        database: The database to search. If omitted, the database the
+            models are bound to.
+
+    Returns:
+        A list of `Pokemon` and `PokemonSpecies` instances, best first.
+    """
+    database = database or tables.Pokemon._meta.database
+    fragment = normalize(text)
+    if not fragment:
+        return []
+    try:
+        hits = _query(database, fragment, limit)
+    except peewee.OperationalError:
+        refresh(database)
+        hits = _query(database, fragment, limit)
+
+    ids: Dict[str, List[int]] = {}
+    for table_name, row_id in hits:
+        ids.setdefault(table_name, []).append(row_id)
+    rows = {}
+    for model in MODELS:
+        table_name = model._meta.table_name
+        if table_name in ids:
+            for row_id, row in _fetch(database, model, ids[table_name]).items():
+                rows[table_name, row_id] = row
+    return [rows[hit] for hit in hits if hit in rows]
@@ -0,0 +1,296 @@
+"""Share Pokédex and population arrays with worker processes.
+
+Worker processes that read the Pokédex from SQLite themselves, or get
+pickled copies of large arrays with every job, each hold a copy of the
+same data. `SharedBlock.publish` copies arrays once into one block of
+`multiprocessing.shared_memory`, and gives a small, picklable
+`SharedHandle` to send to the workers instead. `attach` maps the block
+and returns read-only NumPy views into it: nothing is copied or parsed,
+and every process reads the same physical pages.
+
+The publishing process owns the block: closing the `SharedBlock`, or
+leaving its `with` statement, unlinks the block, which then disappears
+once the last process mapping it unmaps it or exits. Processes map a
+block once, and keep it mapped until they `detach` from it, or exit.
+Before Python 3.13, only attach from processes started by
+`multiprocessing`, e.g. the workers of a `ProcessPoolExecutor`: they
+share the resource tracker of the publisher, which would otherwise
+unlink the block when they exit.
+"""
+import sys
+import weakref
+from multiprocessing import shared_memory
+from typing import Dict, Mapping, Optional, Tuple, Type, TypeVar, cast
+
+import attr
+import numpy as np
+import peewee
+from numpy.typing import ArrayLike
+
+from pokemaster2.db.arrays import (
+    Learnset,
+    SpeciesArrays,
+    TypeChart,
+    get_learnset,
+    get_species_arrays,
+    get_type_chart,
+)
+
+B = TypeVar("B", bound="SharedBlock")
+
+# Offsets of the arrays in a block are multiples of a cache line.
+_ALIGNMENT = 64
+# Workers must not unlink blocks they merely attached to.
+_ATTACH_OPTIONS = {"track": False} if sys.version_info >= (3, 13) else {}
+
+Arrays = Dict[str, np.ndarray]
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class _Field:
+    """Where an array lives in a block."""
+
+    key: str
+    dtype: np.dtype
+    shape: Tuple[int, ...]
+    offset: int
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SharedHandle:
+    """What workers need to attach to a block; cheap to pickle.
+
+    Attributes:
+        name: The name of the shared memory block.
+        fields: The key, dtype, shape and offset of every array.
+    """
+
+    name: str
+    fields: Tuple[_Field, ...]
+
+
+def _release(memory: shared_memory.SharedMemory) -> None:
+    memory.close()
+    try:
+        memory.unlink()
+    except FileNotFoundError:
+        pass
+
+
+@attr.s(auto_attribs=True)
+class SharedBlock:
+    """Arrays published in a block of shared memory by this process.
+
+    Usage:
+        >>> with SharedBlock.publish({"ids": np.arange(3)}) as block:
+        ...     attach(block.handle)["ids"].tolist()
+        ...     detach(block.handle)
+        [0, 1, 2]
+
+    Attributes:
+        handle: The handle to send to the workers.
+    """
+
+    handle: SharedHandle
+    _memory: shared_memory.SharedMemory = attr.ib(repr=False)
+    _finalizer: weakref.finalize = attr.ib(init=False, repr=False, eq=False)
+
+    def __attrs_post_init__(self: B) -> None:
+        # Unlink the block even if `close` is never called.
+        self._finalizer = weakref.finalize(self, _release, self._memory)
+
+    @classmethod
+    def publish(cls: Type[B], arrays: Mapping[str, ArrayLike]) -> B:
+        """Copy arrays into a new block of shared memory.
+
+        Args:
+            arrays: The arrays, by key.
+
+        Raises:
+            ValueError: if an array holds Python objects, which cannot
+                be shared.
+
+        Returns:
+            A `SharedBlock` instance.
+        """
+        values = {key: np.asarray(array) for key, array in arrays.items()}
+        fields = []
+        size = 0
+        for key, array in values.items():
+            if array.dtype.hasobject:
+                raise ValueError(f"Array {key!r} holds Python objects and cannot be shared.")
+            offset = -(-size // _ALIGNMENT) * _ALIGNMENT
+            fields.append(_Field(key, array.dtype, array.shape, offset))
+            size = offset + array.nbytes
+        # Blocks cannot be empty.
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            for field in fields:
+                target = np.ndarray(
+                    field.shape, field.dtype, buffer=memory.buf, offset=field.offset
+                )
+                target[...] = values[field.key]
+                del target
+        except BaseException:
+            _release(memory)
+            raise
+        return cls(handle=SharedHandle(name=memory.name, fields=tuple(fields)), memory=memory)
+
+    @property
+    def closed(self: B) -> bool:
+        """Whether the block has been unlinked."""
+        return not self._finalizer.alive
+
+    def close(self: B) -> None:
+        """Unmap and unlink the block. Calling it again does nothing.
+
+        Workers that attached to the block can still read it; new ones
+        cannot attach anymore.
+        """
+        self._finalizer()
+
+    def __enter__(self: B) -> B:
+        return self
+
+    def __exit__(self: B, *exc_info: object) -> None:
+        self.close()
+
+
+def attach(handle: SharedHandle) -> Arrays:
+    """Map a block, once per process until `detach` is called.
+
+    Args:
+        handle: The `SharedBlock.handle` of the block.
+
+    Raises:
+        FileNotFoundError: if the block has been unlinked, and is not
+            mapped by this process.
+
+    Returns:
+        Read-only views of the arrays of the block, by key.
+    """
+    if handle not in _attached:
+        _attached[handle] = _map(handle)
+    return dict(_attached[handle][1])
+
+
+def detach(handle: SharedHandle) -> None:
+    """Unmap a block mapped by `attach`. Calling it again does nothing.
+
+    Delete the views returned by `attach` first: the block cannot be
+    unmapped while they are in use.
+
+    Args:
+        handle: The `SharedBlock.handle` of the block.
+
+    Raises:
+        BufferError: if views of the block are still in use. The block
+            stays mapped.
+    """
+    attached = _attached.pop(handle, None)
+    if attached is None:
+        return
+    memory, arrays = attached
+    views = [weakref.ref(array) for array in arrays.values()]
+    del attached, arrays
+    if any(view() is not None for view in views):
+        # Unmapping the block would leave these views dangling.
+        _attached[handle] = (memory, _views(handle, memory))
+        raise BufferError("Views of the shared block are still in use.")
+    memory.close()
+
+
+# The blocks mapped by this process, and views of their arrays.
+_attached: Dict[SharedHandle, Tuple[shared_memory.SharedMemory, Arrays]] = {}
+
+
+def _map(handle: SharedHandle) -> Tuple[shared_memory.SharedMemory, Arrays]:
+    memory = shared_memory.SharedMemory(name=handle.name, **_ATTACH_OPTIONS)
+    return memory, _views(handle, memory)
+
+
+def _views(handle: SharedHandle, memory: shared_memory.SharedMemory) -> Arrays:
+    # Only closed blocks have no buffer.
+    buffer = cast(memoryview, memory.buf).toreadonly()
+    arrays = {}
+    for field in handle.fields:
+        array = np.ndarray(field.shape, field.dtype, buffer=buffer, offset=field.offset)
+        array.flags.writeable = False
+        arrays[field.key] = array
+    return arrays
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SharedPokedex:
+    """The Pokédex arrays of a block published by `publish_pokedex`.
+
+    Attributes:
+        species: See `arrays.get_species_arrays`.
+        type_chart: See `arrays.get_type_chart`.
+        learnset: See `arrays.get_learnset`.
+        population: The population arrays, by name.
+    """
+
+    species: SpeciesArrays
+    type_chart: TypeChart
+    learnset: Learnset
+    population: Arrays
+
+
+def publish_pokedex(
+    database: Optional[peewee.Database] = None,
+    population: Optional[Mapping[str, ArrayLike]] = None,
+) -> SharedBlock:
+    """Read the Pokédex arrays once, and publish them with population arrays.
+
+    Args:
+        database: The database to read. Defaults to the current database
+            of the models.
+        population: Arrays describing many Pokémon, e.g. the stats
+            computed by `ivs.calc_stats`, by name.
+
+    Returns:
+        A `SharedBlock` instance; see `attach_pokedex`.
+    """
+    arrays = {}
+    for prefix, instance in (
+        ("species", get_species_arrays(database)),
+        ("type_chart", get_type_chart(database)),
+        ("learnset", get_learnset(database)),
+    ):
+        for field in attr.fields(type(instance)):
+            arrays[f"{prefix}.{field.name}"] = getattr(instance, field.name)
+    # Identifiers are shared as a fixed-width string array.
+    arrays["type_chart.identifiers"] = np.array(arrays["type_chart.identifiers"], dtype=str)
+    for name, array in (population or {}).items():
+        arrays[f"population.{name}"] = array
+    return SharedBlock.publish(arrays)
+
+
+def attach_pokedex(handle: SharedHandle) -> SharedPokedex:
+    """Attach to a block published by `publish_pokedex`.
+
+    Args:
+        handle: The `SharedBlock.handle` of the block.
+
+    Returns:
+        A `SharedPokedex` of read-only views; delete it before calling
+        `detach`.
+    """
+    arrays = attach(handle)
+
+    def fields(prefix: str) -> Arrays:
+        return {
+            key[len(prefix) + 1 :]: array
+            for key, array in arrays.items()
+            if key.startswith(prefix + ".")
+        }
+
+    chart = fields("type_chart")
+    identifiers = tuple(chart.pop("identifiers").tolist())
+    return SharedPokedex(
+        species=SpeciesArrays(**fields("species")),
+        type_chart=TypeChart(identifiers=identifiers, **chart),
+        learnset=Learnset(**fields("learnset")),
+        population=fields("population"),
+    )
@@ -0,0 +1,159 @@
+"""Read-only snapshots of exported Pokédex tables.
+
+`PokedexSnapshot.load` memory-maps the files written by
+`pokemaster2.db.export` instead of parsing them: `npz` members are
+mapped in place, and Arrow IPC files are opened through an Arrow memory
+map. Nothing is read from disk until a column is actually used.
+"""
+import struct
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, Type, TypeVar
+
+import attr
+import numpy as np
+
+from pokemaster2.db.export import MASK_SUFFIX
+
+S = TypeVar("S", bound="PokedexSnapshot")
+
+Columns = Dict[str, np.ndarray]
+
+# Size of a zip local file header, before the file name and extra field.
+_ZIP_HEADER_SIZE = 30
+
+
+def _memmap_member(path: Path, info: zipfile.ZipInfo) -> np.ndarray:
+    """Memory-map a `.npy` member stored uncompressed in a zip archive."""
+    with path.open("rb") as file:
+        file.seek(info.header_offset)
+        header = file.read(_ZIP_HEADER_SIZE)
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        file.seek(info.header_offset + _ZIP_HEADER_SIZE + name_length + extra_length)
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def _with_masks(arrays: Columns) -> Columns:
+    """Combine `<column>.mask` arrays with their columns."""
+    columns = {}
+    for name, array in arrays.items():
+        if name.endswith(MASK_SUFFIX):
+            continue
+        mask = arrays.get(f"{name}{MASK_SUFFIX}")
+        columns[name] = array if mask is None else np.ma.MaskedArray(array, mask=mask)
+    return columns
+
+
+def load_npz(path: Path) -> Columns:
+    """Memory-map every column of an `npz` file.
+
+    Compressed members cannot be mapped and are read into memory.
+
+    Args:
+        path: The `npz` file.
+
+    Returns:
+        A dict of column name to array. Nullable columns are masked arrays.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            name = info.filename[: -len(".npy")]
+            if info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = _memmap_member(path, info)
+            else:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+    return _with_masks(arrays)
+
+
+def load_arrow(path: Path) -> Columns:
+    """Memory-map every column of an Arrow IPC file.
+
+    Numeric and boolean columns without NULLs are zero-copy views;
+    string and NULL-bearing columns are converted.
+
+    Args:
+        path: The Arrow IPC file.
+
+    Returns:
+        A dict of column name to array. Nullable columns are masked arrays.
+    """
+    import pyarrow
+
+    table = pyarrow.ipc.open_file(pyarrow.memory_map(str(path), "r")).read_all()
+    columns: Columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        column = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+        if column.null_count:
+            fill: object
+            if pyarrow.types.is_string(column.type):
+                fill = ""
+            elif pyarrow.types.is_boolean(column.type):
+                fill = False
+            else:
+                fill = 0
+            mask = column.is_null().to_numpy(zero_copy_only=False)
+            values = column.fill_null(fill).to_numpy(zero_copy_only=False)
+            columns[name] = np.ma.MaskedArray(values, mask=mask)
+        else:
+            columns[name] = column.to_numpy(zero_copy_only=False)
+    return columns
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class PokedexSnapshot:
+    """A read-only, column-oriented view of exported Pokédex tables.
+
+    Usage:
+        >>> snapshot = PokedexSnapshot.load("export/")  # doctest: +SKIP
+        >>> snapshot["pokemon"]["identifier"][0]  # doctest: +SKIP
+        'bulbasaur'
+    """
+
+    tables: Dict[str, Columns]
+
+    def __getitem__(self: S, table_name: str) -> Columns:
+        """Get the columns of a table."""
+        return self.tables[table_name]
+
+    def __contains__(self: S, table_name: object) -> bool:
+        """Check whether the snapshot holds a table."""
+        return table_name in self.tables
+
+    def __iter__(self: S) -> Iterator[str]:
+        """Iterate over the table names."""
+        return iter(self.tables)
+
+    @classmethod
+    def load(cls: Type[S], directory: str) -> S:
+        """Map every `.npz` and `.arrow` file in a directory.
+
+        Args:
+            directory: Where `pokemaster2 export` wrote its files.
+
+        Returns:
+            A `PokedexSnapshot` instance.
+        """
+        tables = {}
+        for path in sorted(Path(directory).iterdir()):
+            if path.suffix == ".npz":
+                tables[path.stem] = load_npz(path)
+            elif path.suffix == ".arrow":
+                tables[path.stem] = load_arrow(path)
+        return cls(tables=tables)
@@ -0,0 +1,250 @@
+"""Generate large synthetic CSV datasets for load and query stress tests.
+
+`generate` writes one CSV per table, with the same file names and
+columns that `pokemaster2.db.io.load` reads. Values are derived from the
+field definitions of the models:
+
+* primary keys count from 1; composite primary keys enumerate the
+  combinations of their columns, so they stay unique;
+* foreign keys point at an existing row of the referenced table, so the
+  data stays valid at any scale; self-references only point at earlier
+  rows;
+* integers, booleans and NULLs of nullable columns are drawn from the
+  Gen. 3 PRNG;
+* strings are `<table name>-<id>`, which keeps identifiers unique.
+
+Every row of a table draws the same number of random numbers, so row
+`i` only depends on the seed and `i`: the output is identical for any
+`chunk_size`, and chunks are generated with jump-ahead instead of
+stepping the PRNG row by row. Only one chunk is held in memory at a
+time, so even 10^8 rows per table stay memory-flat.
+"""
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+import peewee
+
+from pokemaster2.db import tables
+from pokemaster2.prng import lcg_jump, lcg_outputs, lcg_seeds
+
+Model = Type[tables.BaseModel]
+
+SCALES = tuple(10**exponent for exponent in range(4, 9))
+
+# Inclusive value ranges of integer columns with a known domain.
+_DOMAINS: Dict[str, Tuple[int, int]] = {
+    "gender_rate": (-1, 8),
+    "capture_rate": (0, 255),
+    "base_happiness": (0, 255),
+    "hatch_counter": (0, 120),
+    "base_stat": (1, 255),
+    "effort": (0, 3),
+    "slot": (1, 2),
+    "level": (0, 100),
+}
+
+# One NULL in `_NULL_RATIO` values of nullable columns, on average.
+_NULL_RATIO = 8
+
+# Spread the seeds of different tables apart.
+_TABLE_SEED_STEP = 0x9E3779B9
+
+
+def references(model: Model) -> Dict[str, Model]:
+    """Find the columns of a model that reference another table.
+
+    Args:
+        model: The model class.
+
+    Returns:
+        A dict of column name to referenced model.
+    """
+    return {
+        field.column_name: field.rel_model
+        for field in model._meta.sorted_fields
+        if isinstance(field, peewee.ForeignKeyField)
+    }
+
+
+def _key_fields(model: Model) -> List[peewee.Field]:
+    """The fields of the primary key of a model."""
+    return list(model._meta.get_primary_keys())
+
+
+def _key_ranges(model: Model, row_counts: Mapping[Model, int]) -> List[Tuple[int, int]]:
+    """The lowest value and number of values of each column of a composite key."""
+    ranges = []
+    for field in _key_fields(model):
+        if isinstance(field, peewee.ForeignKeyField):
+            ranges.append((1, row_counts.get(field.rel_model, 0)))
+        else:
+            low, high = _DOMAINS.get(field.column_name, (0, 0xFFFF))
+            ranges.append((low, high - low + 1))
+    return ranges
+
+
+def _key_columns(
+    model: Model, ids: np.ndarray, row_counts: Mapping[Model, int]
+) -> Dict[str, np.ndarray]:
+    """Values of the primary key columns for rows `ids`."""
+    fields = _key_fields(model)
+    if len(fields) == 1:
+        return {fields[0].column_name: ids}
+    columns = {}
+    remainder = ids - 1
+    # The last column varies fastest.
+    for field, (low, size) in reversed(list(zip(fields, _key_ranges(model, row_counts)))):
+        remainder, digit = np.divmod(remainder, size)
+        columns[field.column_name] = low + digit
+    return columns
+
+
+def _capacity(model: Model, row_counts: Mapping[Model, int]) -> Optional[int]:
+    """Number of distinct composite keys of a model, or None if not composite."""
+    if len(_key_fields(model)) == 1:
+        return None
+    return int(np.prod([size for _, size in _key_ranges(model, row_counts)], dtype=object))
+
+
+def _random_columns(model: Model) -> List[peewee.Field]:
+    """Fields that draw a random number per row, in a fixed order."""
+    keys = set(_key_fields(model))
+    return [field for field in model._meta.sorted_fields if field not in keys]
+
+
+def _format_column(
+    table_name: str,
+    field: peewee.Field,
+    ids: np.ndarray,
+    draws: np.ndarray,
+    row_counts: Mapping[Model, int],
+    referenced: Optional[Model],
+) -> List[str]:
+    """Render the values of one column of a chunk as CSV text."""
+    draws = draws.astype(np.int64)
+    null = np.zeros(len(ids), dtype=bool)
+    if referenced is not None:
+        if referenced._meta.table_name == table_name:
+            # Only point at earlier rows, so rows can be inserted in order.
+            earlier = np.maximum(ids - 1, 1)
+            values = 1 + draws % earlier
+            null = ids == 1
+        else:
+            values = 1 + draws % max(row_counts.get(referenced, 0), 1)
+    elif isinstance(field, peewee.BooleanField):
+        values = draws & 1
+    elif isinstance(field, peewee.IntegerField):
+        low, high = _DOMAINS.get(field.column_name, (0, 0xFFFF))
+        values = low + draws % (high - low + 1)
+    else:
+        values = None
+
+    if values is None:
+        text = np.char.add(f"{table_name}-", ids.astype(str))
+    else:
+        text = values.astype(str)
+    if field.null:
+        null |= draws % _NULL_RATIO == 0
+        text = np.where(null, "", text)
+    return text.tolist()
+
+
+def _write_table(
+    path: Path,
+    model: Model,
+    rows: int,
+    seed: int,
+    row_counts: Mapping[Model, int],
+    chunk_size: int,
+) -> None:
+    table_name = model._meta.table_name
+    table_references = references(model)
+    fields = _random_columns(model)
+    calls_per_row = max(len(fields), 1)
+
+    with path.open("w", encoding="utf-8", newline="") as csv_file:
+        csv_file.write(",".join(field.column_name for field in model._meta.sorted_fields))
+        csv_file.write("\n")
+        for start in range(0, rows, chunk_size):
+            n = min(chunk_size, rows - start)
+            a, c = lcg_jump(start * calls_per_row)
+            draws = lcg_outputs(
+                lcg_seeds((a * seed + c) & 0xFFFFFFFF, n, calls_per_row), len(fields)
+            )
+            ids = np.arange(start + 1, start + n + 1, dtype=np.int64)
+
+            keys = _key_columns(model, ids, row_counts)
+            columns = []
+            random_index = 0
+            for field in model._meta.sorted_fields:
+                if field.column_name in keys:
+                    columns.append(keys[field.column_name].astype(str).tolist())
+                    continue
+                columns.append(
+                    _format_column(
+                        table_name,
+                        field,
+                        ids,
+                        draws[:, random_index],
+                        row_counts,
+                        table_references.get(field.column_name),
+                    )
+                )
+                random_index += 1
+            csv_file.write("\n".join(map(",".join, zip(*columns))))
+            csv_file.write("\n")
+
+
+def generate(
+    out_dir: str,
+    rows: Union[int, Mapping[str, int]],
+    seed: int = 0,
+    models: Optional[Sequence[Model]] = None,
+    chunk_size: int = 65536,
+) -> List[Path]:
+    """Write a synthetic dataset, one CSV file per table.
+
+    Args:
+        out_dir: Directory the CSV files are written to; created if
+            missing. It can be passed to `io.load` as `csv_dir`.
+        rows: Number of rows of every table, or a dict of table name to
+            number of rows. Tables missing from the dict get no rows.
+        seed: Seed of the PRNG. The same seed always produces the same
+            files.
+        models: Tables to write. If omitted, all tables are written.
+            Referenced tables are assumed to have their number of rows
+            from `rows`, even if they are not written.
+        chunk_size: Number of rows generated and written at a time.
+
+    Raises:
+        ValueError: if a table has more rows than distinct values of its
+            composite primary key.
+
+    Returns:
+        The paths of the written files.
+    """
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    def count(model: Model) -> int:
+        if isinstance(rows, int):
+            return rows
+        return rows.get(model._meta.table_name, 0)
+
+    row_counts = {model: count(model) for model in tables.MODELS}
+    for model in models or tables.MODELS:
+        capacity = _capacity(model, row_counts)
+        if capacity is not None and count(model) > capacity:
+            raise ValueError(
+                f"{model._meta.table_name} can only have {capacity} distinct keys, "
+                f"not {count(model)}."
+            )
+
+    paths = []
+    for model in models or tables.MODELS:
+        path = out_path / f"{model._meta.table_name}.csv"
+        table_seed = (seed + tables.MODELS.index(model) * _TABLE_SEED_STEP) & 0xFFFFFFFF
+        _write_table(path, model, count(model), table_seed, row_counts, chunk_size)
+        paths.append(path)
+    return paths
@@ -1,10 +1,36 @@
-"""The pokedex database models."""
+"""The pokedex database models.
+
+The models follow the veekun pokedex schema. Table names match the CSV
+file names of the veekun data, see `BaseModel`.
+"""
 from typing import List
 
 import peewee
 
 database = peewee.SqliteDatabase(None)
 
+# Table names that are not plural in the veekun schema.
+_UNCOUNTABLE = ("pokemon", "species")
+
+
+def table_name(model: peewee.Model) -> str:
+    """Derive the veekun table name of a model from its class name.
+
+    Examples:
+        `PokemonSpecies` -> `pokemon_species`, `Region` -> `regions`,
+        `MoveDamageClass` -> `move_damage_classes`.
+
+    Args:
+        model: The model class.
+
+    Returns:
+        str
+    """
+    name = peewee.make_snake_case(model.__name__)
+    if name.endswith(_UNCOUNTABLE):
+        return name
+    return f"{name}es" if name.endswith("s") else f"{name}s"
+
 
 class BaseModel(peewee.Model):
     """BaseModel for all pokdex Models."""
@@ -13,47 +39,200 @@ class BaseModel(peewee.Model):
         """All BaseModel uses database."""
 
         database = database
+        table_function = table_name
 
 
-class Pokemon(BaseModel):
-    """A Pokémon.  The core to this whole mess.
+class Region(BaseModel):
+    """A major area of the Pokémon world: Kanto, Johto, etc."""
 
-    This table defines "Pokémon" the same way the games do: a form with
-    different types, moves, or other game-changing properties counts as a
-    different Pokémon.  For example, this table contains four rows for Deoxys,
-    but only one for Unown.
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
 
-    Non-default forms have IDs above 10000.
-    IDs below 10000 match the species_id column, for convenience.
+
+class Generation(BaseModel):
+    """A Generation of the Pokémon franchise."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    main_region_id = peewee.ForeignKeyField(
+        Region,
+        backref="generations",
+        help_text="ID of the region this generation's main games take place in",
+    )
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+
+
+class VersionGroup(BaseModel):
+    """A group of versions.
+
+    It contains either two paired versions (such as Red and Blue) or a
+    single game (such as Yellow).
     """
 
     id = peewee.IntegerField(primary_key=True)  # noqa: A003
-    identifier = peewee.CharField(
-        max_length=79,
-        help_text="An identifier, including form iff this row corresponds to a single, named form",
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+    generation_id = peewee.ForeignKeyField(
+        Generation,
+        backref="version_groups",
+        help_text="ID of the generation the games of this group belong to",
     )
-    species_id = peewee.IntegerField(
-        help_text="ID of the species this Pokémon belongs to",
+    order = peewee.IntegerField(
+        null=True,
+        help_text=(
+            "Order for sorting. Almost by date of release, "
+            "except similar versions are grouped together."
+        ),
     )
-    height = peewee.IntegerField(
-        help_text="The height of the Pokémon, in tenths of a meter (decimeters)",
+
+
+class Version(BaseModel):
+    """An individual main-series Pokémon game."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    version_group_id = peewee.ForeignKeyField(
+        VersionGroup,
+        backref="versions",
+        help_text="The ID of the version group this game belongs to.",
     )
-    weight = peewee.IntegerField(
-        help_text="The weight of the Pokémon, in tenths of a kilogram (hectograms)",
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+
+
+class GrowthRate(BaseModel):
+    """Growth rate of a Pokémon, i.e. the EXP → level function."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+    formula = peewee.TextField(help_text="The formula")
+
+
+class EvolutionChain(BaseModel):
+    """A family of Pokémon that are linked by evolution."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    baby_trigger_item_id = peewee.IntegerField(
+        null=True,
+        help_text="Item that a parent must hold to produce a baby",
     )
-    base_experience = peewee.IntegerField(
-        help_text="The base EXP gained when defeating this Pokémon",
+
+
+class PokemonColor(BaseModel):
+    """The "Pokédex color" of a Pokémon species. Usually based on the Pokémon's color."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+
+
+class PokemonShape(BaseModel):
+    """The shape of a Pokémon's body. Appears in the Pokédex starting with Generation IV."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+
+
+class PokemonHabitat(BaseModel):
+    """The habitat of a Pokémon, as given in the FireRed/LeafGreen version Pokédex."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+
+
+class MoveDamageClass(BaseModel):
+    """Any of the damage classes moves can have, i.e. physical, special, or non-damaging."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+
+
+class Stat(BaseModel):
+    """A Stat, such as Attack or Speed."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    damage_class_id = peewee.ForeignKeyField(
+        MoveDamageClass,
+        backref="stats",
+        null=True,
+        help_text="For offensive and defensive stats, the damage this stat relates to.",
     )
-    order = peewee.IntegerField(
-        index=True,
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+    is_battle_only = peewee.BooleanField(
+        help_text="Whether this stat only exists within a battle",
+    )
+    game_index = peewee.IntegerField(
+        null=True,
+        help_text="The stat order the games use internally for the persistent stats.",
+    )
+
+
+class Type(BaseModel):
+    """Any of the elemental types Pokémon and moves can have."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+    generation_id = peewee.ForeignKeyField(
+        Generation,
+        backref="types",
+        help_text="The ID of the generation this type first appeared in.",
+    )
+    damage_class_id = peewee.ForeignKeyField(
+        MoveDamageClass,
+        backref="types",
+        null=True,
         help_text=(
-            "Order for sorting. Almost national order, " "except families are grouped together."
+            "The ID of the damage class this type's moves had before Generation IV, "
+            "null if not applicable (e.g. ???)."
         ),
     )
-    is_default = peewee.BooleanField(
-        index=True,
-        help_text="Set for exactly one pokemon used as the default for each species.",
+
+
+class Move(BaseModel):
+    """A technique or attack a Pokémon can learn to use."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
+    generation_id = peewee.ForeignKeyField(
+        Generation,
+        backref="moves",
+        help_text="ID of the generation this move first appeared in",
+    )
+    type_id = peewee.ForeignKeyField(
+        Type,
+        backref="moves",
+        help_text="ID of the move's elemental type",
+    )
+    power = peewee.IntegerField(
+        null=True, help_text="Base power of the move, null if it does not have a set base power."
+    )
+    pp = peewee.IntegerField(
+        null=True, help_text="Base PP (Power Points) of the move, null if not applicable."
+    )
+    accuracy = peewee.IntegerField(
+        null=True, help_text="Accuracy of the move; NULL means it never misses"
+    )
+    priority = peewee.IntegerField(help_text="The move's priority bracket")
+    target_id = peewee.IntegerField(help_text="ID of the target (range) of the move")
+    damage_class_id = peewee.ForeignKeyField(
+        MoveDamageClass,
+        backref="moves",
+        help_text="ID of the damage class (physical/special) of the move",
     )
+    effect_id = peewee.IntegerField(help_text="ID of the move's effect")
+    effect_chance = peewee.IntegerField(
+        null=True,
+        help_text="The chance of the move's secondary effect, in percent; null if none.",
+    )
+    contest_type_id = peewee.IntegerField(
+        null=True, help_text="ID of the move's Contest type (e.g. cool or smart)"
+    )
+    contest_effect_id = peewee.IntegerField(null=True, help_text="ID of the move's Contest effect")
+    super_contest_effect_id = peewee.IntegerField(
+        null=True, help_text="ID of the move's Super Contest effect"
+    )
+
+
+class PokemonMoveMethod(BaseModel):
+    """A method a move can be learned by, such as "Level up" or "Tutor"."""
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(max_length=79, help_text="An identifier")
 
 
 class PokemonSpecies(BaseModel):
@@ -65,40 +244,41 @@ class PokemonSpecies(BaseModel):
     id = peewee.IntegerField(primary_key=True)  # noqa: A003
     identifier = peewee.CharField(
         max_length=79,
+        index=True,
         help_text="An identifier",
     )
-    # generation_id = peewee.ForeignKeyField(
-    #     "Generation",
-    #     backref="pokemon_species",
-    #     help_text="ID of the generation this species first appeared in",
-    # )
+    generation_id = peewee.ForeignKeyField(
+        Generation,
+        backref="pokemon_species",
+        help_text="ID of the generation this species first appeared in",
+    )
     evolves_from_species_id = peewee.ForeignKeyField(
         "self",
         backref="evolves_to",
         null=True,
         help_text="The species from which this one evolves",
     )
-    # evolution_chain_id = peewee.ForeignKeyField(
-    #     "EvolutionChain",
-    #     backref="pokemon_species",
-    #     help_text="ID of the species' evolution chain (a.k.a. family)",
-    # )
-    # color_id = peewee.ForeignKeyField(
-    #     "PokemonColor",
-    #     backref="pokemon_species",
-    #     help_text="ID of this Pokémon's Pokédex color, as used for a gimmick search function in the games.",
-    # )
-    # shape_id = peewee.ForeignKeyField(
-    #     "PokemonShape",
-    #     backref="pokemon_species",
-    #     help_text="ID of this Pokémon's body shape, as used for a gimmick search function in the games.",
-    # )
-    # habitat_id = peewee.ForeignKeyField(
-    #     "PokemonHabitat",
-    #     backref="pokemon_species",
-    #     null=True,
-    #     help_text="ID of this Pokémon's habitat, as used for a gimmick search function in the games.",
-    # )
+    evolution_chain_id = peewee.ForeignKeyField(
+        EvolutionChain,
+        backref="pokemon_species",
+        help_text="ID of the species' evolution chain (a.k.a. family)",
+    )
+    color_id = peewee.ForeignKeyField(
+        PokemonColor,
+        backref="pokemon_species",
+        help_text="ID of this Pokémon's Pokédex color, as used for a gimmick search function in the games.",
+    )
+    shape_id = peewee.ForeignKeyField(
+        PokemonShape,
+        backref="pokemon_species",
+        help_text="ID of this Pokémon's body shape, as used for a gimmick search function in the games.",
+    )
+    habitat_id = peewee.ForeignKeyField(
+        PokemonHabitat,
+        backref="pokemon_species",
+        null=True,
+        help_text="ID of this Pokémon's habitat, as used for a gimmick search function in the games.",
+    )
     gender_rate = peewee.IntegerField(
         help_text="The chance of this Pokémon being female, in eighths; or -1 for genderless",
     )
@@ -113,11 +293,11 @@ class PokemonSpecies(BaseModel):
     has_gender_differences = peewee.BooleanField(
         help_text="Set iff the species exhibits enough sexual dimorphism to have separate sets of sprites in Gen IV and beyond.",
     )
-    # growth_rate_id = peewee.ForeignKeyField(
-    #     "PokemonGrowthRate",
-    #     backref="pokemon_species",
-    #     help_text="ID of the growth rate for this family",
-    # )
+    growth_rate_id = peewee.ForeignKeyField(
+        GrowthRate,
+        backref="pokemon_species",
+        help_text="ID of the growth rate for this family",
+    )
     forms_switchable = peewee.BooleanField(
         help_text="True iff a particular individual of this species can switch between its different forms.",
     )
@@ -132,7 +312,159 @@ class PokemonSpecies(BaseModel):
     )
 
 
-Pokemon.species = peewee.ForeignKeyField(PokemonSpecies)
+class Pokemon(BaseModel):
+    """A Pokémon.  The core to this whole mess.
+
+    This table defines "Pokémon" the same way the games do: a form with
+    different types, moves, or other game-changing properties counts as a
+    different Pokémon.  For example, this table contains four rows for Deoxys,
+    but only one for Unown.
+
+    Non-default forms have IDs above 10000.
+    IDs below 10000 match the species_id column, for convenience.
+    """
+
+    id = peewee.IntegerField(primary_key=True)  # noqa: A003
+    identifier = peewee.CharField(
+        max_length=79,
+        index=True,
+        help_text="An identifier, including form iff this row corresponds to a single, named form",
+    )
+    species = peewee.ForeignKeyField(
+        PokemonSpecies,
+        column_name="species_id",
+        backref="pokemon",
+        help_text="ID of the species this Pokémon belongs to",
+    )
+    height = peewee.IntegerField(
+        help_text="The height of the Pokémon, in tenths of a meter (decimeters)",
+    )
+    weight = peewee.IntegerField(
+        help_text="The weight of the Pokémon, in tenths of a kilogram (hectograms)",
+    )
+    base_experience = peewee.IntegerField(
+        help_text="The base EXP gained when defeating this Pokémon",
+    )
+    order = peewee.IntegerField(
+        index=True,
+        help_text=(
+            "Order for sorting. Almost national order, " "except families are grouped together."
+        ),
+    )
+    is_default = peewee.BooleanField(
+        index=True,
+        help_text="Set for exactly one pokemon used as the default for each species.",
+    )
+
+
+class PokemonStat(BaseModel):
+    """A stat value of a Pokémon."""
+
+    pokemon_id = peewee.ForeignKeyField(
+        Pokemon,
+        backref="stats",
+        help_text="ID of the Pokémon",
+    )
+    stat_id = peewee.ForeignKeyField(
+        Stat,
+        backref="pokemon_stats",
+        help_text="ID of the stat",
+    )
+    base_stat = peewee.IntegerField(help_text="The base stat")
+    effort = peewee.IntegerField(
+        help_text="The effort increase in this stat gained when this Pokémon is defeated"
+    )
+
+    class Meta:
+        """One value per Pokémon and stat."""
+
+        primary_key = peewee.CompositeKey("pokemon_id", "stat_id")
+
+
+class PokemonType(BaseModel):
+    """Maps a type to a Pokémon. Each Pokémon has 1 or 2 types."""
+
+    pokemon_id = peewee.ForeignKeyField(
+        Pokemon,
+        backref="types",
+        help_text="ID of the Pokémon",
+    )
+    type_id = peewee.ForeignKeyField(
+        Type,
+        backref="pokemon",
+        help_text="ID of the type",
+    )
+    slot = peewee.IntegerField(
+        help_text="The type's slot, 1 or 2, used to sort types if there are two of them"
+    )
+
+    class Meta:
+        """At most one type per Pokémon and slot."""
+
+        primary_key = peewee.CompositeKey("pokemon_id", "slot")
+
+
+class PokemonMove(BaseModel):
+    """A move a Pokémon can learn in a version group, and how."""
+
+    pokemon_id = peewee.ForeignKeyField(
+        Pokemon,
+        backref="moves",
+        help_text="ID of the Pokémon",
+    )
+    version_group_id = peewee.ForeignKeyField(
+        VersionGroup,
+        backref="pokemon_moves",
+        help_text="ID of the version group this applies to",
+    )
+    move_id = peewee.ForeignKeyField(
+        Move,
+        backref="pokemon_moves",
+        help_text="ID of the move",
+    )
+    pokemon_move_method_id = peewee.ForeignKeyField(
+        PokemonMoveMethod,
+        backref="pokemon_moves",
+        help_text="ID of the method this move is learned by",
+    )
+    level = peewee.IntegerField(
+        help_text="Level the move is learned at, if applicable; 0 otherwise"
+    )
+    order = peewee.IntegerField(
+        null=True,
+        help_text="The order in which moves learned at the same level are learned",
+    )
+
+    class Meta:
+        """A move is learned at most once per Pokémon, version group, method and level."""
+
+        primary_key = peewee.CompositeKey(
+            "pokemon_id", "version_group_id", "move_id", "pokemon_move_method_id", "level"
+        )
+
+
+class TypeEfficacy(BaseModel):
+    """The damage factor of a type of move against a type of Pokémon."""
+
+    damage_type_id = peewee.ForeignKeyField(
+        Type,
+        backref="damage_efficacies",
+        help_text="ID of the type of the move",
+    )
+    target_type_id = peewee.ForeignKeyField(
+        Type,
+        backref="target_efficacies",
+        help_text="ID of the type of the target",
+    )
+    damage_factor = peewee.IntegerField(
+        help_text="The damage multiplier, as a percentage: 0, 50, 100 or 200"
+    )
+
+    class Meta:
+        """One factor per pair of types; the veekun table name is singular."""
+
+        table_name = "type_efficacy"
+        primary_key = peewee.CompositeKey("damage_type_id", "target_type_id")
 
 
 def get_pokemon(identifier: str) -> List[Pokemon]:
@@ -146,4 +478,25 @@ def get_pokemon(identifier: str) -> List[Pokemon]:
     return pokemon_set
 
 
-MODELS = [Pokemon, PokemonSpecies]
+MODELS = [
+    Pokemon,
+    PokemonSpecies,
+    Region,
+    Generation,
+    VersionGroup,
+    Version,
+    GrowthRate,
+    EvolutionChain,
+    PokemonColor,
+    PokemonShape,
+    PokemonHabitat,
+    MoveDamageClass,
+    Stat,
+    Type,
+    PokemonStat,
+    PokemonType,
+    TypeEfficacy,
+    Move,
+    PokemonMoveMethod,
+    PokemonMove,
+]
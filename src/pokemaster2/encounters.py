@@ -0,0 +1,250 @@
+"""Monte Carlo simulation of wild encounters.
+
+Every trial draws a fixed number of random numbers from one Gen. 3 PRNG
+stream:
+
+    [slot] [level] [PID] [PID] [IVs ...] [shake] [shake] [shake] [shake]
+
+where the IV part follows Method 1, 2 or 4 (see
+`PRNG.generate_pid_and_iv`). Because the layout is fixed, trial `t`
+always starts `t * calls_per_trial` steps into the stream. Trials are
+simulated in blocks whose starting seeds are found by jump-ahead, so the
+blocks are non-overlapping substreams of one stream, and the aggregated
+results are bit-identical no matter how many worker processes run them.
+"""
+import concurrent.futures
+from typing import Dict, Optional, Sequence, Tuple, TypeVar
+
+import attr
+import numpy as np
+
+from pokemaster2 import capture, personality
+from pokemaster2.prng import lcg_jump, lcg_outputs, lcg_seeds
+
+E = TypeVar("E", bound="EncounterStats")
+
+_IV_CALLS = {1: 2, 2: 3, 4: 3}
+_SHAKES = 4
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class EncounterSlot:
+    """An entry of an encounter table."""
+
+    species_id: int
+    min_level: int
+    max_level: int
+    weight: int
+
+
+@attr.s(auto_attribs=True, eq=False)
+class EncounterStats:
+    """Aggregated results of an encounter simulation.
+
+    Attributes:
+        trials: Number of simulated encounters.
+        slot_counts: Encounters per slot of the encounter table.
+        species_ids: The species of each slot.
+        level_counts: Encounters per level, indexed by level.
+        iv_counts: A `(6, 32)` histogram of IVs, with the stats in the
+            order of `pokemaster2.pokemon.STAT_NAMES`.
+        shiny: Number of shiny encounters.
+        caught: Number of encounters caught by a Poké Ball at full HP.
+    """
+
+    trials: int
+    slot_counts: np.ndarray
+    species_ids: np.ndarray
+    level_counts: np.ndarray
+    iv_counts: np.ndarray
+    shiny: int
+    caught: int
+
+    def __add__(self: E, other: E) -> E:
+        """Merge the results of two simulations of the same table."""
+        return self.__class__(
+            trials=self.trials + other.trials,
+            slot_counts=self.slot_counts + other.slot_counts,
+            species_ids=self.species_ids,
+            level_counts=self.level_counts + other.level_counts,
+            iv_counts=self.iv_counts + other.iv_counts,
+            shiny=self.shiny + other.shiny,
+            caught=self.caught + other.caught,
+        )
+
+    def __eq__(self: E, other: object) -> bool:
+        """Two results are equal iff every count is equal."""
+        if not isinstance(other, EncounterStats):
+            return NotImplemented
+        return (
+            self.trials == other.trials
+            and np.array_equal(self.slot_counts, other.slot_counts)
+            and np.array_equal(self.species_ids, other.species_ids)
+            and np.array_equal(self.level_counts, other.level_counts)
+            and np.array_equal(self.iv_counts, other.iv_counts)
+            and self.shiny == other.shiny
+            and self.caught == other.caught
+        )
+
+    @property
+    def species_distribution(self: E) -> Dict[int, float]:
+        """Fraction of encounters per species id."""
+        distribution: Dict[int, float] = {}
+        for species_id, count in zip(self.species_ids.tolist(), self.slot_counts.tolist()):
+            distribution[species_id] = distribution.get(species_id, 0) + count / self.trials
+        return distribution
+
+    @property
+    def shiny_rate(self: E) -> float:
+        """Fraction of shiny encounters."""
+        return self.shiny / self.trials
+
+    @property
+    def catch_rate(self: E) -> float:
+        """Fraction of encounters caught on the first throw."""
+        return self.caught / self.trials
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class _Table:
+    """An encounter table flattened into arrays, cheap to send to workers."""
+
+    species_ids: np.ndarray
+    min_levels: np.ndarray
+    level_spans: np.ndarray
+    cumulative_weights: np.ndarray
+    shake_thresholds: np.ndarray
+
+
+def calls_per_trial(method: int) -> int:
+    """Number of random numbers a trial draws with a generation method.
+
+    Args:
+        method: 1, 2, or 4.
+
+    Raises:
+        ValueError: if the method is not in (1, 2, 4).
+
+    Returns:
+        int
+    """
+    if method not in _IV_CALLS:
+        raise ValueError("Only methods 1, 2, 4 are supported.")
+    return 2 + 2 + _IV_CALLS[method] + _SHAKES
+
+
+def simulate(
+    table: Sequence[EncounterSlot],
+    trials: int,
+    seed: int = 0,
+    method: int = 1,
+    tid: int = 0,
+    sid: int = 0,
+    capture_rates: Optional[Sequence[int]] = None,
+    workers: int = 1,
+    block_size: int = 1 << 16,
+) -> EncounterStats:
+    """Simulate wild encounters.
+
+    Args:
+        table: The encounter table.
+        trials: Number of encounters to simulate.
+        seed: Seed of the PRNG stream.
+        method: PID/IV generation method, 1, 2, or 4.
+        tid: Trainer ID, for shininess.
+        sid: Secret ID, for shininess.
+        capture_rates: Capture rate of each slot's species. Read from
+            `PokemonSpecies` if omitted.
+        workers: Number of worker processes. 1 runs in this process.
+        block_size: Number of trials per unit of work. Has no effect on
+            the results.
+
+    Raises:
+        ValueError: if the table has no slot with a positive weight, or
+            if the stream would wrap around the PRNG period.
+
+    Returns:
+        An `EncounterStats` instance.
+    """
+    if sum(slot.weight for slot in table) <= 0:
+        raise ValueError("The encounter table needs a slot with a positive weight.")
+    calls = calls_per_trial(method)
+    if trials * calls > 1 << 32:
+        raise ValueError(f"{trials} trials exceed the period of the PRNG.")
+
+    species_ids = np.array([slot.species_id for slot in table], dtype=np.int32)
+    if capture_rates is None:
+        from pokemaster2.db.arrays import get_species_arrays
+
+        capture_rates = get_species_arrays().capture_rate[species_ids].tolist()
+    flat_table = _Table(
+        species_ids=species_ids,
+        min_levels=np.array([slot.min_level for slot in table], dtype=np.int32),
+        level_spans=np.array(
+            [slot.max_level - slot.min_level + 1 for slot in table], dtype=np.int32
+        ),
+        cumulative_weights=np.cumsum([slot.weight for slot in table]),
+        shake_thresholds=capture.shake_thresholds(np.asarray(capture_rates), 1, 1),
+    )
+
+    jobs = []
+    for start in range(0, trials, block_size):
+        a, c = lcg_jump(start * calls)
+        block_seed = (a * seed + c) & 0xFFFFFFFF
+        jobs.append((flat_table, block_seed, min(block_size, trials - start), method, tid, sid))
+
+    result = _empty_stats(flat_table)
+    if workers == 1:
+        for stats in map(_simulate_block, jobs):
+            result += stats
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for stats in executor.map(_simulate_block, jobs):
+                result += stats
+    return result
+
+
+def _empty_stats(table: _Table) -> EncounterStats:
+    return EncounterStats(
+        trials=0,
+        slot_counts=np.zeros(len(table.species_ids), dtype=np.int64),
+        species_ids=table.species_ids,
+        level_counts=np.zeros(101, dtype=np.int64),
+        iv_counts=np.zeros((6, 32), dtype=np.int64),
+        shiny=0,
+        caught=0,
+    )
+
+
+def _simulate_block(job: Tuple[_Table, int, int, int, int, int]) -> EncounterStats:
+    """Simulate `trials` consecutive trials starting at `seed`."""
+    table, seed, trials, method, tid, sid = job
+    calls = calls_per_trial(method)
+    draws = lcg_outputs(lcg_seeds(seed, trials, stride=calls), calls).astype(np.uint32)
+
+    slot = np.searchsorted(
+        table.cumulative_weights, draws[:, 0] % table.cumulative_weights[-1], side="right"
+    )
+    level = table.min_levels[slot] + draws[:, 1] % table.level_spans[slot]
+    pid = draws[:, 2] | draws[:, 3] << 16
+    if method == 1:
+        gene = draws[:, 4] | draws[:, 5] << 16
+    elif method == 2:
+        gene = draws[:, 5] | draws[:, 6] << 16
+    else:  # method == 4
+        gene = draws[:, 4] | draws[:, 6] << 16
+    shakes = draws[:, -_SHAKES:]
+    caught = (shakes < table.shake_thresholds[slot][:, np.newaxis]).all(axis=1)
+
+    ivs = personality.unpack_ivs(gene).astype(np.int64)
+    iv_counts = np.bincount((np.arange(6) * 32 + ivs).ravel(), minlength=6 * 32).reshape(6, 32)
+
+    return EncounterStats(
+        trials=trials,
+        slot_counts=np.bincount(slot, minlength=len(table.species_ids)),
+        species_ids=table.species_ids,
+        level_counts=np.bincount(level, minlength=101),
+        iv_counts=iv_counts,
+        shiny=int(personality.shiny_flags(pid, tid, sid).sum()),
+        caught=int(caught.sum()),
+    )
@@ -0,0 +1,211 @@
+"""Find EV spreads that reach stat benchmarks.
+
+A spread gives each stat 0 to 255 EVs, 510 in total. Only multiples of
+4 matter, because the stat formula divides EVs by 4, and of those only
+the *breakpoints*: the EVs at which the floor divisions of the formula
+make the stat grow. Any other amount wastes EVs on nothing. `optimize`
+therefore tabulates every stat at every multiple of 4 once, keeps the
+breakpoints that reach the requested minimums, and enumerates their
+combinations as arrays, dropping the partial spreads over the budget as
+soon as they are built.
+
+The spreads returned are Pareto-optimal: no other legal spread reaches
+the benchmarks with stats at least as high in every stat to maximize and
+at most as many EVs in every other stat.
+"""
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+import attr
+import numpy as np
+
+from pokemaster2 import ivs
+from pokemaster2.pokemon import EV_DIVISOR, STAT_NAMES, Stats
+
+S = TypeVar("S", bound="Spread")
+
+MAX_EV = 255
+MAX_TOTAL_EV = 510
+EV_STEPS = np.arange(0, MAX_EV + 1, EV_DIVISOR)
+
+Constraint = Callable[[np.ndarray], np.ndarray]
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Spread:
+    """An EV spread and the stats it gives."""
+
+    ev: Stats
+    stats: Stats
+
+    @property
+    def total(self: S) -> int:
+        """The number of EVs spent."""
+        return sum(getattr(self.ev, stat) for stat in STAT_NAMES)
+
+
+def _values(stats: Stats) -> np.ndarray:
+    return np.array([getattr(stats, stat) for stat in STAT_NAMES], dtype=np.int64)
+
+
+def stat_table(level: int, base_stats: Stats, iv: Stats, nature: str) -> np.ndarray:
+    """Tabulate the stats of every multiple of 4 EVs.
+
+    Args:
+        level: The level.
+        base_stats: Base stats of the species.
+        iv: The IVs.
+        nature: The nature identifier.
+
+    Returns:
+        An `int64` array of shape `(64, 6)`: the stats given by
+        `EV_STEPS[i]` EVs in every stat, in row `i`.
+    """
+    evs = np.repeat(EV_STEPS[:, np.newaxis], 6, axis=1)
+    return ivs.calc_stats(level, _values(base_stats), _values(iv), evs, nature)
+
+
+def _pareto(objectives: np.ndarray, block_size: int = 256) -> np.ndarray:
+    """Indices of the rows no other row dominates; higher is better.
+
+    Rows are visited by decreasing sum, so a row can only be dominated by
+    an earlier one, and compared in blocks against the rows kept so far.
+    Of identical rows, the first one is kept.
+    """
+    if objectives.shape[1] == 0:
+        return np.arange(min(1, len(objectives)))
+    order = np.argsort(-objectives.sum(axis=1), kind="stable")
+    # Stats and EVs fit in 16 bits, which halves the memory traffic.
+    ordered = objectives[order].astype(np.int16)
+    front = np.zeros(0, dtype=np.int64)
+    for start in range(0, len(ordered), block_size):
+        block = ordered[start : start + block_size]
+        earlier = (block[np.newaxis, :, :] >= block[:, np.newaxis, :]).all(axis=-1)
+        dominated = np.tril(earlier, -1).any(axis=1)
+        if len(front):
+            kept = ordered[front]
+            dominated |= np.any(
+                (kept[np.newaxis, :, :] >= block[:, np.newaxis, :]).all(axis=-1), axis=1
+            )
+        front = np.concatenate([front, start + np.flatnonzero(~dominated)])
+    return order[front]
+
+
+def optimize(
+    level: int,
+    base_stats: Stats,
+    iv: Stats,
+    nature: str,
+    minimums: Optional[Stats] = None,
+    maximize: Sequence[str] = (),
+    constraint: Optional[Constraint] = None,
+    constrained: Sequence[str] = (),
+) -> List[Spread]:
+    """Find the EV spreads reaching stat benchmarks without waste.
+
+    Usage:
+        >>> garchomp = dict(
+        ...     level=50,
+        ...     base_stats=Stats(108, 130, 95, 80, 85, 102),
+        ...     iv=Stats(31, 31, 31, 31, 31, 31),
+        ...     nature="jolly",
+        ... )
+        >>> # Reach 160 Speed, then hit as hard as possible.
+        >>> (spread,) = optimize(
+        ...     **garchomp, minimums=Stats(0, 0, 0, 0, 0, 160), maximize=["atk"]
+        ... )
+        >>> spread.ev
+        Stats(hp=0, atk=252, def_=0, spatk=0, spdef=0, spd=188)
+
+    Args:
+        level: The level.
+        base_stats: Base stats of the species.
+        iv: The IVs.
+        nature: The nature identifier.
+        minimums: The lowest acceptable value of every stat; 0 for no
+            minimum.
+        maximize: Stats to raise as much as the remaining EVs allow.
+        constraint: A benchmark on several stats, e.g. surviving a hit.
+            Called with an `int64` array of stats of shape `(n, 6)`, in
+            the order of `STAT_NAMES`, it returns a boolean array of shape
+            `(n,)`. Raising a stat must never break it.
+        constrained: The stats `constraint` depends on. Every one of them
+            multiplies the number of spreads to enumerate.
+
+    Returns:
+        The Pareto-optimal spreads, fewest EVs first. Empty if the
+        benchmarks cannot be reached.
+    """
+    table = stat_table(level, base_stats, iv, nature)
+    lows = np.zeros(6, dtype=np.int64) if minimums is None else _values(minimums)
+    free = set(maximize) | (set(constrained) if constraint is not None else set())
+
+    # The EV steps worth considering for every stat.
+    options = []
+    for column, stat in enumerate(STAT_NAMES):
+        values = table[:, column]
+        grows = np.concatenate([[True], values[1:] > values[:-1]])
+        steps = np.flatnonzero(grows & (values >= lows[column]))
+        if len(steps) == 0:
+            return []
+        if stat not in free:
+            # Anything over the lowest step reaching the minimum is waste.
+            steps = steps[:1]
+        options.append(steps)
+
+    # Enumerate the combinations, the stats to maximize last, so the very
+    # last one simply gets the highest step the remaining EVs afford.
+    order = sorted(range(6), key=lambda column: STAT_NAMES[column] in maximize)
+    last = order[-1] if STAT_NAMES[order[-1]] in maximize else None
+    chosen = np.zeros((1, 6), dtype=np.int64)
+    for column in order:
+        spent = EV_STEPS[chosen].sum(axis=1)
+        steps = options[column]
+        if column == last:
+            affordable = np.searchsorted(EV_STEPS[steps], MAX_TOTAL_EV - spent, side="right") - 1
+            keep = affordable >= 0
+            chosen = chosen[keep]
+            chosen[:, column] = steps[affordable[keep]]
+            continue
+        totals = spent[:, np.newaxis] + EV_STEPS[steps]
+        rows, picks = np.nonzero(totals <= MAX_TOTAL_EV)
+        chosen = chosen[rows]
+        chosen[:, column] = steps[picks]
+
+    stats = table[chosen, np.arange(6)]
+    if constraint is not None:
+        keep = np.asarray(constraint(stats), dtype=bool)
+        chosen, stats = chosen[keep], stats[keep]
+
+    maximized = [column for column in range(6) if STAT_NAMES[column] in maximize]
+    # A spread that still affords the next step of a stat to maximize is
+    # dominated by the spread taking it; drop those before comparing.
+    left = MAX_TOTAL_EV - EV_STEPS[chosen].sum(axis=1)
+    for column in maximized:
+        steps = np.append(options[column], len(EV_STEPS))
+        following = steps[np.searchsorted(steps, chosen[:, column], side="right")]
+        costs = np.append(EV_STEPS, MAX_TOTAL_EV + 1)[following] - EV_STEPS[chosen[:, column]]
+        keep = costs > left
+        chosen, stats, left = chosen[keep], stats[keep], left[keep]
+    # Likewise, a spread still meeting the constraint with one step less
+    # in a stat not to maximize is dominated by that spread.
+    if constraint is not None:
+        for column, stat in enumerate(STAT_NAMES):
+            if stat in free and stat not in maximize:
+                position = np.searchsorted(options[column], chosen[:, column])
+                lower = position > 0
+                lowered = stats.copy()
+                lowered[lower, column] = table[options[column][position[lower] - 1], column]
+                keep = ~(lower & np.asarray(constraint(lowered), dtype=bool))
+                chosen, stats = chosen[keep], stats[keep]
+
+    saved = [column for column in range(6) if STAT_NAMES[column] not in maximize]
+    objectives = np.concatenate([stats[:, maximized], -EV_STEPS[chosen[:, saved]]], axis=1)
+    front = _pareto(objectives)
+    evs, stats = EV_STEPS[chosen[front]], stats[front]
+
+    # Fewest EVs first, then by the EVs of each stat.
+    by_evs = np.lexsort((*evs.T[::-1], evs.sum(axis=1)))
+    return [
+        Spread(ev=Stats(*ev), stats=Stats(*values))
+        for ev, values in zip(evs[by_evs].tolist(), stats[by_evs].tolist())
+    ]
@@ -0,0 +1,184 @@
+"""Infer IVs from observed stats.
+
+This is the inverse of `pokemaster2.pokemon._calc_stats`. Instead of
+solving the stat formula for the IV, which is lossy because of the
+integer divisions and the nature multiplier, every candidate IV from 0
+to 31 is run through the formula at once, and the candidates whose stats
+match the observation are kept. Observations at several levels are
+intersected, which narrows the candidates down as the Pokémon grows.
+
+The formula is evaluated with the constants of `pokemaster2.pokemon`,
+and the nature multipliers of `Stats.nature_modifiers`, so the inverse
+cannot drift apart from `_calc_stats`.
+
+All functions work on batches: arrays with a leading axis of Pokémon
+and a trailing axis of the 6 stats, in the order of `STAT_NAMES`.
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from pokemaster2.pokemon import (
+    EV_DIVISOR,
+    FIXED_HP_BASE,
+    HP_OFFSET,
+    MAX_IV,
+    NATURES,
+    STAT_NAMES,
+    STAT_OFFSET,
+    Stats,
+)
+
+# Nature multipliers, indexed by nature then by stat.
+NATURE_MODIFIERS = np.array(
+    [[getattr(Stats.nature_modifiers(nature), stat) for stat in STAT_NAMES] for nature in NATURES],
+    dtype=np.float64,
+)
+CANDIDATE_IVS = np.arange(MAX_IV + 1)
+
+
+def _as_stats(stats: Stats) -> np.ndarray:
+    return np.array([getattr(stats, stat) for stat in STAT_NAMES], dtype=np.int64)
+
+
+def _nature_indices(natures: ArrayLike) -> np.ndarray:
+    natures = np.asarray(natures)
+    if natures.dtype.kind in "US":
+        return np.vectorize(NATURES.index, otypes=[np.int64])(natures)
+    return natures.astype(np.int64)
+
+
+def calc_stats(
+    levels: ArrayLike,
+    base_stats: ArrayLike,
+    ivs: ArrayLike,
+    evs: ArrayLike,
+    natures: ArrayLike,
+) -> np.ndarray:
+    """Calculate stats; the batch version of `_calc_stats`.
+
+    Arguments broadcast against each other, with a trailing axis of 6
+    stats for `base_stats`, `ivs` and `evs`.
+
+    Args:
+        levels: Levels, 1 to 100.
+        base_stats: Base stats of the species.
+        ivs: IVs, 0 to 31.
+        evs: EVs, 0 to 255.
+        natures: Nature identifiers, or indices into `NATURES`.
+
+    Returns:
+        An `int64` array of stats.
+    """
+    levels = np.asarray(levels, dtype=np.int64)[..., np.newaxis]
+    base_stats = np.asarray(base_stats, dtype=np.int64)
+    offsets = np.full(levels.shape[:-1] + (6,), STAT_OFFSET, dtype=np.int64)
+    offsets[..., 0] = HP_OFFSET + levels[..., 0]
+    raw = (2 * base_stats + np.asarray(ivs) + np.asarray(evs) // EV_DIVISOR) * levels // 100
+    # The same float multiplication and truncation as `pokemon._calc_stats`.
+    stats = ((raw + offsets) * NATURE_MODIFIERS[_nature_indices(natures)]).astype(np.int64)
+    stats[..., 0] = np.where(base_stats[..., 0] == FIXED_HP_BASE, 1, stats[..., 0])
+    return stats
+
+
+def candidate_ivs(
+    base_stats: ArrayLike,
+    natures: ArrayLike,
+    levels: ArrayLike,
+    stats: ArrayLike,
+    evs: ArrayLike = 0,
+) -> np.ndarray:
+    """Find the IVs consistent with observed stats.
+
+    Args:
+        base_stats: Base stats of each Pokémon, shape `(n, 6)`.
+        natures: Nature of each Pokémon, shape `(n,)`.
+        levels: Levels of the observations, shape `(n, k)`. Levels of 0
+            mark missing observations and are ignored.
+        stats: Observed stats, shape `(n, k, 6)`.
+        evs: EVs at each observation, shape `(n, k, 6)` or broadcastable
+            to it. 0 if omitted.
+
+    Returns:
+        A boolean array of shape `(n, 6, 32)`: whether each IV of each
+        stat is consistent with every observation.
+    """
+    levels = np.asarray(levels, dtype=np.int64)
+    base_stats = np.asarray(base_stats, dtype=np.int64)[:, np.newaxis, np.newaxis, :]
+    natures = _nature_indices(natures)[:, np.newaxis, np.newaxis]
+    evs = np.broadcast_to(np.asarray(evs, dtype=np.int64), levels.shape + (6,))
+    # Axes: Pokémon, observation, candidate IV, stat.
+    expected = calc_stats(
+        levels[..., np.newaxis],
+        base_stats,
+        CANDIDATE_IVS[:, np.newaxis],
+        evs[:, :, np.newaxis, :],
+        natures,
+    )
+    matches = expected == np.asarray(stats, dtype=np.int64)[:, :, np.newaxis, :]
+    matches |= (levels == 0)[..., np.newaxis, np.newaxis]
+    return matches.all(axis=1).transpose(0, 2, 1)
+
+
+def iv_ranges(candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Summarize candidate IVs as ranges.
+
+    The stats grow with the IV, so the consistent IVs of a stat are
+    always a range.
+
+    Args:
+        candidates: A boolean array from `candidate_ivs`.
+
+    Returns:
+        Two `int8` arrays of shape `(n, 6)`, the lowest and the highest
+        consistent IV. Both are -1 where no IV is consistent.
+    """
+    found = candidates.any(axis=-1)
+    low = np.where(found, candidates.argmax(axis=-1), -1)
+    high = np.where(found, MAX_IV - candidates[..., ::-1].argmax(axis=-1), -1)
+    return low.astype(np.int8), high.astype(np.int8)
+
+
+def infer(
+    base_stats: Stats, nature: str, observations: Sequence[Tuple[int, Stats, Stats]]
+) -> Tuple[Stats, Stats]:
+    """Infer the IV ranges of one Pokémon.
+
+    Usage:
+        >>> base_stats = Stats(108, 130, 95, 80, 85, 102)
+        >>> iv = Stats(24, 12, 30, 16, 23, 5)
+        >>> ev = Stats(74, 190, 91, 48, 84, 23)
+        >>> from pokemaster2.pokemon import _calc_stats
+        >>> stats = _calc_stats(78, base_stats, iv, ev, "adamant")
+        >>> low, high = infer(base_stats, "adamant", [(78, stats, ev)])
+        >>> low.atk, high.atk
+        (11, 12)
+
+    Args:
+        base_stats: Base stats of the species.
+        nature: The nature identifier.
+        observations: `(level, stats, evs)` tuples.
+
+    Raises:
+        ValueError: if no IV of some stat is consistent with the
+            observations.
+
+    Returns:
+        The lowest and the highest consistent IVs, as `Stats`.
+    """
+    candidates = candidate_ivs(
+        _as_stats(base_stats)[np.newaxis],
+        [nature],
+        [[level for level, _, _ in observations]],
+        [[_as_stats(stats) for _, stats, _ in observations]],
+        [[_as_stats(evs) for _, _, evs in observations]],
+    )
+    low, high = iv_ranges(candidates)
+    if (low < 0).any():
+        stats = [stat for stat, found in zip(STAT_NAMES, low[0] >= 0) if not found]
+        raise ValueError(f"No IV is consistent with the observed {', '.join(stats)}.")
+    return (
+        Stats(**dict(zip(STAT_NAMES, low[0].tolist()))),
+        Stats(**dict(zip(STAT_NAMES, high[0].tolist()))),
+    )
@@ -0,0 +1,241 @@
+"""Traits derived from a Pokémon's personality value (PID).
+
+Every function here accepts scalars or NumPy arrays of PIDs and works
+on whole batches at once.
+
+References:
+    https://bulbapedia.bulbagarden.net/wiki/Personality_value
+"""
+from typing import Union
+
+import numpy as np
+
+from pokemaster2.db.arrays import SpeciesArrays
+
+ArrayLike = Union[int, np.ndarray]
+
+MALE = 0
+FEMALE = 1
+GENDERLESS = -1
+
+HIDDEN_POWER_TYPES = (
+    "fighting",
+    "flying",
+    "poison",
+    "ground",
+    "rock",
+    "bug",
+    "ghost",
+    "steel",
+    "fire",
+    "water",
+    "grass",
+    "electric",
+    "psychic",
+    "ice",
+    "dragon",
+    "dark",
+)
+
+# Characteristics in the order of `characteristics()`: five per stat, with
+# the stats in the in-game order HP, Attack, Defense, Speed, Sp. Atk and
+# Sp. Def.
+CHARACTERISTICS = (
+    "loves-to-eat",
+    "takes-plenty-of-siestas",
+    "nods-off-a-lot",
+    "scatters-things-often",
+    "likes-to-relax",
+    "proud-of-its-power",
+    "likes-to-thrash-about",
+    "a-little-quick-tempered",
+    "likes-to-fight",
+    "quick-tempered",
+    "sturdy-body",
+    "capable-of-taking-hits",
+    "highly-persistent",
+    "good-endurance",
+    "good-perseverance",
+    "likes-to-run",
+    "alert-to-sounds",
+    "impetuous-and-silly",
+    "somewhat-of-a-clown",
+    "quick-to-flee",
+    "highly-curious",
+    "mischievous",
+    "thoroughly-cunning",
+    "often-lost-in-thought",
+    "very-finicky",
+    "strong-willed",
+    "somewhat-vain",
+    "strongly-defiant",
+    "hates-to-lose",
+    "somewhat-stubborn",
+)
+
+# Bit offsets of each IV inside the gene, in the in-game stat order
+# (HP, Attack, Defense, Speed, Sp. Atk, Sp. Def); see `Stats.create_iv`.
+_GENE_OFFSETS = np.array([0, 5, 10, 16, 21, 26], dtype=np.uint32)
+# Columns of the in-game order, rearranged into `STAT_NAMES` order.
+_GAME_TO_STAT_NAMES = [0, 1, 2, 4, 5, 3]
+# Bit offsets of each IV inside the gene, in `STAT_NAMES` order.
+IV_OFFSETS = _GENE_OFFSETS[_GAME_TO_STAT_NAMES]
+
+
+def _as_pids(pids: ArrayLike) -> np.ndarray:
+    return np.asarray(pids, dtype=np.uint32)
+
+
+def gender_thresholds(gender_rate: ArrayLike) -> np.ndarray:
+    """Convert `PokemonSpecies.gender_rate` into gender thresholds.
+
+    A Pokémon is female iff `pid & 0xFF` is less than its threshold.
+    All-male species get 0, all-female species get 256 so every PID
+    qualifies, and genderless species get -1.
+
+    Args:
+        gender_rate: The chance of being female in eighths, or -1.
+
+    Returns:
+        An `int16` array of thresholds.
+    """
+    rate = np.asarray(gender_rate, dtype=np.int16)
+    thresholds = np.where(rate > 0, rate * 32 - 1, 0)
+    thresholds = np.where(rate >= 8, 256, thresholds)
+    return np.where(rate < 0, -1, thresholds).astype(np.int16)
+
+
+def genders(pids: ArrayLike, species_ids: ArrayLike, species: SpeciesArrays) -> np.ndarray:
+    """Determine the gender of each Pokémon.
+
+    Args:
+        pids: Personality values.
+        species_ids: Species of each Pokémon; a scalar applies to all.
+        species: The species parameter arrays.
+
+    Returns:
+        An `int8` array of `MALE`, `FEMALE` or `GENDERLESS`.
+    """
+    thresholds = gender_thresholds(species.gender_rate)[np.asarray(species_ids)]
+    female = (_as_pids(pids) & 0xFF) < thresholds
+    result = np.where(female, FEMALE, MALE).astype(np.int8)
+    return np.where(thresholds < 0, GENDERLESS, result).astype(np.int8)
+
+
+def ability_slots(pids: ArrayLike) -> np.ndarray:
+    """Determine which of the species' two abilities each Pokémon has.
+
+    Args:
+        pids: Personality values.
+
+    Returns:
+        A `uint8` array of 0 (first ability) or 1 (second ability).
+    """
+    return (_as_pids(pids) & 1).astype(np.uint8)
+
+
+def natures(pids: ArrayLike) -> np.ndarray:
+    """Determine the nature of each Pokémon.
+
+    Args:
+        pids: Personality values.
+
+    Returns:
+        A `uint8` array of indices into `pokemon.NATURES`.
+    """
+    return (_as_pids(pids) % 25).astype(np.uint8)
+
+
+def shiny_flags(pids: ArrayLike, tid: ArrayLike, sid: ArrayLike, threshold: int = 8) -> np.ndarray:
+    """Determine whether each Pokémon is shiny.
+
+    A Pokémon is shiny iff `(pid >> 16) ^ (pid & 0xFFFF) ^ tid ^ sid` is
+    less than `threshold`.
+
+    Args:
+        pids: Personality values.
+        tid: The trainer ID(s) of the original trainer.
+        sid: The secret ID(s) of the original trainer.
+        threshold: 8 up to Gen 5, 16 from Gen 6 on.
+
+    Returns:
+        A boolean array.
+    """
+    pids = _as_pids(pids)
+    trainer = np.asarray(tid, dtype=np.uint32) ^ np.asarray(sid, dtype=np.uint32)
+    return ((pids >> 16) ^ (pids & 0xFFFF) ^ trainer) < threshold
+
+
+def _game_order_ivs(genes: ArrayLike) -> np.ndarray:
+    genes = np.asarray(genes, dtype=np.uint32)
+    return ((genes[..., np.newaxis] >> _GENE_OFFSETS) & 0x1F).astype(np.uint8)
+
+
+def unpack_ivs(genes: ArrayLike) -> np.ndarray:
+    """Unpack IV genes into one column per stat.
+
+    This is the batch version of `Stats.create_iv`.
+
+    Args:
+        genes: The IV numbers generated by the PRNG.
+
+    Returns:
+        A `uint8` array with a trailing axis of 6 IVs, in the order of
+        `pokemaster2.pokemon.STAT_NAMES`.
+    """
+    return _game_order_ivs(genes)[..., _GAME_TO_STAT_NAMES]
+
+
+def pack_ivs(ivs: np.ndarray) -> np.ndarray:
+    """Pack IVs back into genes; the inverse of `unpack_ivs`.
+
+    Args:
+        ivs: An array with a trailing axis of 6 IVs, in the order of
+            `pokemaster2.pokemon.STAT_NAMES`.
+
+    Returns:
+        A `uint32` array of genes.
+    """
+    game_order = np.empty_like(np.asarray(ivs, dtype=np.uint32))
+    game_order[..., _GAME_TO_STAT_NAMES] = ivs
+    return np.bitwise_or.reduce(game_order << _GENE_OFFSETS, axis=-1).astype(np.uint32)
+
+
+def hidden_powers(genes: ArrayLike) -> np.ndarray:
+    """Determine the Hidden Power of each Pokémon from its IV gene.
+
+    Args:
+        genes: The IV numbers generated by the PRNG.
+
+    Returns:
+        A `uint16` array packing `power << 4 | type`, where `type` is an
+        index into `HIDDEN_POWER_TYPES` and `power` is between 30 and 70.
+    """
+    ivs = _game_order_ivs(genes).astype(np.uint16)
+    weights = np.array([1, 2, 4, 8, 16, 32], dtype=np.uint16)
+    type_ = ((ivs & 1) * weights).sum(axis=-1) * 15 // 63
+    power = (((ivs >> 1) & 1) * weights).sum(axis=-1) * 40 // 63 + 30
+    return (power << 4 | type_).astype(np.uint16)
+
+
+def characteristics(pids: ArrayLike, genes: ArrayLike) -> np.ndarray:
+    """Determine the characteristic of each Pokémon.
+
+    The characteristic depends on the highest IV. Ties are broken by
+    the first highest stat found when starting from stat `pid % 6` in
+    the in-game stat order.
+
+    Args:
+        pids: Personality values.
+        genes: The IV numbers generated by the PRNG.
+
+    Returns:
+        A `uint8` array of indices into `CHARACTERISTICS`.
+    """
+    ivs = _game_order_ivs(genes)
+    start = (_as_pids(pids) % 6).astype(np.int8)[..., np.newaxis]
+    distance = (np.arange(6, dtype=np.int8) - start) % 6
+    is_highest = ivs == ivs.max(axis=-1, keepdims=True)
+    stat = np.argmin(np.where(is_highest, distance, 6), axis=-1)
+    highest = np.take_along_axis(ivs, stat[..., np.newaxis], axis=-1)[..., 0]
+    return (stat * 5 + highest % 5).astype(np.uint8)
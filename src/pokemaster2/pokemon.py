@@ -1,6 +1,6 @@
 """Base Pokemon."""
 import operator
-from typing import Callable, Sequence, Type, TypeVar, Union
+from typing import Any, Callable, Optional, Sequence, Type, TypeVar, Union
 
 import attr
 
@@ -20,9 +20,65 @@ STAT_NAMES_FULL = {
     "speed": "spd",
 }
 
+# Natures in the order of their in-game index, i.e. `pid % 25`.
+NATURES = (
+    "hardy",
+    "lonely",
+    "brave",
+    "adamant",
+    "naughty",
+    "bold",
+    "docile",
+    "relaxed",
+    "impish",
+    "lax",
+    "timid",
+    "hasty",
+    "serious",
+    "jolly",
+    "naive",
+    "modest",
+    "mild",
+    "quiet",
+    "bashful",
+    "rash",
+    "calm",
+    "gentle",
+    "sassy",
+    "careful",
+    "quirky",
+)
+
+# Stats affected by natures, in the order of the natures' in-game index.
+_NATURE_STATS = ["atk", "def_", "spd", "spatk", "spdef"]
+
+# Terms of the stat formula, shared by `_calc_stats` and `pokemaster2.ivs`:
+#   hp    = (2 * base + iv + ev // 4) * level // 100 + level + 10
+#   other = ((2 * base + iv + ev // 4) * level // 100 + 5) * nature
+HP_OFFSET = 10
+STAT_OFFSET = 5
+EV_DIVISOR = 4
+NATURE_INCREASE = 1.1
+NATURE_DECREASE = 0.9
+# Species whose base HP is 1 (Shedinja) always have 1 HP.
+FIXED_HP_BASE = 1
+MAX_IV = 31
+
 prng = PRNG()
 
 
+@attr.s(auto_attribs=True, frozen=True)
+class NatureModifiers:
+    """The multipliers a nature applies to each stat: 1, 1.1 or 0.9."""
+
+    hp: float
+    atk: float
+    def_: float
+    spatk: float
+    spdef: float
+    spd: float
+
+
 @attr.s(auto_attribs=True)
 class Stats:
     """Generic stats, can be used for Pokemon stats/IV/EV."""
@@ -136,17 +192,32 @@ class Stats:
         )
 
     @classmethod
-    def nature_modifiers(cls: Type[S], nature: str) -> S:
-        """Generate nature modifier Stats."""
-        # nature_data = _db.get_nature(identifier=nature)
-        # modifiers = {}
-        # for stat in STAT_NAMES:
-        #     modifiers[stat] = 1
-        # if nature_data.is_neutral:
-        #     return cls(**modifiers)
-        # modifiers[STAT_NAMES_FULL[nature_data.increased_stat.identifier]] = 1.1
-        # modifiers[STAT_NAMES_FULL[nature_data.decreased_stat.identifier]] = 0.9
-        # return cls(**modifiers)
+    def nature_modifiers(cls: Type[S], nature: str) -> NatureModifiers:
+        """Generate nature modifiers.
+
+        A nature's in-game index `i` raises stat `i // 5` and lowers stat
+        `i % 5`, in the order Attack, Defense, Speed, Sp. Atk, Sp. Def.
+        Natures that raise and lower the same stat are neutral.
+
+        Args:
+            nature: A nature identifier, see `NATURES`.
+
+        Returns:
+            A `NatureModifiers` instance.
+        """
+        index = NATURES.index(nature)
+        modifiers = {stat: 1.0 for stat in STAT_NAMES}
+        increased, decreased = divmod(index, 5)
+        if increased != decreased:
+            modifiers[_NATURE_STATS[increased]] = NATURE_INCREASE
+            modifiers[_NATURE_STATS[decreased]] = NATURE_DECREASE
+        return NatureModifiers(**modifiers)
+
+
+def _invalidate_stats(pokemon: "BasePokemon", attribute: attr.Attribute, value: Any) -> Any:
+    """Mark the stats of a Pokémon as stale when one of their inputs is set."""
+    pokemon._stats = None
+    return value
 
 
 @attr.s(auto_attribs=True)
@@ -159,6 +230,11 @@ class BasePokemon:
     leveling-up, learning/forgetting moves, evolving into another
     Pokémon, etc.
 
+    `stats` are derived from `level`, `base_stats`, `iv`, `ev` and
+    `nature`. They are computed on first access and cached until one of
+    these attributes is set again. `Stats` are mutable, so change them
+    by assigning new ones, e.g. with `gain_ev`, not in place.
+
     This class is never meant to be instantiated directly.
     """
 
@@ -167,19 +243,39 @@ class BasePokemon:
     types: Sequence[str]
     item_held: str
     exp: int
-    level: int
+    level: int = attr.ib(on_setattr=_invalidate_stats)
 
-    base_stats: Stats
-    iv: Stats
+    base_stats: Stats = attr.ib(on_setattr=_invalidate_stats)
+    iv: Stats = attr.ib(on_setattr=_invalidate_stats)
     current_stats: Stats
-    stats: Stats
-    ev: Stats
+    ev: Stats = attr.ib(on_setattr=_invalidate_stats)
 
     # move_set = Mapping[int, Mapping[str, Union[str, int]]]
     pid: str
     gender: str
-    nature: str
+    nature: str = attr.ib(on_setattr=_invalidate_stats)
     ability: str
+    _stats: Optional[Stats] = attr.ib(default=None, init=False, repr=False, eq=False)
+
+    @property
+    def stats(self: P) -> Stats:
+        """The stats, computed from their inputs if they are stale."""
+        if self._stats is None:
+            self._stats = _calc_stats(self.level, self.base_stats, self.iv, self.ev, self.nature)
+        return self._stats
+
+    @property
+    def stale(self: P) -> bool:
+        """Whether `stats` will be computed again on next access."""
+        return self._stats is None
+
+    def gain_ev(self: P, ev: Stats) -> None:
+        """Add effort values.
+
+        Args:
+            ev: The EVs to add.
+        """
+        self.ev = self.ev + ev
 
     # def evolve(self: P) -> None:
     #     """
@@ -284,15 +380,50 @@ def _calc_stats(level: int, base_stats: Stats, iv: Stats, ev: Stats, nature: str
     """Calculate the Pokemon's stats."""
     nature_modifiers = Stats.nature_modifiers(nature)
     residual_stats = Stats(
-        hp=10 + level,
-        atk=5,
-        def_=5,
-        spatk=5,
-        spdef=5,
-        spd=5,
+        hp=HP_OFFSET + level,
+        atk=STAT_OFFSET,
+        def_=STAT_OFFSET,
+        spatk=STAT_OFFSET,
+        spdef=STAT_OFFSET,
+        spd=STAT_OFFSET,
     )
 
-    stats = ((base_stats * 2 + iv + ev // 4) * level // 100 + residual_stats) * nature_modifiers
-    if base_stats.hp == 1:
+    stats = (base_stats * 2 + iv + ev // EV_DIVISOR) * level // 100 + residual_stats
+    for stat in _NATURE_STATS:
+        setattr(stats, stat, int(getattr(stats, stat) * getattr(nature_modifiers, stat)))
+    if base_stats.hp == FIXED_HP_BASE:
         stats.hp = 1
     return stats
+
+
+def refresh(pokemon: Sequence[BasePokemon]) -> int:
+    """Compute the stale stats of many Pokémon at once.
+
+    The stats of the Pokémon whose inputs changed are computed together
+    with NumPy; the others are left untouched.
+
+    Args:
+        pokemon: A population of Pokémon.
+
+    Returns:
+        The number of Pokémon whose stats were computed.
+    """
+    from pokemaster2 import ivs
+
+    stale = [member for member in pokemon if member.stale]
+    if not stale:
+        return 0
+    stats = ivs.calc_stats(
+        [member.level for member in stale],
+        [_stat_values(member.base_stats) for member in stale],
+        [_stat_values(member.iv) for member in stale],
+        [_stat_values(member.ev) for member in stale],
+        [member.nature for member in stale],
+    )
+    for member, values in zip(stale, stats.tolist()):
+        member._stats = Stats(*values)
+    return len(stale)
+
+
+def _stat_values(stats: Stats) -> list:
+    return [getattr(stats, stat) for stat in STAT_NAMES]
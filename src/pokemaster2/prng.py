@@ -1,21 +1,287 @@
-"""Provides the pseudo-random number generator used in various places."""
+"""Provides the pseudo-random number generators used in various places.
+
+* Gen. 3 and 4 draw from a 32-bit linear congruential generator (LCG),
+  whose 16-bit outputs are the high half of the seed.
+* Gen. 5 draws from a 64-bit LCG, whose 32-bit outputs are the high
+  half of the seed.
+* Gen. 4 and 5 also use the Mersenne Twister (MT19937): Gen. 4 for the
+  PIDs of eggs, Gen. 5 for the IVs.
+
+Every generator comes with array functions that draw the outputs of many
+seeds at once, and with jump-ahead, so scanning seeds and frames does not
+iterate in Python.
+"""
 from typing import Generator, List, Tuple, TypeVar
 
 import attr
+import numpy as np
 
 P = TypeVar("P", bound="PRNG")
+M = TypeVar("M", bound="MersenneTwister")
+
+GEN3_MULTIPLIER = 0x41C64E6D
+GEN3_INCREMENT = 0x6073
+GEN5_MULTIPLIER = 0x5D588B656C078965
+GEN5_INCREMENT = 0x269EC3
+_MASK_32 = 0xFFFFFFFF
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# MT19937 parameters.
+MT_SIZE = 624
+_MT_SHIFT = 397
+_MT_MATRIX = 0x9908B0DF
+_MT_UPPER = 0x80000000
+_MT_LOWER = 0x7FFFFFFF
+_MT_INIT_MULTIPLIER = 1812433253
+# Seeds initialized and twisted at once by `mt_outputs`, to bound memory.
+_MT_CHUNK = 4096
+
+
+def _affine_jump(n: int, multiplier: int, increment: int, mask: int) -> Tuple[int, int]:
+    """Compose `n` steps of `seed -> (multiplier * seed + increment) & mask`."""
+    a, c = 1, 0
+    while n:
+        if n & 1:
+            a, c = (a * multiplier) & mask, (c * multiplier + increment) & mask
+        multiplier, increment = (
+            (multiplier * multiplier) & mask,
+            (increment * multiplier + increment) & mask,
+        )
+        n >>= 1
+    return a, c
+
+
+def _affine_seeds(seed: int, n: int, step_a: int, step_c: int, mask: int) -> np.ndarray:
+    """Apply `0..n-1` times the step `(step_a, step_c)` to `seed`, as `uint64`."""
+    a = np.ones(1, dtype=np.uint64)
+    c = np.zeros(1, dtype=np.uint64)
+    while len(a) < n:
+        # Extend the coefficients of 0..m-1 strides to 0..2m-1 strides.
+        # `uint64` arithmetic wraps around, which is the 64-bit mask.
+        a = np.concatenate([a, (a * np.uint64(step_a)) & np.uint64(mask)])
+        c = np.concatenate([c, (c * np.uint64(step_a) + np.uint64(step_c)) & np.uint64(mask)])
+        step_a, step_c = (
+            (step_a * step_a) & mask,
+            (step_c * step_a + step_c) & mask,
+        )
+    return (a[:n] * np.uint64(seed & mask) + c[:n]) & np.uint64(mask)
+
+
+def lcg_jump(n: int) -> Tuple[int, int]:
+    """Compute the coefficients of `n` steps of the Gen. 3 LCG at once.
+
+    Advancing a seed by `n` steps is the same as `(a * seed + c) & 0xFFFFFFFF`,
+    which takes O(log n) time to set up instead of O(n) to iterate.
+
+    Args:
+        n: Number of steps, non-negative.
+
+    Returns:
+        The tuple `(a, c)`.
+    """
+    return _affine_jump(n, GEN3_MULTIPLIER, GEN3_INCREMENT, _MASK_32)
+
+
+def lcg_seeds(seed: int, n: int, stride: int = 1) -> np.ndarray:
+    """Compute `n` seeds of the Gen. 3 LCG, `stride` steps apart.
+
+    The first seed is `seed` itself, the k-th one is `seed` advanced by
+    `k * stride` steps. Every seed is computed independently by
+    jump-ahead, so no Python-level loop runs over `n`.
+
+    Args:
+        seed: The starting seed.
+        n: Number of seeds to compute.
+        stride: Number of steps between two consecutive seeds.
+
+    Returns:
+        A `uint32` array of seeds.
+    """
+    step_a, step_c = lcg_jump(stride)
+    return _affine_seeds(seed, n, step_a, step_c, _MASK_32).astype(np.uint32)
+
+
+def lcg_outputs(seeds: np.ndarray, n: int) -> np.ndarray:
+    """Advance every seed `n` times and collect the 16-bit outputs.
+
+    Args:
+        seeds: An array of Gen. 3 LCG seeds.
+        n: Number of outputs to draw from each seed.
+
+    Returns:
+        A `uint16` array of shape `seeds.shape + (n,)`.
+    """
+    state = np.asarray(seeds, dtype=np.uint64)
+    outputs = np.empty(state.shape + (n,), dtype=np.uint16)
+    mask = np.uint64(_MASK_32)
+    for i in range(n):
+        state = (state * np.uint64(GEN3_MULTIPLIER) + np.uint64(GEN3_INCREMENT)) & mask
+        outputs[..., i] = state >> 16
+    return outputs
+
+
+def lcg64_jump(n: int) -> Tuple[int, int]:
+    """Compute the coefficients of `n` steps of the Gen. 5 LCG at once.
+
+    Args:
+        n: Number of steps, non-negative.
+
+    Returns:
+        The tuple `(a, c)`, such that the seed advanced by `n` steps is
+        `(a * seed + c) & 0xFFFFFFFFFFFFFFFF`.
+    """
+    return _affine_jump(n, GEN5_MULTIPLIER, GEN5_INCREMENT, _MASK_64)
+
+
+def lcg64_seeds(seed: int, n: int, stride: int = 1) -> np.ndarray:
+    """Compute `n` seeds of the Gen. 5 LCG, `stride` steps apart.
+
+    Like `lcg_seeds`, for the 64-bit LCG.
+
+    Args:
+        seed: The starting seed.
+        n: Number of seeds to compute.
+        stride: Number of steps between two consecutive seeds.
+
+    Returns:
+        A `uint64` array of seeds.
+    """
+    step_a, step_c = lcg64_jump(stride)
+    return _affine_seeds(seed, n, step_a, step_c, _MASK_64)
+
+
+def lcg64_outputs(seeds: np.ndarray, n: int) -> np.ndarray:
+    """Advance every Gen. 5 seed `n` times and collect the 32-bit outputs.
+
+    Args:
+        seeds: An array of Gen. 5 LCG seeds.
+        n: Number of outputs to draw from each seed.
+
+    Returns:
+        A `uint32` array of shape `seeds.shape + (n,)`.
+    """
+    state = np.asarray(seeds, dtype=np.uint64)
+    outputs = np.empty(state.shape + (n,), dtype=np.uint32)
+    for i in range(n):
+        state = state * np.uint64(GEN5_MULTIPLIER) + np.uint64(GEN5_INCREMENT)
+        outputs[..., i] = state >> np.uint64(32)
+    return outputs
+
+
+def mt_init(seeds: np.ndarray) -> np.ndarray:
+    """Initialize the MT19937 states of 32-bit seeds.
+
+    Args:
+        seeds: An array of seeds.
+
+    Returns:
+        A `uint32` array of shape `seeds.shape + (624,)`.
+    """
+    previous = np.asarray(seeds, dtype=np.uint64) & np.uint64(_MASK_32)
+    states = np.empty(previous.shape + (MT_SIZE,), dtype=np.uint32)
+    states[..., 0] = previous
+    for i in range(1, MT_SIZE):
+        previous = (
+            np.uint64(_MT_INIT_MULTIPLIER) * (previous ^ (previous >> np.uint64(30)))
+            + np.uint64(i)
+        ) & np.uint64(_MASK_32)
+        states[..., i] = previous
+    return states
+
+
+def _mt_mix(upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    y = (upper & np.uint32(_MT_UPPER)) | (lower & np.uint32(_MT_LOWER))
+    return (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * np.uint32(_MT_MATRIX))
+
+
+def mt_twist(states: np.ndarray) -> np.ndarray:
+    """Generate the next 624 words of MT19937 states.
+
+    Word `i` of the new state depends on word `i + 397` of the new state
+    when `i + 397` wraps around, so the words are computed in three
+    vectorized slices instead of one by one.
+
+    Args:
+        states: A `uint32` array of shape `(..., 624)`.
+
+    Returns:
+        The twisted states, as a new array.
+    """
+    mixed = _mt_mix(states[..., :-1], states[..., 1:])
+    new = np.empty_like(states)
+    k = MT_SIZE - _MT_SHIFT  # 227
+    new[..., :k] = states[..., _MT_SHIFT:] ^ mixed[..., :k]
+    new[..., k : 2 * k] = new[..., :k] ^ mixed[..., k : 2 * k]
+    new[..., 2 * k : -1] = new[..., k : _MT_SHIFT - 1] ^ mixed[..., 2 * k :]
+    new[..., -1] = new[..., _MT_SHIFT - 1] ^ _mt_mix(states[..., -1], new[..., 0])
+    return new
+
+
+def mt_temper(words: np.ndarray) -> np.ndarray:
+    """Turn MT19937 state words into outputs.
+
+    Args:
+        words: A `uint32` array.
+
+    Returns:
+        A `uint32` array of the same shape.
+    """
+    y = np.asarray(words, dtype=np.uint32)
+    y = y ^ (y >> np.uint32(11))
+    y = y ^ ((y << np.uint32(7)) & np.uint32(0x9D2C5680))
+    y = y ^ ((y << np.uint32(15)) & np.uint32(0xEFC60000))
+    return y ^ (y >> np.uint32(18))
+
+
+def mt_outputs(seeds: np.ndarray, n: int, skip: int = 0) -> np.ndarray:
+    """Draw outputs `skip` to `skip + n - 1` of MT19937 for every seed.
+
+    Seeds are processed in chunks, so memory stays bounded whatever the
+    number of seeds.
+
+    Args:
+        seeds: An array of 32-bit seeds.
+        n: Number of outputs per seed.
+        skip: Number of outputs to skip first, e.g. the frame to start at.
+
+    Returns:
+        A `uint32` array of shape `seeds.shape + (n,)`.
+    """
+    seeds = np.asarray(seeds)
+    flat = seeds.reshape(-1)
+    outputs = np.empty((len(flat), n), dtype=np.uint32)
+    first_block, offset = divmod(skip, MT_SIZE)
+    blocks = -(-(offset + n) // MT_SIZE)
+    for start in range(0, len(flat), _MT_CHUNK):
+        states = mt_init(flat[start : start + _MT_CHUNK])
+        for _ in range(first_block):
+            states = mt_twist(states)
+        twisted = []
+        for _ in range(blocks):
+            states = mt_twist(states)
+            twisted.append(states)
+        words = np.concatenate(twisted, axis=-1)[:, offset : offset + n]
+        outputs[start : start + _MT_CHUNK] = mt_temper(words)
+    return outputs.reshape(seeds.shape + (n,))
 
 
 @attr.s(slots=True, auto_attribs=True, cmp=False)
 class PRNG:
     """A linear congruential random number generator.
 
+    Gen. 3 and 4 use the 32-bit LCG and draw 16-bit numbers; Gen. 5 uses
+    the 64-bit LCG and draws 32-bit numbers. Other generations are not
+    supported yet.
+
     Usage:
         >>> prng = PRNG()
         >>> prng()
         0
         >>> prng()
         59774
+        >>> prng = PRNG(gen=5)
+        >>> prng(), prng()
+        (0, 1904791564)
 
     References:
         https://bulbapedia.bulbagarden.net/wiki/Pseudorandom_number_generation_in_Pokémon
@@ -31,10 +297,14 @@ class PRNG:
         self._initial_seed = self.seed
 
     def _generator(self: P) -> Generator:
-        if self._gen == 3:
+        if self._gen in (3, 4):
             while True:
-                self.seed = (0x41C64E6D * self.seed + 0x6073) & 0xFFFFFFFF
+                self.seed = (GEN3_MULTIPLIER * self.seed + GEN3_INCREMENT) & _MASK_32
                 yield self.seed >> 16
+        elif self._gen == 5:
+            while True:
+                self.seed = (GEN5_MULTIPLIER * self.seed + GEN5_INCREMENT) & _MASK_64
+                yield self.seed >> 32
         else:
             raise ValueError(f"Gen. {self._gen} PRNG is not supported yet.")
 
@@ -54,6 +324,50 @@ class PRNG:
         """Generate the next n random numbers."""
         return [self() for _ in range(n)]
 
+    def next_array(self: P, n: int) -> np.ndarray:
+        """Generate the next n random numbers as a NumPy array.
+
+        Same numbers as `next_`, computed without a Python-level loop.
+
+        Args:
+            n: How many numbers to generate.
+
+        Raises:
+            ValueError: if the generation has no vectorized generator.
+
+        Returns:
+            A `uint16` array, or a `uint32` array in Gen. 5.
+        """
+        self._check_vectorized()
+        if self._gen == 5:
+            seeds = lcg64_seeds(self.seed, n + 1)
+            self.seed = int(seeds[-1])
+            return (seeds[1:] >> np.uint64(32)).astype(np.uint32)
+        seeds = lcg_seeds(self.seed, n + 1)
+        self.seed = int(seeds[-1])
+        return (seeds[1:] >> 16).astype(np.uint16)
+
+    def jump(self: P, n: int) -> None:
+        """Skip the next n random numbers in O(log n) time.
+
+        Args:
+            n: How many numbers to skip.
+
+        Raises:
+            ValueError: if the generation has no jump-ahead.
+        """
+        self._check_vectorized()
+        if self._gen == 5:
+            a, c = lcg64_jump(n)
+            self.seed = (a * self.seed + c) & _MASK_64
+        else:
+            a, c = lcg_jump(n)
+            self.seed = (a * self.seed + c) & _MASK_32
+
+    def _check_vectorized(self: P) -> None:
+        if self._gen not in (3, 4, 5):
+            raise ValueError(f"Gen. {self._gen} PRNG is not supported yet.")
+
     def generate_pid_and_iv(self: P, method: int = 2) -> Tuple[int, int]:
         """Generate the PID and IVs using the internal generator.
 
@@ -80,11 +394,14 @@ class PRNG:
             method: 1, 2, or 4.
 
         Raises:
-            ValueError: if the method is not in (1, 2, 4).
+            ValueError: if the method is not in (1, 2, 4), or in Gen. 5,
+                which does not use these methods.
 
         Returns:
             a tuple of two integers, in the order of 'PID' and 'IVs'.
         """
+        if self._gen == 5:
+            raise ValueError("Gen. 5 does not generate PIDs and IVs with methods 1, 2 and 4.")
         if method not in (1, 2, 4):
             raise ValueError(
                 "Only methods 1, 2, 4 are supported. For more information on "
@@ -128,4 +445,89 @@ class PRNG:
         Returns:
             A random number between 0 and 1.
         """
+        if self._gen == 5:
+            return self() / 0x100000000
         return self() / 0x10000
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class MersenneTwister:
+    """The MT19937 generator of Gen. 4 egg PIDs and Gen. 5 IVs.
+
+    It has the interface of `PRNG`, and draws 32-bit numbers. The state is
+    twisted 624 words at a time with NumPy, so `next_array` and `jump`
+    cost one vectorized twist per 624 numbers.
+
+    Usage:
+        >>> mt = MersenneTwister(5489)
+        >>> mt()
+        3499211612
+        >>> mt.jump(9998)
+        >>> mt()
+        4123659995
+    """
+
+    seed: int = attr.ib(validator=attr.validators.instance_of(int), default=0)
+    _state: np.ndarray = attr.ib(init=False, repr=False)
+    _index: int = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self: M) -> None:
+        """Initialize the state from the seed."""
+        self.reset()
+
+    def reset(self: M) -> None:
+        """Reset the generator with the initial seed."""
+        self._state = mt_init(np.array(self.seed & _MASK_32))
+        self._index = MT_SIZE
+
+    def __call__(self: M) -> int:
+        """Move to the next random number."""
+        if self._index >= MT_SIZE:
+            self._state = mt_twist(self._state)
+            self._index = 0
+        word = self._state[self._index]
+        self._index += 1
+        return int(mt_temper(word))
+
+    def next_(self: M, n: int) -> List[int]:
+        """Generate the next n random numbers."""
+        return self.next_array(n).tolist()
+
+    def next_array(self: M, n: int) -> np.ndarray:
+        """Generate the next n random numbers as a NumPy array.
+
+        Args:
+            n: How many numbers to generate.
+
+        Returns:
+            A `uint32` array.
+        """
+        words = [self._state[self._index :]]
+        available = MT_SIZE - self._index
+        while available < n:
+            self._state = mt_twist(self._state)
+            words.append(self._state)
+            available += MT_SIZE
+        self._index = MT_SIZE - (available - n)
+        return mt_temper(np.concatenate(words)[:n])
+
+    def jump(self: M, n: int) -> None:
+        """Skip the next n random numbers, one twist per 624 numbers.
+
+        Args:
+            n: How many numbers to skip.
+        """
+        blocks, self._index = divmod(self._index + n, MT_SIZE)
+        if self._index == 0 and blocks:
+            # Twist lazily, on the next draw.
+            blocks, self._index = blocks - 1, MT_SIZE
+        for _ in range(blocks):
+            self._state = mt_twist(self._state)
+
+    def random(self: M) -> float:
+        """Generate a random number from the uniform distribution [0, 1).
+
+        Returns:
+            A random number between 0 and 1.
+        """
+        return self() / 0x100000000
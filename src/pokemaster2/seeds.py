@@ -0,0 +1,297 @@
+"""Search Gen. 4 initial seeds for a target Pokémon.
+
+Diamond, Pearl and Platinum seed the PRNG when the game starts, from the
+date and time of the DS clock and the delay (the number of frames before
+the player presses "Continue"):
+
+    seed = ((month * day + minute + second) % 256) << 24
+           + hour << 16
+           + delay + year - 2000
+
+Millions of (date, time, delay) combinations share far fewer seeds: the
+date, minute and second only matter through the top byte `AB`. A search
+therefore evaluates the grid of `AB x hour x delay` seeds, each one once,
+and maps the hits back to the dates and times that produce them.
+
+Each seed is advanced through a range of frames with Method 1:
+
+    frame:  [PID] [PID] [IVs] [IVs]
+
+Chunks of delays are searched with NumPy, optionally in worker processes,
+and the hits of every chunk are yielded as soon as it is done, best first.
+"""
+import concurrent.futures
+import datetime
+import heapq
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+import attr
+import numpy as np
+
+from pokemaster2 import personality
+from pokemaster2.pokemon import NATURES, STAT_NAMES, Stats
+from pokemaster2.prng import lcg_outputs
+
+H = TypeVar("H", bound="SeedHit")
+
+# Random numbers drawn by a Method 1 frame.
+_CALLS_PER_FRAME = 4
+# The sum `minute + second` ranges over 0..118.
+_MINUTE_SECOND_SUMS = np.arange(119)
+
+
+def initial_seeds(
+    year: int,
+    month: np.ndarray,
+    day: np.ndarray,
+    hour: np.ndarray,
+    minute: np.ndarray,
+    second: np.ndarray,
+    delay: np.ndarray,
+) -> np.ndarray:
+    """Compute the initial seeds of dates, times and delays.
+
+    All arguments but `year` broadcast against each other.
+
+    Args:
+        year: The year of the DS clock, e.g. 2008.
+        month: 1 to 12.
+        day: 1 to 31.
+        hour: 0 to 23.
+        minute: 0 to 59.
+        second: 0 to 59.
+        delay: The number of frames before the game was continued.
+
+    Returns:
+        A `uint32` array of seeds.
+    """
+    ab = (np.asarray(month) * np.asarray(day) + np.asarray(minute) + np.asarray(second)) % 256
+    return _seeds(year, ab, hour, delay)
+
+
+def _seeds(year: int, ab: np.ndarray, hour: np.ndarray, delay: np.ndarray) -> np.ndarray:
+    """The seed formula, from the top byte `AB` instead of the date and time."""
+    seeds = (
+        (np.asarray(ab, dtype=np.uint64) << np.uint64(24))
+        + (np.asarray(hour, dtype=np.uint64) << np.uint64(16))
+        + (np.asarray(delay) + year - 2000).astype(np.uint64)
+    )
+    return (seeds & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def _dates(year: int) -> List[datetime.date]:
+    first = datetime.date(year, 1, 1)
+    return [
+        first + datetime.timedelta(days)
+        for days in range((datetime.date(year + 1, 1, 1) - first).days)
+    ]
+
+
+def _top_bytes(dates: Sequence[datetime.date]) -> np.ndarray:
+    """The `AB` bytes reachable on some dates, at any minute and second."""
+    products = np.array([date.month * date.day for date in dates])
+    return np.unique((products[:, np.newaxis] + _MINUTE_SECOND_SUMS) % 256)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SeedHit:
+    """An initial seed and frame producing the target Pokémon.
+
+    Attributes:
+        seed: The initial seed.
+        year: The year of the DS clock.
+        hour: The hour to continue the game at.
+        delay: The delay to continue the game with.
+        frame: The frame of the Pokémon, 1 being the first after the seed.
+        pid: The personality value.
+        gene: The IV number, see `Stats.create_iv`.
+    """
+
+    seed: int
+    year: int
+    hour: int
+    delay: int
+    frame: int
+    pid: int
+    gene: int
+
+    @property
+    def ivs(self: H) -> Stats:
+        """The IVs of the Pokémon."""
+        return Stats.create_iv(self.gene)
+
+    @property
+    def nature(self: H) -> str:
+        """The nature of the Pokémon."""
+        return NATURES[self.pid % 25]
+
+    @property
+    def rank(self: H) -> Tuple[int, int, int, int]:
+        """Sort key of hits: higher IVs first, then the easiest to hit."""
+        ivs = self.ivs
+        total = sum(getattr(ivs, stat) for stat in STAT_NAMES)
+        return -total, self.frame, self.delay, self.hour
+
+    def times(
+        self: H, dates: Optional[Iterable[datetime.date]] = None
+    ) -> Iterator[datetime.datetime]:
+        """Find the dates and times that produce the seed of this hit.
+
+        Args:
+            dates: The dates to consider. All the dates of `year` if
+                omitted.
+
+        Yields:
+            `datetime.datetime` instances, in chronological order.
+        """
+        low = (self.hour << 16) + self.delay + self.year - 2000
+        ab = ((self.seed - low) & 0xFFFFFFFF) >> 24
+        for date in _dates(self.year) if dates is None else dates:
+            for total in range((ab - date.month * date.day) % 256, 119, 256):
+                for minute in range(max(0, total - 59), min(59, total) + 1):
+                    yield datetime.datetime(
+                        date.year, date.month, date.day, self.hour, minute, total - minute
+                    )
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class _Job:
+    """A chunk of the search, cheap to send to workers."""
+
+    year: int
+    top_bytes: np.ndarray
+    hours: np.ndarray
+    delays: np.ndarray
+    frames: int
+    min_ivs: np.ndarray
+    max_ivs: np.ndarray
+    natures: np.ndarray
+    tid: Optional[int]
+    sid: int
+
+
+def _iv_bounds(ivs: Optional[Stats], default: int) -> np.ndarray:
+    if ivs is None:
+        return np.full(6, default, dtype=np.uint8)
+    return np.array([getattr(ivs, stat) for stat in STAT_NAMES], dtype=np.uint8)
+
+
+def search(
+    year: int,
+    delays: Iterable[int],
+    frames: int = 1,
+    min_ivs: Optional[Stats] = None,
+    max_ivs: Optional[Stats] = None,
+    natures: Optional[Sequence[str]] = None,
+    tid: Optional[int] = None,
+    sid: int = 0,
+    hours: Iterable[int] = range(24),
+    dates: Optional[Sequence[datetime.date]] = None,
+    workers: int = 1,
+    chunk_size: int = 64,
+) -> Iterator[SeedHit]:
+    """Search the initial seeds producing a Pokémon.
+
+    Args:
+        year: The year of the DS clock.
+        delays: The delays to consider.
+        frames: Search frames 1 to `frames` of every seed.
+        min_ivs: Minimum IVs; 0 for all stats if omitted.
+        max_ivs: Maximum IVs; 31 for all stats if omitted.
+        natures: Accepted natures, e.g. `["adamant", "jolly"]`. All if
+            omitted.
+        tid: Trainer ID. If given, only shiny Pokémon are hits.
+        sid: Secret ID, for shininess.
+        hours: The hours to consider.
+        dates: The dates to consider. All the dates of `year` if omitted.
+        workers: Number of worker processes. 1 runs in this process.
+        chunk_size: Number of delays per unit of work. Has no effect on
+            the hits.
+
+    Yields:
+        `SeedHit` instances. The hits of a chunk of delays are yielded
+        best first (see `SeedHit.rank`), chunks in the order of `delays`.
+    """
+    nature_mask = np.ones(len(NATURES), dtype=bool)
+    if natures is not None:
+        nature_mask[:] = False
+        nature_mask[[NATURES.index(nature) for nature in natures]] = True
+    delays = np.asarray(sorted(set(delays)), dtype=np.int64)
+    jobs = [
+        _Job(
+            year=year,
+            top_bytes=_top_bytes(_dates(year) if dates is None else dates),
+            hours=np.asarray(sorted(set(hours)), dtype=np.int64),
+            delays=delays[start : start + chunk_size],
+            frames=frames,
+            min_ivs=_iv_bounds(min_ivs, 0),
+            max_ivs=_iv_bounds(max_ivs, 31),
+            natures=nature_mask,
+            tid=tid,
+            sid=sid,
+        )
+        for start in range(0, len(delays), chunk_size)
+    ]
+    if workers == 1:
+        for hits in map(_search_chunk, jobs):
+            yield from hits
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for hits in executor.map(_search_chunk, jobs):
+                yield from hits
+
+
+def best(hits: Iterable[SeedHit], n: int = 10) -> List[SeedHit]:
+    """Keep the best hits of a search.
+
+    Args:
+        hits: e.g. the iterator returned by `search`.
+        n: Number of hits to keep.
+
+    Returns:
+        A list of at most `n` hits, best first.
+    """
+    return heapq.nsmallest(n, hits, key=lambda hit: hit.rank)
+
+
+def _search_chunk(job: _Job) -> List[SeedHit]:
+    """Evaluate every seed and frame of a chunk of delays."""
+    top_bytes, hours, delays = np.meshgrid(job.top_bytes, job.hours, job.delays, indexing="ij")
+    seeds = _seeds(job.year, top_bytes, hours, delays).ravel()
+    hours, delays = hours.ravel(), delays.ravel()
+
+    draws = lcg_outputs(seeds, job.frames + _CALLS_PER_FRAME - 1).astype(np.uint32)
+    frames = job.frames
+    genes = (draws[:, 2 : frames + 2] | draws[:, 3 : frames + 3] << 16).ravel()
+
+    # Narrow the candidates one criterion at a time, so that the later
+    # criteria only look at the survivors of the earlier ones.
+    candidates = np.arange(genes.size)
+    offsets = personality.IV_OFFSETS
+    for offset, low, high in zip(offsets, job.min_ivs.tolist(), job.max_ivs.tolist()):
+        if low > 0 or high < 31:
+            ivs = genes[candidates] >> offset & np.uint32(31)
+            candidates = candidates[(ivs >= low) & (ivs <= high)]
+    rows, columns = np.divmod(candidates, frames)
+    pids = draws[rows, columns] | draws[rows, columns + 1] << 16
+    found = job.natures[personality.natures(pids)]
+    if job.tid is not None:
+        found &= personality.shiny_flags(pids, job.tid, job.sid)
+    candidates, rows, columns, pids = candidates[found], rows[found], columns[found], pids[found]
+
+    hits = [
+        SeedHit(
+            seed=int(seeds[row]),
+            year=job.year,
+            hour=int(hours[row]),
+            delay=int(delays[row]),
+            frame=int(column) + 1,
+            pid=pid,
+            gene=int(genes[candidate]),
+        )
+        for candidate, row, column, pid in zip(
+            candidates.tolist(), rows.tolist(), columns.tolist(), pids.tolist()
+        )
+    ]
+    hits.sort(key=lambda hit: hit.rank)
+    return hits
@@ -20,9 +20,12 @@ COVERAGE_DIR = ROOT_DIR.joinpath("htmlcov")
 COVERAGE_REPORT = COVERAGE_DIR.joinpath("index.html")
 SOURCE_DIR = ROOT_DIR.joinpath("src/pokemaster2")
 TEST_DIR = ROOT_DIR.joinpath("tests")
+BENCH_DIR = ROOT_DIR.joinpath("benchmarks")
+BENCH_STORAGE = ROOT_DIR.joinpath(".benchmarks")
 PYTHON_TARGETS = [
     SOURCE_DIR,
     TEST_DIR,
+    BENCH_DIR,
     ROOT_DIR.joinpath("noxfile.py"),
     Path(__file__),
 ]
@@ -148,6 +151,42 @@ def tests(c, quiet=False, disable_warnings=True):
     )
 
 
+@task(
+    help={
+        "save": "Save the results as a JSON baseline under this name.",
+        "benchmark_filter": "Only run benchmarks matching this expression (pytest -k).",
+    }
+)
+def bench(c, save="", benchmark_filter=""):
+    # type: (Context, str, str) -> None
+    """Run benchmarks."""
+    pytest_options = ["--benchmark-only", f"--benchmark-storage=file://{BENCH_STORAGE}"]
+    if save:
+        pytest_options.append(f"--benchmark-save={save}")
+    if benchmark_filter:
+        pytest_options.append(f"-k '{benchmark_filter}'")
+    _run(c, f"poetry run pytest {' '.join(pytest_options)} {BENCH_DIR}")
+
+
+@task(
+    help={
+        "baseline": "Saved baseline to compare against: its number or id. Defaults to the latest.",
+        "threshold": "Fail if a benchmark's median is this many percent slower.",
+    }
+)
+def bench_compare(c, baseline="", threshold=10):
+    # type: (Context, str, int) -> None
+    """Run benchmarks and flag regressions against a saved baseline."""
+    compare = f"--benchmark-compare={baseline}" if baseline else "--benchmark-compare"
+    pytest_options = [
+        "--benchmark-only",
+        f"--benchmark-storage=file://{BENCH_STORAGE}",
+        compare,
+        f"--benchmark-compare-fail=median:{threshold}%",
+    ]
+    _run(c, f"poetry run pytest {' '.join(pytest_options)} {BENCH_DIR}")
+
+
 @task(
     help={
         "fmt": "Build a local report: report, html, json, annotate, html, xml.",
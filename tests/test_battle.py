@@ -0,0 +1,183 @@
+"""Tests for `pokemaster2.battle`."""
+import numpy as np
+import pytest
+
+from pokemaster2 import battle, damage
+from pokemaster2.battle import Battles, MoveTable, Team
+from pokemaster2.db.arrays import TypeChart
+from pokemaster2.pokemon import STAT_NAMES, BasePokemon, Stats
+
+NORMAL, FIRE, WATER, GRASS = 1, 2, 3, 4
+CHART = TypeChart.from_rows(
+    [[FIRE, GRASS, 200], [FIRE, WATER, 50], [WATER, FIRE, 200], [GRASS, WATER, 200]],
+    identifiers=("", "normal", "fire", "water", "grass"),
+)
+TACKLE, EMBER, SPLASH, WILL_O_WISP, SWORDS_DANCE, SPORE = 1, 2, 3, 4, 5, 6
+MOVES = MoveTable.create(
+    ids=[TACKLE, EMBER, SPLASH, WILL_O_WISP, SWORDS_DANCE, SPORE],
+    power=[40, 40, 0, 0, 0, 0],
+    type_id=[NORMAL, FIRE, NORMAL, FIRE, NORMAL, GRASS],
+    damage_class=[damage.PHYSICAL, damage.SPECIAL, 1, 1, 1, 1],
+    accuracy=[100, 100, 0, 0, 0, 0],
+    ailment=[battle.HEALTHY, battle.BURNED, 0, battle.BURNED, 0, battle.ASLEEP],
+    stage=[-1, -1, -1, -1, battle.ATK, -1],
+    stage_change=[0, 0, 0, 0, 2, 0],
+    stage_self=[False, False, False, False, True, False],
+    effect_chance=[0, 10, 0, 100, 100, 100],
+)
+
+
+def _team(stats, moves, types=(NORMAL, 0), size=1):
+    """A team of `size` identical level 50 Pokémon."""
+    known = np.zeros(battle.MOVES_PER_POKEMON, dtype=np.int32)
+    known[: len(moves)] = moves
+    return Team(
+        stats=np.array([stats] * size + [[0] * 6] * (battle.TEAM_SIZE - size), dtype=np.int32),
+        levels=np.full(battle.TEAM_SIZE, 50, dtype=np.int32),
+        types=np.array([types] * battle.TEAM_SIZE, dtype=np.int32),
+        moves=np.array([known] * battle.TEAM_SIZE, dtype=np.int32),
+    )
+
+
+def test_move_table_pads_missing_ids():
+    """Ids missing from the table are empty move slots."""
+    table = MoveTable.create(ids=[2, 5], power=[40, 90], type_id=3, damage_class=2)
+    assert [0, 0, 40, 0, 0, 90] == table.power.tolist()
+    assert [0, 0, 3, 0, 0, 3] == table.type_id.tolist()
+    assert [-1] * 6 == table.stage.tolist()
+
+
+def test_team_from_pokemon():
+    """Teams take the stats, levels and types of Pokémon."""
+    pokemon = BasePokemon(
+        national_id=4,
+        species="charmander",
+        types=["fire"],
+        item_held=None,
+        exp=0,
+        level=10,
+        base_stats=Stats(39, 52, 43, 60, 50, 65),
+        iv=Stats(31, 31, 31, 31, 31, 31),
+        current_stats=Stats.zeros(),
+        ev=Stats.zeros(),
+        pid=0,
+        gender="male",
+        nature="hardy",
+        ability="blaze",
+    )
+    team = Team.from_pokemon([pokemon], [[EMBER, TACKLE]], CHART)
+    assert [getattr(pokemon.stats, stat) for stat in STAT_NAMES] == team.stats[0].tolist()
+    assert [0] * 6 == team.stats[1].tolist()
+    assert [10, 1] == team.levels[:2].tolist()
+    assert [FIRE, 0] == team.types[0].tolist()
+    assert [EMBER, TACKLE, 0, 0] == team.moves[0].tolist()
+    with pytest.raises(ValueError):
+        Team.from_pokemon([pokemon], [[TACKLE] * 5], CHART)
+    with pytest.raises(ValueError):
+        Team.from_pokemon([pokemon] * 7, [[TACKLE]] * 7, CHART)
+    with pytest.raises(ValueError, match="moves for 1 of 2"):
+        Team.from_pokemon([pokemon] * 2, [[TACKLE]], CHART)
+
+
+def test_stronger_team_wins():
+    """A much stronger team always wins, without losing a Pokémon."""
+    strong = _team([300, 300, 300, 300, 300, 300], [TACKLE], size=3)
+    weak = _team([50, 20, 20, 20, 20, 20], [TACKLE], size=3)
+    result = battle.run([strong, weak], [[0, 1], [1, 0]] * 50, MOVES, CHART)
+    assert [0, 1] * 50 == result.winners.tolist()
+    assert [50, 50, 0] == result.wins.tolist()
+    assert [3, 0] * 50 == result.survivors[::2].ravel().tolist()
+    assert (result.turns >= 3).all()
+
+
+def test_greedy_policy_picks_the_most_damaging_move():
+    """Ember is super effective on grass, so the greedy policy picks it."""
+    attacker = _team([100] * 6, [TACKLE, SPLASH, EMBER])
+    defender = _team([1000] * 6, [SPLASH], types=(GRASS, 0))
+    battles = Battles.create([attacker, defender], [[0, 1]], battle.battle_seeds(0, 1))
+    chosen = battles._choose(MOVES, CHART, "greedy", np.zeros((1, 2), dtype=np.int32))
+    assert [[EMBER, SPLASH]] == chosen.tolist()
+
+
+def test_statuses_and_stages():
+    """Moves inflict statuses and change stat stages."""
+    burner = _team([100] * 6, [WILL_O_WISP])
+    dancer = _team([100] * 6, [SWORDS_DANCE])
+    battles = Battles.create([burner, dancer], [[0, 1]], battle.battle_seeds(0, 1))
+    battles.step(MOVES, CHART)
+    assert [battle.HEALTHY, battle.BURNED] == battles.status[0].tolist()
+    # Burned Pokémon lose 1/8 of their HP at the end of the turn.
+    assert [100, 88] == battles.hp[0].tolist()
+    assert [0, 2] == battles.stages[0, :, battle.ATK].tolist()
+    for _ in range(3):
+        battles.step(MOVES, CHART)
+    assert [0, battle.MAX_STAGE] == battles.stages[0, :, battle.ATK].tolist()
+    assert [100, 52] == battles.hp[0].tolist()
+
+
+def test_sleep_wears_off():
+    """Asleep Pokémon skip 1 to 4 of their turns, then wake up and move."""
+    sleeper = _team([100] * 6, [SPORE])
+    dancer = _team([100] * 6, [SWORDS_DANCE])
+    battles = Battles.create([sleeper, dancer], [[0, 1]] * 100, battle.battle_seeds(1, 100))
+    battles.step(MOVES, CHART)
+    assert (battles.status[:, 1] == battle.ASLEEP).all()
+    # Speed ties are random: a dancer moving first already used its turn.
+    moved = battles.stages[:, 1, battle.ATK] == 2
+    assert 0 < moved.sum() < 100
+    assert {1, 2, 3, 4} == set(battles.sleep[moved, 1].tolist())
+    assert {0, 1, 2, 3} == set(battles.sleep[~moved, 1].tolist())
+
+    waking = battles.sleep[:, 1] == 0
+    stages = battles.stages[:, 1, battle.ATK].copy()
+    battles.step(MOVES, CHART)
+    assert (battles.stages[waking, 1, battle.ATK] == stages[waking] + 2).all()
+    assert (battles.stages[~waking, 1, battle.ATK] == stages[~waking]).all()
+
+
+def test_draws_after_max_turns():
+    """Battles nobody can win end in a draw."""
+    splasher = _team([100] * 6, [SPLASH])
+    result = battle.run([splasher], [[0, 0]] * 10, MOVES, CHART, max_turns=20)
+    assert [battle.DRAW] * 10 == result.winners.tolist()
+    assert [20] * 10 == result.turns.tolist()
+    assert [[1, 1]] * 10 == result.survivors.tolist()
+
+
+@pytest.mark.parametrize("policy", battle.POLICIES)
+def test_results_do_not_depend_on_chunks_or_workers(policy):
+    """Every battle draws from its own PRNG substream."""
+    rng = np.random.default_rng(3)
+    teams = [
+        _team(rng.integers(40, 120, 6), rng.choice([TACKLE, EMBER, WILL_O_WISP], 3), size=3)
+        for _ in range(5)
+    ]
+    matchups = rng.integers(0, 5, (300, 2))
+    kwargs = dict(seed=42, policy=policy)
+    single = battle.run(teams, matchups, MOVES, CHART, **kwargs)
+    chunked = battle.run(teams, matchups, MOVES, CHART, chunk_size=7, workers=2, **kwargs)
+    for name in ("winners", "turns", "survivors"):
+        np.testing.assert_array_equal(getattr(single, name), getattr(chunked, name))
+    # Not every battle ends the same way.
+    assert len(set(single.turns.tolist())) > 1
+
+    seeds = battle.battle_seeds(42, len(matchups))
+    alone = battle.simulate(
+        Battles.create(teams, matchups[123:124], seeds[123:124]), MOVES, CHART, policy=policy
+    )
+    assert single.winners[123] == alone.winners.item()
+    assert single.turns[123] == alone.turns.item()
+
+
+def test_unknown_policy():
+    """Policies are checked."""
+    team = _team([100] * 6, [TACKLE])
+    with pytest.raises(ValueError):
+        battle.run([team], [[0, 0]], MOVES, CHART, policy="smart")
+
+
+def test_battle_seeds_stay_in_the_period():
+    """Battles never share random numbers."""
+    assert 1 << 16 == len(battle.battle_seeds(0, 1 << 16, max_turns=1))
+    with pytest.raises(ValueError):
+        battle.battle_seeds(0, 1 << 32, max_turns=1)
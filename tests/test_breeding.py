@@ -0,0 +1,68 @@
+"""Tests for `pokemaster2.breeding` module."""
+import numpy as np
+
+from pokemaster2 import breeding, personality
+from pokemaster2.db.arrays import SpeciesArrays
+from pokemaster2.prng import PRNG
+
+# 172 pichu -> 25 pikachu -> 26 raichu, 132 ditto, 1 bulbasaur.
+SPECIES = SpeciesArrays.from_rows(
+    [
+        [1, 1, 45, 20, 0, 0],
+        [25, 4, 190, 10, 0, 172],
+        [26, 4, 75, 10, 0, 25],
+        [132, -1, 35, 20, 0, 0],
+        [172, 4, 190, 10, 1, 0],
+    ]
+)
+ALL_31 = 0x7FFF7FFF
+
+
+def test_baby_species():
+    """Every species resolves to the lowest stage of its family."""
+    assert [172, 172, 172, 1] == breeding.baby_species([26, 25, 172, 1], SPECIES).tolist()
+
+
+def test_breed_species_and_hatch_steps():
+    """Eggs belong to the mother's family, or the father's with Ditto."""
+    eggs = breeding.breed([26, 132, 1], [132, 1, 1], 0, 0, SPECIES, prng=PRNG(1))
+    assert [172, 1, 1] == eggs.species_ids.tolist()
+    assert [255 * 11, 255 * 21, 255 * 21] == eggs.steps_remaining.tolist()
+
+
+def test_breed_inherits_three_ivs():
+    """Exactly three IVs come from the parents, and the PRNG moves on."""
+    prng = PRNG(0x1234)
+    eggs = breeding.breed(1, 1, ALL_31, ALL_31, SPECIES, prng=prng)
+    expected = PRNG(0x1234)
+    pid_low, pid_high, iv_1, iv_2 = expected.next_(4)
+    assert pid_low | pid_high << 16 == eggs.pids[0]
+    random_ivs = personality.unpack_ivs(iv_1 | iv_2 << 16)
+    ivs = personality.unpack_ivs(eggs.genes[0])
+    inherited = ivs != random_ivs
+    assert (ivs[inherited] == 31).all()
+    assert 3 >= inherited.sum()
+    expected.next_(breeding.CALLS_PER_EGG - 4)
+    assert expected.seed == prng.seed
+
+
+def test_breed_is_reproducible_in_batches():
+    """Breeding one batch equals breeding its halves one after another."""
+    mothers = np.full(100, 1)
+    genes = np.arange(100, dtype=np.uint32) * 0x01010101
+    whole = breeding.breed(mothers, 132, genes, ALL_31, SPECIES, prng=PRNG(9))
+    prng = PRNG(9)
+    first = breeding.breed(mothers[:40], 132, genes[:40], ALL_31, SPECIES, prng=prng)
+    second = breeding.breed(mothers[40:], 132, genes[40:], ALL_31, SPECIES, prng=prng)
+    assert whole.genes.tolist() == first.genes.tolist() + second.genes.tolist()
+    assert whole.pids.tolist() == first.pids.tolist() + second.pids.tolist()
+
+
+def test_advance_hatches_eggs():
+    """Eggs hatch once they have walked their steps."""
+    eggs = breeding.breed([25, 1], 25, 0, 0, SPECIES)
+    assert [False, False] == eggs.advance(2800).tolist()
+    assert [True, False] == eggs.advance(10).tolist()
+    assert [False, True] == eggs.advance(1300, multiplier=2).tolist()
+    assert [False, False] == eggs.advance(10000).tolist()
+    assert eggs.hatched.all()
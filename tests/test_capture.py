@@ -0,0 +1,49 @@
+"""Tests for `pokemaster2.capture` module."""
+import numpy as np
+import pytest
+
+from pokemaster2 import capture
+from pokemaster2.prng import PRNG
+
+
+@pytest.mark.parametrize(
+    "capture_rate,hp,max_hp,ball,status,expected",
+    [
+        (255, 100, 100, "poke-ball", "none", 49931),
+        (45, 1, 100, "ultra-ball", "sleep", 61680),
+        (45, 1, 100, "ultra-ball", 30, 0x10000),
+        (3, 100, 100, "poke-ball", "none", 16643),
+        (3, 100, 100, "master-ball", "none", 0x10000),
+        (1, 100, 100, "poke-ball", "none", 0),
+    ],
+)
+def test_shake_threshold(capture_rate, hp, max_hp, ball, status, expected):
+    """Thresholds follow the Gen. 3 integer formula."""
+    assert expected == capture.shake_threshold(capture_rate, hp, max_hp, ball, status)
+
+
+def test_capture_probability():
+    """The probability is the chance of passing four shakes."""
+    assert (49931 / 0x10000) ** 4 == capture.capture_probability(255, 100, 100)
+    assert 1 == capture.capture_probability(3, 100, 100, "master-ball")
+
+
+def test_capture_table_matches_scalar():
+    """The array API agrees with the scalar API everywhere."""
+    rates = np.array([3, 45, 90, 190, 255])
+    balls = [capture.MASTER_BALL, 10, 15, 20]
+    table = capture.capture_table(rates, balls=balls, status=15)
+    assert (5, 100, 4) == table.shape
+    for i, rate in enumerate(rates):
+        for hp in range(1, 101):
+            for j, ball in enumerate(balls):
+                expected = capture.capture_probability(int(rate), hp, 100, ball, 15)
+                assert expected == pytest.approx(table[i, hp - 1, j], rel=1e-12)
+
+
+def test_simulate_capture():
+    """The Monte Carlo estimate is close to the exact probability."""
+    estimate = capture.simulate_capture(45, 30, 100, "great-ball", trials=50000, prng=PRNG(7))
+    assert capture.capture_probability(45, 30, 100, "great-ball") == pytest.approx(
+        estimate, abs=0.01
+    )
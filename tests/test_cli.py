@@ -1,4 +1,10 @@
 """Tests for `pokemaster2`.cli module."""
+import contextlib
+import json
+import os
+import sqlite3
+import subprocess  # noqa: S404
+import sys
 from typing import List
 
 import pytest
@@ -6,6 +12,7 @@ from click.testing import CliRunner
 
 import pokemaster2
 from pokemaster2 import cli
+from pokemaster2.db import tables
 
 
 @pytest.mark.parametrize(
@@ -23,3 +30,117 @@ def test_command_line_interface(options: List[str], expected: str) -> None:
     result = runner.invoke(cli.main, options)
     assert result.exit_code == 0
     assert expected in result.output
+
+
+# Cold `pokemaster2 --help` must import within this budget, in milliseconds.
+IMPORT_BUDGET_MS = int(os.environ.get("POKEMASTER2_IMPORT_BUDGET_MS", 300))
+HEAVY_MODULES = {"peewee", "loguru", "numpy", "csv", "pokemaster2.db.io"}
+
+
+def test_help_startup_time():
+    """`--help` imports no heavy modules and stays within the import budget."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-m", "pokemaster2.cli", "--help"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    imported = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imported.add(name.strip())
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    assert "Usage:" in result.stdout
+    assert not imported & HEAVY_MODULES
+    assert total_us / 1000 < IMPORT_BUDGET_MS
+
+
+def test_query(tmp_path):
+    """`query` streams rows of a loaded table."""
+    uri = str(tmp_path / "pokedex.sqlite3")
+    runner = CliRunner()
+    assert 0 == runner.invoke(cli.main, ["load", "-U", uri]).exit_code
+    result = runner.invoke(
+        cli.main,
+        ["query", "pokemon", "-U", uri, "-c", "id,identifier", "-w", "id<=2", "-f", "jsonl"],
+    )
+    assert 0 == result.exit_code
+    assert '{"id": 1, "identifier": "bulbasaur"}\n{"id": 2, "identifier": "ivysaur"}\n' == (
+        result.stdout
+    )
+    spaced = runner.invoke(
+        cli.main,
+        ["query", "pokemon", "-U", uri, "-c", "id, identifier", "-w", "id<=2", "-f", "jsonl"],
+    )
+    assert 0 == spaced.exit_code
+    assert result.stdout == spaced.stdout
+
+
+def test_query_unknown_table(tmp_path):
+    """Unknown tables are reported as bad parameters."""
+    result = CliRunner().invoke(cli.main, ["query", "nope", "-U", str(tmp_path / "db")])
+    assert 2 == result.exit_code
+
+
+def test_search(tmp_path):
+    """`search` prints the best matches, one per line."""
+    uri = str(tmp_path / "pokedex.sqlite3")
+    runner = CliRunner()
+    assert 0 == runner.invoke(cli.main, ["load", "-U", uri]).exit_code
+    result = runner.invoke(cli.main, ["search", "Pikach", "-U", uri, "-n", "2"])
+    assert 0 == result.exit_code
+    assert "pokemon\t25\tpikachu\npokemon_species\t25\tpikachu\n" == result.stdout
+
+
+def test_export(tmp_path):
+    """`export` writes one file per table."""
+    uri = str(tmp_path / "pokedex.sqlite3")
+    runner = CliRunner()
+    assert 0 == runner.invoke(cli.main, ["load", "-U", uri]).exit_code
+    result = runner.invoke(
+        cli.main, ["export", "-U", uri, "-o", str(tmp_path / "out"), "-f", "npz", "-t", "pokemon"]
+    )
+    assert 0 == result.exit_code
+    assert (tmp_path / "out" / "pokemon.npz").exists()
+
+
+def test_load_profile(tmp_path):
+    """`load --profile` prints timings and writes a JSON report."""
+    report = tmp_path / "report.json"
+    result = CliRunner().invoke(
+        cli.main,
+        ["load", "-U", str(tmp_path / "db"), "--profile", "--profile-json", str(report)],
+    )
+    assert 0 == result.exit_code
+    assert "rows/s" in result.output
+    assert "pokemon" in json.loads(report.read_text())["tables"]
+
+
+def _table_contents(uri: str) -> dict:
+    with contextlib.closing(sqlite3.connect(uri)) as connection:
+        return {
+            name: connection.execute(f'SELECT count(*), total(rowid) FROM "{name}"').fetchone()
+            for name in [model._meta.table_name for model in tables.MODELS] + ["load_checkpoints"]
+        }
+
+
+def test_load_resume(tmp_path):
+    """`load --checkpoint` records finished tables, and resuming them does nothing."""
+    uri = str(tmp_path / "pokedex.sqlite3")
+    options = ["load", "-U", uri, "--checkpoint", "500", "--resume"]
+    runner = CliRunner()
+    assert 0 == runner.invoke(cli.main, options).exit_code
+    with contextlib.closing(sqlite3.connect(uri)) as connection:
+        checkpoints = connection.execute('SELECT "table", done FROM load_checkpoints').fetchall()
+    assert {"pokemon", "pokemon_species"} == {table for table, _ in checkpoints}
+    assert all(done for _, done in checkpoints)
+
+    loaded = _table_contents(uri)
+    assert 0 == runner.invoke(cli.main, options).exit_code
+    assert loaded == _table_contents(uri)
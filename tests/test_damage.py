@@ -0,0 +1,125 @@
+"""Tests for `pokemaster2.damage`."""
+import numpy as np
+import pytest
+
+from pokemaster2 import damage
+from pokemaster2.db.arrays import TypeChart
+
+NORMAL, FIRE, WATER, GRASS, GHOST = 1, 2, 3, 4, 5
+CHART = TypeChart.from_rows(
+    [
+        [NORMAL, GHOST, 0],
+        [FIRE, GRASS, 200],
+        [FIRE, WATER, 50],
+        [FIRE, FIRE, 50],
+        [WATER, FIRE, 200],
+        [WATER, GRASS, 50],
+        [GRASS, WATER, 200],
+        [GRASS, FIRE, 50],
+    ]
+)
+
+
+def _reference(level, attacker, attacker_types, defender, defender_types, power, move, category):
+    """Every roll of one pairing, one step at a time."""
+    if category not in (damage.PHYSICAL, damage.SPECIAL) or power == 0:
+        return [0] * 16
+    attack, defense = (1, 2) if category == damage.PHYSICAL else (3, 4)
+    base = ((2 * level // 5 + 2) * power * attacker[attack] // defender[defense]) // 50 + 2
+    rolls = []
+    for roll in range(85, 101):
+        amount = base * roll // 100
+        if move in attacker_types:
+            amount = amount * 3 // 2
+        immune = False
+        for target in defender_types:
+            multiplier = CHART.multipliers[move, target]
+            amount = int(amount * multiplier)
+            immune |= multiplier == 0
+        rolls.append(0 if immune else max(amount, 1))
+    return rolls
+
+
+def test_damage_ranges_match_reference():
+    """Every pairing matches the formula applied one roll at a time."""
+    rng = np.random.default_rng(7)
+    attackers = rng.integers(5, 400, (7, 6))
+    defenders = rng.integers(5, 400, (9, 6))
+    defenders[:, 0] = rng.integers(1, 120, 9)
+    # The first type is always set, the second one may be 0.
+    attacker_types = np.stack([rng.integers(1, 6, 7), rng.integers(0, 6, 7)], axis=1)
+    defender_types = np.stack([rng.integers(1, 6, 9), rng.integers(0, 6, 9)], axis=1)
+    power = np.array([0, 40, 90, 120, 250, 60])
+    moves = np.array([NORMAL, FIRE, WATER, GRASS, NORMAL, GHOST])
+    categories = np.array([1, 2, 3, 3, 2, 1])
+    levels = rng.integers(1, 101, 7)
+
+    result = damage.damage_ranges(
+        attackers,
+        attacker_types,
+        defenders,
+        defender_types,
+        power,
+        moves,
+        categories,
+        CHART,
+        level=levels,
+        block_size=3,
+    )
+    assert (7, 9, 6) == result.low.shape == result.ko_rolls.shape
+    for a in range(7):
+        for d in range(9):
+            for m in range(6):
+                rolls = _reference(
+                    levels[a],
+                    attackers[a].tolist(),
+                    attacker_types[a].tolist(),
+                    defenders[d].tolist(),
+                    [t for t in defender_types[d].tolist() if t],
+                    power[m],
+                    moves[m],
+                    categories[m],
+                )
+                assert (rolls[0], rolls[-1]) == (result.low[a, d, m], result.high[a, d, m])
+                knocks = sum(roll >= defenders[d, 0] for roll in rolls)
+                assert knocks == result.ko_rolls[a, d, m]
+
+
+def test_ko_chance():
+    """A defender knocked out by some rolls only."""
+    result = damage.damage_ranges(
+        attackers=[[100, 100, 100, 100, 100, 100]],
+        attacker_types=[[FIRE, 0]],
+        defenders=[[90, 100, 100, 100, 100, 100]],
+        defender_types=[[GRASS, 0]],
+        power=[90],
+        move_types=[FIRE],
+        damage_classes=[damage.SPECIAL],
+        chart=CHART,
+    )
+    # Base damage 41: 34 to 41, then 51 to 61 with STAB, then 102 to 122.
+    assert (102, 122) == (result.low.item(), result.high.item())
+    assert 1.0 == result.ko_chance.item()
+    bulkier = damage.damage_ranges(
+        [[100] * 6], [[FIRE, 0]], [[110] + [100] * 5], [[GRASS, 0]], [90], [FIRE], [3], CHART
+    )
+    assert 0 < bulkier.ko_chance.item() < 1
+
+
+@pytest.mark.parametrize("move, expected", [(NORMAL, 0), (FIRE, 1)])
+def test_minimum_damage(move, expected):
+    """Hits deal at least 1 damage, unless the defender is immune."""
+    result = damage.damage_ranges(
+        [[1] * 6], [[0, 0]], [[100] + [999] * 5], [[GHOST, 0]], [10], [move], [2], CHART, level=1
+    )
+    assert expected == result.low.item()
+
+
+def test_hit_damage_matches_reference():
+    """Single hits match the rolls of the reference."""
+    attacker, defender = [80, 120, 90, 60, 70, 100], [95, 80, 110, 75, 85, 60]
+    rolls = _reference(36, attacker, [FIRE], defender, [GRASS, WATER], 75, FIRE, damage.PHYSICAL)
+    result = damage.hit_damage(
+        36, 75, attacker[1], defender[2], np.arange(85, 101), True, 2.0, 0.5
+    )
+    assert rolls == result.tolist()
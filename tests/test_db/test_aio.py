@@ -0,0 +1,88 @@
+"""Tests for `pokemaster2.db.aio`."""
+import asyncio
+
+import peewee
+import pytest
+
+from pokemaster2.db import default, io
+from pokemaster2.db.aio import AsyncPokedex
+
+
+@pytest.fixture(scope="module")
+def pokedex_path(tmp_path_factory):
+    """A database file loaded from the bundled CSV files."""
+    path = tmp_path_factory.mktemp("aio") / "pokedex.sqlite3"
+    database = peewee.SqliteDatabase(str(path))
+    io.load(database, csv_dir=default.csv_dir())
+    database.close()
+    return str(path)
+
+
+def test_get_pokemon(pokedex_path):
+    """Pokémon come with their species."""
+
+    async def main():
+        async with AsyncPokedex(pokedex_path) as pokedex:
+            return await pokedex.get_pokemon("pikachu")
+
+    (pikachu,) = asyncio.run(main())
+    assert (25, 190) == (pikachu.id, pikachu.species.capture_rate)
+
+
+def test_identical_lookups_are_coalesced(pokedex_path):
+    """Concurrent requests for the same identifier share one query."""
+
+    async def main():
+        async with AsyncPokedex(pokedex_path) as pokedex:
+            results = await asyncio.gather(*(pokedex.get_pokemon("eevee") for _ in range(200)))
+            return results, pokedex.queries
+
+    results, queries = asyncio.run(main())
+    assert 1 == queries
+    assert {133} == {pokemon.id for (pokemon,) in results}
+    assert results[0] is not results[1]
+
+
+def test_get_many(pokedex_path):
+    """Distinct identifiers are fetched together; unknown ones are empty."""
+
+    async def main():
+        async with AsyncPokedex(pokedex_path, max_workers=2) as pokedex:
+            many = await pokedex.get_many(["bulbasaur", "nope", "bulbasaur", "mew"])
+            single = await asyncio.gather(
+                pokedex.get_pokemon("abra"), pokedex.get_pokemon("kadabra")
+            )
+            return many, single, pokedex.queries
+
+    many, single, queries = asyncio.run(main())
+    assert ["bulbasaur", "nope", "mew"] == list(many)
+    assert [1, 151] == [many["bulbasaur"][0].id, many["mew"][0].id]
+    assert [] == many["nope"]
+    assert [63, 64] == [pokemon.id for (pokemon,) in single]
+    assert 2 == queries
+
+
+def test_search(pokedex_path):
+    """Searches run in the thread pool too."""
+
+    async def main():
+        async with AsyncPokedex(pokedex_path) as pokedex:
+            return await asyncio.gather(pokedex.search("pikachu", 1), pokedex.search("mew", 2))
+
+    (pikachu,), mews = asyncio.run(main())
+    assert "pikachu" == pikachu.identifier
+    assert ["mew", "mew"] == [row.identifier for row in mews]
+
+
+def test_read_only(pokedex_path):
+    """Connections cannot write, and are closed with the Pokédex."""
+    pokedex = AsyncPokedex(pokedex_path)
+
+    def write():
+        pokedex._connect()
+        pokedex._database.execute_sql("DELETE FROM pokemon")
+
+    with pytest.raises(peewee.OperationalError, match="readonly"):
+        pokedex._executor.submit(write).result()
+    pokedex.close()
+    assert [] == pokedex._connections
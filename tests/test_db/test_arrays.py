@@ -0,0 +1,116 @@
+"""Tests for `pokemaster2.db.arrays`."""
+import pytest
+
+from pokemaster2.db import arrays, io, tables
+
+
+def test_species_arrays_from_database(test_db, test_pokemon_species):
+    """Species columns are indexed by species id."""
+    arrays.clear_cache()
+    species = arrays.get_species_arrays(test_db)
+    assert [False, True] == species.known.tolist()
+    assert 8 == species.gender_rate[1]
+    assert 255 == species.capture_rate[1]
+    assert 10 == species.hatch_counter[1]
+    assert 0 == species.evolves_from[1]
+    assert species is arrays.get_species_arrays(test_db)
+
+
+def test_species_arrays_padding():
+    """Ids missing from the table are genderless and unknown."""
+    species = arrays.SpeciesArrays.from_rows([[3, 4, 45, 20, 1, 2]])
+    assert [-1, -1, -1, 4] == species.gender_rate.tolist()
+    assert [False, False, False, True] == species.known.tolist()
+    assert species.is_baby[3]
+    assert 2 == species.evolves_from[3]
+
+
+def test_type_chart_from_database(test_db, tmp_path):
+    """The type tables load through `io.load` into a matrix indexed by type id."""
+    (tmp_path / "types.csv").write_text(
+        "id,identifier,generation_id,damage_class_id\n1,normal,1,2\n8,ghost,1,2\n10,fire,1,3\n"
+    )
+    (tmp_path / "type_efficacy.csv").write_text(
+        "damage_type_id,target_type_id,damage_factor\n1,8,0\n10,10,50\n8,8,200\n"
+    )
+    io.load(test_db, models=[tables.TypeEfficacy], csv_dir=str(tmp_path))
+    arrays.clear_cache()
+    chart = arrays.get_type_chart(test_db)
+    assert (11, 11) == chart.multipliers.shape
+    assert 0.0 == chart.multipliers[1, 8]
+    assert 0.5 == chart.multipliers[10, 10]
+    assert 2.0 == chart.multipliers[8, 8]
+    assert 1.0 == chart.multipliers[10, 1] == chart.multipliers[0, 0]
+    assert "ghost" == chart.identifiers[8]
+    assert chart is arrays.get_type_chart(test_db)
+
+
+def test_type_chart_type_ids():
+    """Types of Pokémon become pairs of ids, and effectiveness multiplies both."""
+    chart = arrays.TypeChart.from_rows([[3, 1, 200], [3, 2, 50]], ["", "fire", "water", "grass"])
+    type_ids = chart.type_ids([["fire"], ["water", "fire"]])
+    assert [[1, 0], [2, 1]] == type_ids.tolist()
+    assert [2.0, 1.0] == chart.effectiveness(3, type_ids).tolist()
+    with pytest.raises(KeyError):
+        chart.type_ids([["dragon"]])
+
+
+# pokemon_id, version_group_id, move_id, level, order
+LEARNSET_ROWS = [
+    [1, 8, 22, 9, 0],
+    [1, 8, 33, 1, 0],
+    [1, 8, 45, 3, 0],
+    [1, 8, 73, 7, 0],
+    [1, 8, 75, 13, 1],
+    [1, 8, 77, 13, 2],
+    [1, 8, 33, 15, 0],
+    [1, 9, 99, 1, 0],
+    [2, 8, 10, 1, 0],
+]
+
+
+def test_learnset_learned():
+    """Moves are found by level range, in the order they are learned."""
+    learnset = arrays.Learnset.from_rows(LEARNSET_ROWS)
+    assert [33, 45, 73, 22, 75, 77, 33] == learnset.learned(1, 8, -1, 100)
+    assert [22, 75, 77] == learnset.learned(1, 8, 7, 13)
+    assert [] == learnset.learned(1, 8, 13, 14)
+    assert [] == learnset.learned(1, 8, 13, 5)
+    assert [99] == learnset.learned(1, 9, 0, 50)
+    assert [] == learnset.learned(3, 8, -1, 100)
+
+
+def test_learnset_learned_many():
+    """A population levels up at once."""
+    learnset = arrays.Learnset.from_rows(LEARNSET_ROWS)
+    owners, moves = learnset.learned_many([1, 2, 1, 1], 8, [5, 0, 12, 15], [9, 1, 13, 20])
+    assert [0, 0, 1, 2, 2] == owners.tolist()
+    assert [73, 22, 10, 75, 77] == moves.tolist()
+
+
+def test_learnset_movesets():
+    """Wild Pokémon know the last distinct moves learned by their level."""
+    learnset = arrays.Learnset.from_rows(LEARNSET_ROWS)
+    movesets = learnset.movesets([1, 1, 1, 2, 3], 8, [4, 13, 15, 50, 50])
+    assert [
+        [33, 45, 0, 0],
+        [73, 22, 75, 77],
+        [22, 75, 77, 33],
+        [10, 0, 0, 0],
+        [0, 0, 0, 0],
+    ] == movesets.tolist()
+
+
+def test_learnset_from_database(test_db, tmp_path):
+    """Only the level-up moves of `pokemon_moves` are indexed."""
+    (tmp_path / "pokemon_moves.csv").write_text(
+        "pokemon_id,version_group_id,move_id,pokemon_move_method_id,level,order\n"
+        "1,8,33,1,1,\n"
+        "1,8,45,1,3,\n"
+        "1,8,92,4,0,\n"
+    )
+    io.load(test_db, models=[tables.PokemonMove], csv_dir=str(tmp_path))
+    arrays.clear_cache()
+    learnset = arrays.get_learnset(test_db)
+    assert [33, 45] == learnset.learned(1, 8, -1, 100)
+    assert learnset is arrays.get_learnset(test_db)
@@ -0,0 +1,86 @@
+"""Tests for `pokemaster2.db.checkpoint`."""
+import io as _io
+import itertools
+
+import peewee
+import pytest
+
+from pokemaster2.db import io, synthetic, tables
+from pokemaster2.db.checkpoint import LoadCheckpoint, TrackedLines
+from pokemaster2.db.convert import RowError
+
+
+def test_tracked_lines():
+    """Lines are read with their positions, and can continue from one."""
+    content = "id,identifier\n1,bulbasaur\r\n2,ivysaur\n3,venusaur".encode()
+    lines = TrackedLines(_io.BytesIO(content), block_size=4)
+    assert ["id,identifier\n", "1,bulbasaur\r\n"] == list(itertools.islice(lines, 2))
+    assert (27, 2) == lines.position_of(2)
+    resumed = TrackedLines(_io.BytesIO(content), lines.position_of(2))
+    assert ["id,identifier\n", "2,ivysaur\n", "3,venusaur"] == list(resumed)
+    assert (len(content), 4) == resumed.position == resumed.position_of(3)
+    assert (0, 0) == TrackedLines(_io.BytesIO(b"")).position
+
+
+def _tables(database):
+    return [
+        database.execute_sql(f'SELECT count(*), total(rowid) FROM "{name}"').fetchone()
+        for name in sorted(model._meta.table_name for model in tables.MODELS)
+    ]
+
+
+def test_resume_after_interruption(tmp_path):
+    """A resumed load ends up with the same tables as an uninterrupted one."""
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    synthetic.generate(csv_dir, 2500, seed=3)
+    expected = peewee.SqliteDatabase(":memory:")
+    io.load(expected, csv_dir=str(csv_dir))
+
+    # Break line 2001 of pokemon.csv without changing its length.
+    pokemon_csv = csv_dir / "pokemon.csv"
+    original = pokemon_csv.read_text().splitlines(keepends=True)
+    broken = list(original)
+    broken[2000] = "x" + broken[2000][1:]
+    pokemon_csv.write_text("".join(broken))
+
+    database = peewee.SqliteDatabase(str(tmp_path / "pokedex.sqlite3"))
+    with pytest.raises(RowError, match="line 2001"):
+        io.load(database, csv_dir=str(csv_dir), checkpoint=300, strict=True)
+    database.close()
+
+    database = peewee.SqliteDatabase(str(tmp_path / "pokedex.sqlite3"))
+    database.bind([LoadCheckpoint])
+    checkpoint = LoadCheckpoint.get(table="pokemon")
+    assert not checkpoint.done
+    # Checkpoints fall on batches of 1000 rows, after at least 300 rows.
+    assert 1001 == checkpoint.line
+    assert len("".join(original[:1001]).encode()) == checkpoint.offset
+    assert 1000 == database.execute_sql('SELECT count(*) FROM "pokemon"').fetchone()[0]
+    assert LoadCheckpoint.get(table="regions").done
+
+    pokemon_csv.write_text("".join(original))
+    io.load(database, csv_dir=str(csv_dir), drop_tables=True, resume=True, strict=True)
+    assert _tables(expected) == _tables(database)
+    assert all(checkpoint.done for checkpoint in LoadCheckpoint.select())
+
+    # Nothing is left to resume.
+    io.load(database, csv_dir=str(csv_dir), resume=True)
+    assert _tables(expected) == _tables(database)
+    database.close()
+    expected.close()
+
+
+@pytest.mark.parametrize("checkpoint", [0, 7])
+def test_checkpointed_load(tmp_path, checkpoint):
+    """Checkpointed loads give the same tables as plain loads."""
+    synthetic.generate(tmp_path, 50, seed=1)
+    databases = []
+    for options in ({}, {"checkpoint": checkpoint, "workers": 2}):
+        database = peewee.SqliteDatabase(":memory:")
+        io.load(database, csv_dir=str(tmp_path), **options)
+        databases.append(database)
+    assert _tables(databases[0]) == _tables(databases[1])
+    # A new checkpointed load starts over.
+    io.load(databases[1], csv_dir=str(tmp_path), drop_tables=True, checkpoint=checkpoint)
+    assert _tables(databases[0]) == _tables(databases[1])
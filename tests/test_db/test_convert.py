@@ -0,0 +1,66 @@
+"""Tests for `pokemaster2.db.convert`."""
+import csv
+import io
+
+import pytest
+
+from pokemaster2.db import tables
+from pokemaster2.db.convert import RowConverter, RowError, field_kind
+
+SPECIES_HEADER = [field.column_name for field in tables.PokemonSpecies._meta.sorted_fields]
+
+
+def test_field_kind():
+    """Foreign keys take the kind of the field they point at."""
+    assert "int" == field_kind(tables.PokemonSpecies.evolves_from_species_id)
+    assert "bool" == field_kind(tables.PokemonSpecies.is_baby)
+    assert "str" == field_kind(tables.PokemonSpecies.identifier)
+
+
+def test_convert():
+    """Values are typed, empty nullable values become None, extra columns are dropped."""
+    converter = RowConverter.compile(tables.PokemonSpecies, SPECIES_HEADER + ["extra"])
+    assert SPECIES_HEADER == converter.columns
+    row = "2,ivysaur,1,1,1,5,8,,1,45,50,0,20,0,4,0,2,,x".split(",")
+    expected = (2, "ivysaur", 1, 1, 1, 5, 8, None, 1, 45, 50, 0, 20, 0, 4, 0, 2, None)
+    assert expected == converter.convert(row)
+
+
+def test_missing_column():
+    """Required columns must be in the header."""
+    with pytest.raises(ValueError, match="identifier"):
+        RowConverter.compile(tables.Pokemon, ["id"])
+
+
+def test_convert_rows_reports_bad_rows():
+    """Bad rows are skipped and reported with their line number."""
+    header = [field.column_name for field in tables.Pokemon._meta.sorted_fields]
+    converter = RowConverter.compile(tables.Pokemon, header)
+    reader = csv.reader(
+        io.StringIO(
+            ",".join(header) + "\n"
+            "1,a,1,7,69,64,1,1\n"
+            "2,b,1,x,69,64,2,0\n"
+            "3,c,1,7,69,64,3,maybe\n"
+            "4,d,1\n"
+            "5,e,1,7,69,64,5,true\n"
+        )
+    )
+    next(reader)  # The header line.
+    errors = []
+    converted = list(converter.convert_rows(reader, lambda: reader.line_num, errors))
+
+    assert [1, 5] == [row[0] for row in converted]
+    assert (5, "e", 1, 7, 69, 64, 5, 1) == converted[1]
+    assert [(3, "height"), (4, "is_default"), (5, None)] == [
+        (error.line, error.column) for error in errors
+    ]
+    assert "pokemon.csv, line 3, column 'height': not an integer ('x')" == str(errors[0])
+
+
+def test_convert_rows_strict():
+    """Without an error list, the first bad row raises."""
+    converter = RowConverter.compile(tables.PokemonSpecies, SPECIES_HEADER)
+    row = ",a,1,,1,5,8,,1,45,50,0,20,0,4,0,2,".split(",")
+    with pytest.raises(RowError, match="line 9, column 'id': value is required"):
+        list(converter.convert_rows([row], lambda: 9))
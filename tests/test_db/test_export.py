@@ -0,0 +1,65 @@
+"""Tests for `pokemaster2.db.export`."""
+import numpy as np
+import pytest
+
+from pokemaster2.db import export, tables
+
+
+def test_columns():
+    """Column types follow the field definitions."""
+    columns = {column.name: column for column in export.columns(tables.PokemonSpecies)}
+    assert ("int", False) == (columns["id"].kind, columns["id"].nullable)
+    assert ("int", True) == (columns["conquest_order"].kind, columns["conquest_order"].nullable)
+    assert ("bool", False) == (columns["is_baby"].kind, columns["is_baby"].nullable)
+    # Strings are sized from the data when exported.
+    assert np.dtype(str) == columns["identifier"].dtype
+
+
+def test_export_npz(species_db, tmp_path):
+    """`npz` files hold one typed array per column plus NULL masks."""
+    (path,) = export.export(species_db, tmp_path, "npz", [tables.PokemonSpecies], chunk_size=1)
+    with np.load(path) as npz:
+        assert [1, 2] == npz["id"].tolist()
+        assert ["species-1", "species-2"] == npz["identifier"].tolist()
+        assert [False, True] == npz["is_baby"].tolist()
+        assert [True, False] == npz[f"conquest_order{export.MASK_SUFFIX}"].tolist()
+        assert 7 == npz["conquest_order"][1]
+
+
+def test_export_npz_sizes_strings_from_the_data(test_db, tmp_path):
+    """Strings longer than `max_length` are not truncated, and widths follow the data."""
+    tables.Stat.create(id=1, identifier="x" * 100, is_battle_only=False)
+    tables.Stat.create(id=2, identifier="hp", is_battle_only=False)
+    (path,) = export.export(test_db, tmp_path, "npz", [tables.Stat])
+    with np.load(path) as npz:
+        assert ["x" * 100, "hp"] == npz["identifier"].tolist()
+        assert np.dtype("<U100") == npz["identifier"].dtype
+
+
+def test_export_empty_npz(test_db, tmp_path):
+    """Empty tables export empty arrays."""
+    (path,) = export.export(test_db, tmp_path, "npz", [tables.Pokemon])
+    with np.load(path) as npz:
+        assert 0 == len(npz["id"])
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_export_arrow_formats(species_db, tmp_path, fmt):
+    """Parquet and Arrow files carry the schema and NULLs."""
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet  # noqa: F401
+
+    (path,) = export.export(species_db, tmp_path, fmt, [tables.PokemonSpecies], chunk_size=1)
+    if fmt == "parquet":
+        table = pyarrow.parquet.read_table(path)
+    else:
+        table = pyarrow.ipc.open_file(str(path)).read_all()
+    assert pyarrow.int64() == table.schema.field("id").type
+    assert pyarrow.bool_() == table.schema.field("is_baby").type
+    assert [None, 7] == table.column("conquest_order").to_pylist()
+
+
+def test_export_unknown_format(test_db, tmp_path):
+    """Unknown formats are rejected."""
+    with pytest.raises(ValueError):
+        export.export(test_db, tmp_path, "xlsx")
@@ -1,5 +1,10 @@
 """Tests for `pokemaseter2.io`."""
-from pokemaster2.db import io, tables
+import peewee
+import pytest
+from loguru import logger
+
+from pokemaster2.db import io, synthetic, tables
+from pokemaster2.db.convert import RowError
 
 
 def test_load_unsafe(test_db, test_csv_dir):
@@ -32,3 +37,99 @@ def test_load_pokemon(test_db, test_pokemon_csv, test_csv_dir):
     io.load(test_db, models=[tables.Pokemon], csv_dir=test_csv_dir, drop_tables=True)
     bulbasaur = tables.Pokemon.select().where(tables.Pokemon.identifier == "bulbasaur").first()
     assert 1 == bulbasaur.id
+
+
+def test_load_typed_values(test_db, tmp_path):
+    """Values are stored with their column types, and empty values as NULL."""
+    (tmp_path / "pokemon_species.csv").write_text(
+        "id,identifier,generation_id,evolves_from_species_id,evolution_chain_id,color_id,"
+        "shape_id,habitat_id,gender_rate,capture_rate,base_happiness,is_baby,hatch_counter,"
+        "has_gender_differences,growth_rate_id,forms_switchable,order,conquest_order\n"
+        "1,bulbasaur,1,,1,5,8,3,1,45,50,0,20,0,4,0,1,\n"
+        "2,ivysaur,1,1,1,5,8,3,1,45,50,0,20,0,4,0,2,7\n"
+    )
+    io.load(test_db, models=[tables.PokemonSpecies], csv_dir=str(tmp_path))
+    types = test_db.execute_sql(
+        "SELECT typeof(evolves_from_species_id), typeof(is_baby), typeof(conquest_order) "
+        "FROM pokemon_species ORDER BY id"
+    ).fetchall()
+    assert [("null", "integer", "null"), ("integer", "integer", "integer")] == types
+    assert tables.PokemonSpecies.get_by_id(1).is_baby is False
+
+
+def test_load_bad_rows(test_db, tmp_path):
+    """Bad rows are skipped, or stop the load when `strict` is set."""
+    (tmp_path / "pokemon.csv").write_text(
+        "id,identifier,species_id,height,weight,base_experience,order,is_default\n"
+        "1,bulbasaur,1,7,69,64,1,1\n"
+        "2,ivysaur,1,tall,130,142,2,1\n"
+    )
+    io.load(test_db, models=[tables.Pokemon], csv_dir=str(tmp_path))
+    assert [1] == [pokemon.id for pokemon in tables.Pokemon.select()]
+
+    with pytest.raises(RowError, match="line 3, column 'height'"):
+        io.load(
+            test_db, models=[tables.Pokemon], csv_dir=str(tmp_path), drop_tables=True, strict=True
+        )
+
+
+def test_load_in_parallel(tmp_path):
+    """Loading with worker threads gives the same tables."""
+    synthetic.generate(tmp_path, 2500, seed=3)
+    counts = []
+    for workers in (1, 3):
+        database = peewee.SqliteDatabase(":memory:")
+        io.load(database, csv_dir=str(tmp_path), workers=workers)
+        counts.append(
+            [
+                database.execute_sql(f'SELECT count(*), total(rowid) FROM "{name}"').fetchone()
+                for name in sorted(model._meta.table_name for model in tables.MODELS)
+            ]
+        )
+        database.close()
+    assert counts[0] == counts[1]
+    assert (2500, sum(range(2501))) == counts[0][0]
+
+
+def test_load_in_parallel_strict(tmp_path):
+    """Bad rows found by a worker thread stop the load."""
+    synthetic.generate(tmp_path, 10)
+    with (tmp_path / "regions.csv").open("a") as csv_file:
+        csv_file.write("x,bad-region\n")
+    database = peewee.SqliteDatabase(":memory:")
+    with pytest.raises(RowError, match="regions.csv, line 12"):
+        io.load(database, csv_dir=str(tmp_path), workers=2, strict=True)
+    database.close()
+
+
+def test_load_missing_csv(tmp_path):
+    """Tables whose CSV file is missing are created empty, and the others loaded."""
+    synthetic.generate(tmp_path, 10, models=[tables.Pokemon])
+    database = peewee.SqliteDatabase(":memory:")
+    io.load(database, csv_dir=str(tmp_path), models=[tables.Pokemon])
+    assert "pokemon_species" in database.get_tables()
+    with database.bind_ctx(tables.MODELS):
+        assert 10 == tables.Pokemon.select().count()
+        assert 0 == tables.PokemonSpecies.select().count()
+    database.close()
+
+
+def test_load_missing_csv_log_levels(tmp_path):
+    """Missing CSV files are errors only for the tables asked for."""
+    synthetic.generate(tmp_path, 10, models=[tables.Pokemon])
+    messages = []
+    sink = logger.add(messages.append, level="WARNING", format="{level} {message}")
+    try:
+        io.load(peewee.SqliteDatabase(":memory:"), csv_dir=str(tmp_path), models=[tables.Pokemon])
+        assert ["WARNING Table pokemon references tables without data: pokemon_species\n"] == (
+            messages
+        )
+        messages.clear()
+        io.load(
+            peewee.SqliteDatabase(":memory:"),
+            csv_dir=str(tmp_path),
+            models=[tables.Pokemon, tables.PokemonSpecies],
+        )
+        assert "ERROR CSV file not found: pokemon_species.csv\n" in messages
+    finally:
+        logger.remove(sink)
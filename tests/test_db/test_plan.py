@@ -0,0 +1,53 @@
+"""Tests for `pokemaster2.db.plan`."""
+import peewee
+import pytest
+
+from pokemaster2.db import tables
+from pokemaster2.db.plan import LoadPlan, dependencies
+
+
+def test_dependencies():
+    """Self-references are not dependencies."""
+    assert {tables.PokemonSpecies} == dependencies(tables.Pokemon)
+    assert tables.PokemonSpecies not in dependencies(tables.PokemonSpecies)
+
+
+def test_phases_follow_foreign_keys():
+    """Every table comes after the tables it references."""
+    plan = LoadPlan.build(tables.MODELS)
+    assert set(tables.MODELS) == set(plan.models)
+    phase_of = {model: index for index, phase in enumerate(plan.phases) for model in phase}
+    for model in plan.models:
+        for dependency in dependencies(model):
+            assert phase_of[dependency] < phase_of[model]
+    assert tables.Region in plan.phases[0]
+
+
+def test_recursive():
+    """Referenced tables are added unless `recursive` is off."""
+    assert [[tables.Pokemon]] == LoadPlan.build([tables.Pokemon], recursive=False).phases
+    plan = LoadPlan.build([tables.Pokemon])
+    assert tables.Region in plan.models
+    assert tables.Stat not in plan.models
+
+
+def test_cycle():
+    """Cycles cannot be planned."""
+
+    class A(tables.BaseModel):
+        b = peewee.DeferredForeignKey("B", null=True)
+
+    class B(tables.BaseModel):
+        a = peewee.ForeignKeyField(A, null=True)
+
+    with pytest.raises(ValueError, match="cycle"):
+        LoadPlan.build([A, B])
+
+
+def test_missing(tmp_path):
+    """Tables without a CSV file, and the tables referencing them, are found."""
+    (tmp_path / "pokemon.csv").touch()
+    plan = LoadPlan.build([tables.Pokemon, tables.PokemonSpecies], recursive=False)
+    missing = plan.missing(str(tmp_path))
+    assert [tables.PokemonSpecies] == missing
+    assert {tables.Pokemon: [tables.PokemonSpecies]} == plan.unresolved(missing)
@@ -0,0 +1,46 @@
+"""Tests for `pokemaster2.db.profiling`."""
+import json
+import pstats
+
+import pytest
+
+from pokemaster2.db import io, tables
+from pokemaster2.db.profiling import LoadProfiler
+
+
+def test_phases_add_up():
+    """Repeated phases of a table accumulate into one record."""
+    profiler = LoadProfiler()
+    for _ in range(3):
+        with profiler.phase("pokemon", "insert") as record:
+            record.rows += 10
+            record.batches += 1
+    (record,) = profiler.records
+    assert (30, 3) == (record.rows, record.batches)
+    assert record.wall >= 0
+    assert profiler.peak_rss is None or profiler.peak_rss > 0
+
+
+def test_load_records_every_phase(test_db, test_csv_dir, test_pokemon_csv):
+    """`io.load` reports create, parse, insert, index and search phases."""
+    profiler = LoadProfiler()
+    io.load(test_db, models=[tables.Pokemon], csv_dir=test_csv_dir, profiler=profiler)
+    phases = {record.phase: record for record in profiler.records}
+    assert {"create", "parse", "insert", "index", "search"} == set(phases)
+    assert 1 == phases["insert"].rows == phases["parse"].rows
+
+    report = json.loads(profiler.to_json())
+    assert 1 == report["tables"]["pokemon"]["rows"]
+    assert "insert" in profiler.format_table()
+
+
+def test_cprofile(tmp_path):
+    """`cProfile` stats cover the profiled phases."""
+    profiler = LoadProfiler(cprofile=True)
+    with profiler.phase("pokemon", "insert"):
+        sorted(range(100))
+    profiler.dump_cprofile(str(tmp_path / "load.prof"))
+    assert pstats.Stats(str(tmp_path / "load.prof")).total_calls > 0
+
+    with pytest.raises(ValueError):
+        LoadProfiler().dump_cprofile(str(tmp_path / "nope.prof"))
@@ -0,0 +1,81 @@
+"""Tests for `pokemaster2.db.query`."""
+import io as stdio
+
+import pytest
+
+from pokemaster2.db import query, tables
+
+
+@pytest.fixture
+def loaded_db(test_db):
+    """A database with a few Pokémon."""
+    for i, name in enumerate(["bulbasaur", "ivysaur", "venusaur"], start=1):
+        tables.Pokemon.create(
+            id=i,
+            identifier=name,
+            species_id=i,
+            height=i,
+            weight=i * 10,
+            base_experience=64,
+            order=i,
+            is_default=i != 2,
+        )
+    yield test_db
+
+
+def test_get_model():
+    """Models are found by table name."""
+    assert tables.Pokemon is query.get_model("pokemon")
+    with pytest.raises(ValueError):
+        query.get_model("nope")
+
+
+def test_select_and_stream(loaded_db):
+    """Filters, columns and limit are applied; rows come in batches."""
+    select, columns = query.select(
+        tables.Pokemon, ["id", "identifier"], filters=["weight>=20", "is_default=1"], limit=5
+    )
+    assert ["id", "identifier"] == columns
+    assert [(3, "venusaur")] == list(query.stream_rows(loaded_db, select, batch_size=1))
+
+
+def test_parse_filter_errors():
+    """Unknown columns and malformed filters are rejected."""
+    with pytest.raises(ValueError):
+        query.parse_filter(tables.Pokemon, "colour=red")
+    with pytest.raises(ValueError):
+        query.parse_filter(tables.Pokemon, "identifier")
+    with pytest.raises(ValueError, match="null"):
+        query.parse_filter(tables.Pokemon, "base_experience>=null")
+
+
+def test_null_filters(test_db):
+    """Only `null` matches NULL; other values are compared as they are."""
+    for i, name in enumerate(["hp", "none", "accuracy"], start=1):
+        tables.Stat.create(
+            id=i, identifier=name, is_battle_only=i == 3, game_index=None if i == 3 else i
+        )
+    select, _ = query.select(tables.Stat, ["id"], filters=["game_index=null"])
+    assert [(3,)] == list(query.stream_rows(test_db, select))
+    select, _ = query.select(tables.Stat, ["id"], filters=["game_index!=null"])
+    assert [(1,), (2,)] == list(query.stream_rows(test_db, select))
+    select, _ = query.select(tables.Stat, ["id"], filters=["identifier=none"])
+    assert [(2,)] == list(query.stream_rows(test_db, select))
+
+
+@pytest.mark.parametrize(
+    "fmt,expected",
+    [
+        ("csv", 'id,identifier\n1,bulbasaur\n2,"a,b"\n'),
+        ("tsv", "id\tidentifier\n1\tbulbasaur\n2\ta,b\n"),
+        ("jsonl", '{"id": 1, "identifier": "bulbasaur"}\n{"id": 2, "identifier": "a,b"}\n'),
+    ],
+)
+def test_write_rows(fmt, expected):
+    """Rows are written in every format."""
+    stream = stdio.StringIO()
+    count = query.write_rows(
+        iter([(1, "bulbasaur"), (2, "a,b")]), ["id", "identifier"], fmt, stream
+    )
+    assert 2 == count
+    assert expected == stream.getvalue()
@@ -0,0 +1,87 @@
+"""Tests for `pokemaster2.db.search`."""
+import peewee
+import pytest
+
+from pokemaster2.db import io, search, tables
+
+
+@pytest.fixture
+def search_db(tmp_path):
+    """A database loaded from a few Pokémon and species."""
+    names = ["pikachu", "raichu", "pichu", "mr-mime", "mime-jr", "chansey", "charmander"]
+    species_header = ",".join(
+        field.column_name for field in tables.PokemonSpecies._meta.sorted_fields
+    )
+    pokemon_header = ",".join(field.column_name for field in tables.Pokemon._meta.sorted_fields)
+    species = [f"{i},{name},1,,1,1,1,,4,190,70,0,10,0,2,0,{i}," for i, name in enumerate(names, 1)]
+    pokemon = [f"{i},{name},{i},4,60,112,{i},1" for i, name in enumerate(names, 1)]
+    pokemon.append(f"10080,pikachu-rock-star,1,4,60,112,{len(names) + 1},0")
+    (tmp_path / "pokemon_species.csv").write_text("\n".join([species_header, *species]) + "\n")
+    (tmp_path / "pokemon.csv").write_text("\n".join([pokemon_header, *pokemon]) + "\n")
+
+    database = peewee.SqliteDatabase(":memory:")
+    io.load(database, csv_dir=str(tmp_path), models=[tables.Pokemon])
+    yield database
+    database.close()
+
+
+def _found(results):
+    return [(type(row).__name__, row.identifier) for row in results]
+
+
+def test_normalize():
+    """User input is turned into identifier form."""
+    assert "mr-mime" == search.normalize("  Mr. Mime ")
+
+
+def test_search_fragment(search_db):
+    """Exact and prefix matches rank before other matches."""
+    results = search.search("pichu", limit=3, database=search_db)
+    assert [("Pokemon", "pichu"), ("PokemonSpecies", "pichu")] == _found(results)[:2]
+
+    identifiers = [row.identifier for row in search.search("chu", 20, search_db)]
+    assert "pikachu-rock-star" in identifiers
+    assert {"pikachu", "raichu", "pichu", "pikachu-rock-star"} == set(identifiers)
+
+
+def test_search_prefix_first(search_db):
+    """Identifiers starting with the fragment come first."""
+    results = search.search("mime", database=search_db)
+    assert "mime-jr" == results[0].identifier
+    assert "mr-mime" == results[-1].identifier
+
+
+def test_search_short_prefix(search_db):
+    """Fragments shorter than a trigram are matched as prefixes."""
+    identifiers = [row.identifier for row in search.search("ch", database=search_db)]
+    assert ["chansey", "chansey", "charmander", "charmander"] == identifiers
+    assert [] == search.search("zz", database=search_db)
+    assert [] == search.search(" ", database=search_db)
+
+
+def test_search_returns_rows(search_db):
+    """Results are full model instances."""
+    pokemon = search.search("Mr. Mime", limit=1, database=search_db)[0]
+    assert isinstance(pokemon, tables.Pokemon)
+    assert (4, 4, True) == (pokemon.id, pokemon.species_id, pokemon.is_default)
+
+
+def test_search_refresh_on_reload(search_db, tmp_path):
+    """Reloading a table replaces its index entries only."""
+    header = ",".join(field.column_name for field in tables.Pokemon._meta.sorted_fields)
+    (tmp_path / "pokemon.csv").write_text(f"{header}\n1,pikachu-phd,1,4,60,112,1,1\n")
+    io.load(
+        search_db,
+        csv_dir=str(tmp_path),
+        models=[tables.Pokemon],
+        recursive=False,
+        drop_tables=True,
+    )
+    assert [("PokemonSpecies", "pikachu"), ("Pokemon", "pikachu-phd")] == _found(
+        search.search("pikachu", database=search_db)
+    )
+
+
+def test_search_builds_missing_index(species_db):
+    """Databases loaded without an index get one on first search."""
+    assert ["species-1"] == [row.identifier for row in search.search("es-1", database=species_db)]
@@ -0,0 +1,104 @@
+"""Tests for `pokemaster2.db.shared`."""
+import concurrent.futures
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pokemaster2.db import arrays, shared
+
+_STATUS = Path("/proc/self/status")
+
+
+def test_publish_and_attach():
+    """Workers get read-only views of the published arrays."""
+    published = {
+        "stats": np.arange(24, dtype=np.int16).reshape(4, 6),
+        "rates": np.array([0.5, 1.5]),
+        "empty": np.zeros((0, 3), dtype=np.int64),
+        "names": np.array(["bulbasaur", "mew"]),
+    }
+    with shared.SharedBlock.publish(published) as block:
+        handle = pickle.loads(pickle.dumps(block.handle))
+        views = shared.attach(handle)
+        for key, array in published.items():
+            np.testing.assert_array_equal(array, views[key])
+            assert array.dtype == views[key].dtype
+            assert not views[key].flags.writeable
+            assert not views[key].flags.owndata
+        with pytest.raises(ValueError):
+            views["stats"][0, 0] = 1
+        # Attached once per process.
+        assert views["stats"] is shared.attach(handle)["stats"]
+    assert block.closed
+    # Still mapped by this process.
+    np.testing.assert_array_equal(published["stats"], shared.attach(handle)["stats"])
+    stats = views.pop("stats")[1:]
+    del views
+    with pytest.raises(BufferError):
+        shared.detach(handle)
+    np.testing.assert_array_equal(published["stats"][1:], stats)
+    del stats
+    shared.detach(handle)
+    shared.detach(handle)
+    with pytest.raises(FileNotFoundError):
+        shared.attach(handle)
+
+
+def test_close_unlinks_the_block():
+    """Closing the block is idempotent, and prevents new attachments."""
+    block = shared.SharedBlock.publish({"ids": np.arange(3)})
+    block.close()
+    block.close()
+    with pytest.raises(FileNotFoundError):
+        shared.attach(block.handle)
+
+
+def test_objects_cannot_be_shared():
+    """Arrays of Python objects are rejected."""
+    with pytest.raises(ValueError):
+        shared.SharedBlock.publish({"objects": np.array([{}, None])})
+
+
+def test_publish_pokedex(species_db):
+    """The Pokédex arrays and population arrays are published together."""
+    arrays.clear_cache()
+    population = {"stats": np.ones((10, 6), dtype=np.int64)}
+    with shared.publish_pokedex(species_db, population) as block:
+        pokedex = shared.attach_pokedex(block.handle)
+        species = arrays.get_species_arrays(species_db)
+        np.testing.assert_array_equal(species.capture_rate, pokedex.species.capture_rate)
+        np.testing.assert_array_equal(species.evolves_from, pokedex.species.evolves_from)
+        assert arrays.get_type_chart(species_db).identifiers == pokedex.type_chart.identifiers
+        assert 0 == len(pokedex.learnset.keys)
+        np.testing.assert_array_equal(population["stats"], pokedex.population["stats"])
+        del pokedex
+        shared.detach(block.handle)
+
+
+def _anonymous_memory() -> int:
+    """The private memory of this process, in kB."""
+    for line in _STATUS.read_text().splitlines():
+        if line.startswith("RssAnon:"):
+            return int(line.split()[1])
+    raise LookupError("RssAnon")
+
+
+def _read_population(handle: shared.SharedHandle) -> int:
+    before = _anonymous_memory()
+    stats = shared.attach(handle)["stats"]
+    assert stats.sum() == len(stats)
+    return _anonymous_memory() - before
+
+
+@pytest.mark.skipif(not _STATUS.exists(), reason="Needs /proc.")
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_workers_do_not_copy(workers):
+    """Reading a shared 64 MB array costs no private memory in any worker."""
+    stats = np.zeros(8 << 20, dtype=np.int64)
+    stats[:] = 1
+    with shared.SharedBlock.publish({"stats": stats}) as block:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            growth = list(executor.map(_read_population, [block.handle] * workers * 2))
+    assert max(growth) < stats.nbytes // 1024 // 16
@@ -0,0 +1,31 @@
+"""Tests for `pokemaster2.db.snapshot`."""
+import numpy as np
+import pytest
+
+from pokemaster2.db import export, tables
+from pokemaster2.db.snapshot import PokedexSnapshot
+
+
+@pytest.mark.parametrize("fmt", ["npz", "arrow"])
+def test_load_snapshot(species_db, tmp_path, fmt):
+    """Exported tables load back into a snapshot."""
+    if fmt == "arrow":
+        pytest.importorskip("pyarrow")
+    export.export(species_db, tmp_path, fmt, [tables.PokemonSpecies, tables.Pokemon])
+    snapshot = PokedexSnapshot.load(tmp_path)
+    table_name = tables.PokemonSpecies._meta.table_name
+    assert table_name in snapshot
+    species = snapshot[table_name]
+    assert [1, 2] == species["id"].tolist()
+    assert ["species-1", "species-2"] == list(species["identifier"])
+    assert [None, 7] == species["conquest_order"].tolist()
+    assert 0 == len(snapshot["pokemon"]["id"])
+
+
+def test_npz_columns_are_memory_mapped(species_db, tmp_path):
+    """`npz` columns are read-only maps of the file, not copies."""
+    export.export(species_db, tmp_path, "npz", [tables.PokemonSpecies])
+    snapshot = PokedexSnapshot.load(tmp_path)
+    ids = snapshot[tables.PokemonSpecies._meta.table_name]["id"]
+    assert isinstance(ids, np.memmap)
+    assert not ids.flags.writeable
@@ -0,0 +1,75 @@
+"""Tests for `pokemaster2.db.synthetic`."""
+import csv
+
+import peewee
+import pytest
+
+from pokemaster2.db import io, synthetic, tables
+
+
+def _read(path):
+    with path.open(newline="") as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+def test_references():
+    """Foreign keys are found by column name."""
+    assert {"species_id": tables.PokemonSpecies} == synthetic.references(tables.Pokemon)
+    references = synthetic.references(tables.PokemonSpecies)
+    assert tables.PokemonSpecies == references["evolves_from_species_id"]
+    assert tables.Generation == references["generation_id"]
+
+
+def test_generate_is_deterministic(tmp_path):
+    """The same seed gives the same files, whatever the chunk size."""
+    first = synthetic.generate(tmp_path / "a", 100, seed=7, chunk_size=100)
+    second = synthetic.generate(tmp_path / "b", 100, seed=7, chunk_size=16)
+    other = synthetic.generate(tmp_path / "c", 100, seed=8)
+    for a, b in zip(first, second):
+        assert a.name == b.name
+        assert a.read_text() == b.read_text()
+    assert first[0].name == other[0].name
+    assert first[0].read_text() != other[0].read_text()
+
+
+def test_generate_schema(tmp_path):
+    """Columns follow the models, and every reference points at a real row."""
+    synthetic.generate(tmp_path, {"pokemon": 200, "pokemon_species": 50}, seed=1)
+    pokemon = _read(tmp_path / "pokemon.csv")
+    species = _read(tmp_path / "pokemon_species.csv")
+
+    assert 200 == len(pokemon)
+    assert 50 == len(species)
+    assert [field.column_name for field in tables.Pokemon._meta.sorted_fields] == list(pokemon[0])
+    assert list(range(1, 201)) == [int(row["id"]) for row in pokemon]
+    assert all(1 <= int(row["species_id"]) <= 50 for row in pokemon)
+    assert {"0", "1"} == {row["is_default"] for row in pokemon}
+    assert len({row["identifier"] for row in pokemon}) == 200
+
+    assert "" == species[0]["evolves_from_species_id"]
+    for row in species[1:]:
+        parent = row["evolves_from_species_id"]
+        assert parent == "" or 1 <= int(parent) < int(row["id"])
+    assert "" in {row["conquest_order"] for row in species}
+    assert all(-1 <= int(row["gender_rate"]) <= 8 for row in species)
+
+
+def test_generate_loads(tmp_path):
+    """`io.load` reads the generated files."""
+    synthetic.generate(tmp_path, 300)
+    database = peewee.SqliteDatabase(":memory:")
+    io.load(database, csv_dir=str(tmp_path))
+    with database.bind_ctx(tables.MODELS):
+        assert 300 == tables.Pokemon.select().count()
+        assert 300 == tables.PokemonSpecies.select().count()
+    database.close()
+
+
+def test_generate_composite_keys(tmp_path):
+    """Composite primary keys are unique and within their referenced tables."""
+    synthetic.generate(tmp_path, {"pokemon": 3, "stats": 6, "pokemon_stats": 18})
+    keys = [(row["pokemon_id"], row["stat_id"]) for row in _read(tmp_path / "pokemon_stats.csv")]
+    assert [(str(p), str(s)) for p in range(1, 4) for s in range(1, 7)] == keys
+
+    with pytest.raises(ValueError, match="pokemon_stats can only have 18 distinct keys"):
+        synthetic.generate(tmp_path, {"pokemon": 3, "stats": 6, "pokemon_stats": 19})
@@ -23,6 +23,11 @@ def test_pokemon_species():
         id=1,
         identifier="test-species",
         evolves_from=None,
+        generation_id=1,
+        evolution_chain_id=1,
+        color_id=1,
+        shape_id=1,
+        growth_rate_id=1,
         gender_rate=8,
         capture_rate=255,
         base_happiness=0,
@@ -0,0 +1,64 @@
+"""Tests for `pokemaster2.encounters` module."""
+import pytest
+
+from pokemaster2 import encounters
+from pokemaster2.pokemon import Stats
+from pokemaster2.prng import PRNG
+
+TABLE = [
+    encounters.EncounterSlot(species_id=16, min_level=2, max_level=5, weight=60),
+    encounters.EncounterSlot(species_id=19, min_level=3, max_level=3, weight=30),
+    encounters.EncounterSlot(species_id=16, min_level=4, max_level=4, weight=10),
+]
+CAPTURE_RATES = [255, 255, 45]
+
+
+def test_first_trial_matches_prng():
+    """A trial draws the same numbers as the scalar `PRNG`."""
+    prng = PRNG(0x1A56B091)
+    slot_rand, level_rand = prng.next_(2)
+    _, gene = prng.generate_pid_and_iv(method=2)
+    stats = encounters.simulate(TABLE, 1, seed=0x1A56B091, method=2, capture_rates=CAPTURE_RATES)
+    slot = 0 if slot_rand % 100 < 60 else 1 if slot_rand % 100 < 90 else 2
+    assert 1 == stats.slot_counts[slot]
+    level = TABLE[slot].min_level + level_rand % (
+        TABLE[slot].max_level - TABLE[slot].min_level + 1
+    )
+    assert 1 == stats.level_counts[level]
+    ivs = Stats.create_iv(gene)
+    assert 1 == stats.iv_counts[0, ivs.hp]
+    assert 1 == stats.iv_counts[5, ivs.spd]
+
+
+@pytest.mark.parametrize("method", [1, 2, 4])
+def test_results_do_not_depend_on_blocks_or_workers(method):
+    """Splitting the trials differently gives bit-identical results."""
+    kwargs = dict(trials=5000, seed=42, method=method, capture_rates=CAPTURE_RATES)
+    single = encounters.simulate(TABLE, block_size=5000, **kwargs)
+    assert single == encounters.simulate(TABLE, block_size=333, **kwargs)
+    assert single == encounters.simulate(TABLE, block_size=1000, workers=2, **kwargs)
+
+
+def test_aggregate_statistics():
+    """Aggregates are consistent with the encounter table."""
+    stats = encounters.simulate(TABLE, 20000, seed=1, tid=1, sid=2, capture_rates=CAPTURE_RATES)
+    assert 20000 == stats.trials == stats.slot_counts.sum() == stats.level_counts.sum()
+    assert (20000 == stats.iv_counts.sum(axis=1)).all()
+    assert 0.7 == pytest.approx(stats.species_distribution[16], abs=0.02)
+    assert 0.3 == pytest.approx(stats.species_distribution[19], abs=0.02)
+    assert 0 == stats.level_counts[6:].sum()
+    assert 0 <= stats.shiny_rate < 0.01
+    assert 0.25 < stats.catch_rate < 0.4
+
+
+def test_invalid_method():
+    """Only methods 1, 2, 4 exist."""
+    with pytest.raises(ValueError):
+        encounters.simulate(TABLE, 1, method=3, capture_rates=CAPTURE_RATES)
+
+
+@pytest.mark.parametrize("table", [[], [encounters.EncounterSlot(16, 2, 5, weight=0)]])
+def test_empty_table(table):
+    """Encounter tables need a slot that can be encountered."""
+    with pytest.raises(ValueError, match="positive weight"):
+        encounters.simulate(table, 1, capture_rates=[255] * len(table))
@@ -0,0 +1,93 @@
+"""Tests for `pokemaster2.evs` module."""
+import itertools
+
+import attr
+
+from pokemaster2 import evs
+from pokemaster2.pokemon import STAT_NAMES, Stats, _calc_stats
+
+GARCHOMP = dict(
+    base_stats=Stats(108, 130, 95, 80, 85, 102),
+    iv=Stats(31, 31, 31, 31, 31, 31),
+    nature="jolly",
+)
+
+
+def _stats(level, ev):
+    return _calc_stats(level, GARCHOMP["base_stats"], GARCHOMP["iv"], ev, GARCHOMP["nature"])
+
+
+def _check_legal(spread, level):
+    values = [getattr(spread.ev, stat) for stat in STAT_NAMES]
+    assert all(value % 4 == 0 and 0 <= value <= evs.MAX_EV for value in values)
+    assert spread.total <= evs.MAX_TOTAL_EV
+    assert _stats(level, spread.ev) == spread.stats
+
+
+def test_stat_table_matches_calc_stats():
+    table = evs.stat_table(50, **GARCHOMP)
+    for step in (0, 1, 31, 63):
+        ev = Stats(*[int(evs.EV_STEPS[step])] * 6)
+        assert [getattr(_stats(50, ev), stat) for stat in STAT_NAMES] == table[step].tolist()
+
+
+def test_minimums_get_the_lowest_breakpoint():
+    (spread,) = evs.optimize(50, **GARCHOMP, minimums=Stats(200, 0, 0, 0, 0, 160))
+    _check_legal(spread, 50)
+    assert spread.stats.hp >= 200 and spread.stats.spd >= 160
+    # 4 EVs less in either stat misses the benchmark.
+    assert _stats(50, spread.ev - Stats(4, 0, 0, 0, 0, 0)).hp < 200
+    assert _stats(50, spread.ev - Stats(0, 0, 0, 0, 0, 4)).spd < 160
+
+
+def test_unreachable_minimums():
+    assert [] == evs.optimize(50, **GARCHOMP, minimums=Stats(0, 0, 0, 0, 0, 200))
+    assert [] == evs.optimize(
+        50,
+        **GARCHOMP,
+        minimums=Stats(230, 0, 0, 0, 0, 169),
+        maximize=["atk"],
+    )
+
+
+def test_maximize_matches_brute_force():
+    """The spreads are exactly the Pareto front of all legal spreads."""
+    spd_ev = 188
+    brute = {}
+    for hp_ev, atk_ev in itertools.product(range(0, 256, 4), repeat=2):
+        if hp_ev + atk_ev + spd_ev <= evs.MAX_TOTAL_EV:
+            stats = _stats(50, Stats(hp_ev, atk_ev, 0, 0, 0, spd_ev))
+            brute[stats.hp, stats.atk] = True
+    front = {
+        (hp, atk)
+        for hp, atk in brute
+        if not any(h >= hp and a >= atk and (h, a) != (hp, atk) for h, a in brute)
+    }
+
+    spreads = evs.optimize(
+        50, **GARCHOMP, minimums=Stats(0, 0, 0, 0, 0, 160), maximize=["hp", "atk"]
+    )
+    assert front == {(spread.stats.hp, spread.stats.atk) for spread in spreads}
+    for spread in spreads:
+        _check_legal(spread, 50)
+        assert spread.ev.spd == spd_ev
+    assert [spread.total for spread in spreads] == sorted(spread.total for spread in spreads)
+
+
+def test_constraint():
+    def bulky(stats):
+        return stats[:, 0] * stats[:, 2] >= 28_000
+
+    spreads = evs.optimize(
+        50, **GARCHOMP, maximize=["atk"], constraint=bulky, constrained=["hp", "def_"]
+    )
+    assert spreads
+    for spread in spreads:
+        _check_legal(spread, 50)
+        assert spread.stats.hp * spread.stats.def_ >= 28_000
+        # No EVs can be taken off HP or Defense without breaking the benchmark.
+        for stat in ("hp", "def_"):
+            if getattr(spread.ev, stat):
+                less = attr.evolve(spread.ev, **{stat: getattr(spread.ev, stat) - 4})
+                stats = _stats(50, less)
+                assert stats.hp * stats.def_ < 28_000 or stats == spread.stats
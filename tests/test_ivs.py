@@ -0,0 +1,92 @@
+"""Tests for `pokemaster2.ivs` module."""
+import numpy as np
+import pytest
+
+from pokemaster2 import ivs
+from pokemaster2.pokemon import NATURES, STAT_NAMES, Stats, _calc_stats
+
+BASE_STATS = Stats(108, 130, 95, 80, 85, 102)
+SHEDINJA = Stats(1, 90, 45, 30, 30, 40)
+
+
+def _random_batch(n, k, seed=0):
+    rng = np.random.default_rng(seed)
+    base_stats = rng.integers(5, 256, size=(n, 6))
+    natures = rng.integers(0, 25, size=n)
+    true_ivs = rng.integers(0, 32, size=(n, 6))
+    levels = np.sort(rng.integers(1, 101, size=(n, k)), axis=1)
+    evs = np.sort(rng.integers(0, 256, size=(n, k, 6)), axis=1)
+    stats = ivs.calc_stats(
+        levels, base_stats[:, np.newaxis], true_ivs[:, np.newaxis], evs, natures[:, np.newaxis]
+    )
+    return base_stats, natures, true_ivs, levels, evs, stats
+
+
+@pytest.mark.parametrize("base_stats", [BASE_STATS, SHEDINJA])
+@pytest.mark.parametrize("nature", ["hardy", "adamant", "modest", "timid", "quirky"])
+def test_calc_stats_matches_scalar(base_stats, nature):
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        level = int(rng.integers(1, 101))
+        iv = Stats(*rng.integers(0, 32, size=6).tolist())
+        ev = Stats(*rng.integers(0, 256, size=6).tolist())
+        expected = _calc_stats(level, base_stats, iv, ev, nature)
+        stats = ivs.calc_stats(
+            level, ivs._as_stats(base_stats), ivs._as_stats(iv), ivs._as_stats(ev), nature
+        )
+        assert [getattr(expected, stat) for stat in STAT_NAMES] == stats.tolist()
+
+
+def test_true_ivs_are_candidates():
+    base_stats, natures, true_ivs, levels, evs, stats = _random_batch(2000, 3)
+    candidates = ivs.candidate_ivs(base_stats, natures, levels, stats, evs)
+    assert candidates.shape == (2000, 6, 32)
+    assert np.take_along_axis(candidates, true_ivs[..., np.newaxis], axis=-1).all()
+    low, high = ivs.iv_ranges(candidates)
+    assert ((low <= true_ivs) & (true_ivs <= high)).all()
+    # Every IV between the bounds is a candidate.
+    assert (candidates.sum(axis=-1) == high.astype(int) - low + 1).all()
+
+
+def test_more_observations_narrow_the_ranges():
+    base_stats, natures, _, levels, evs, stats = _random_batch(500, 3)
+    one = ivs.candidate_ivs(base_stats, natures, levels[:, -1:], stats[:, -1:], evs[:, -1:])
+    three = ivs.candidate_ivs(base_stats, natures, levels, stats, evs)
+    assert (three <= one).all()
+    assert three.sum() < one.sum()
+
+
+def test_missing_observations_are_ignored():
+    base_stats, natures, _, levels, evs, stats = _random_batch(100, 2)
+    padded_levels = np.concatenate([levels, np.zeros((100, 1), dtype=int)], axis=1)
+    padded_stats = np.concatenate([stats, np.zeros((100, 1, 6), dtype=int)], axis=1)
+    padded_evs = np.concatenate([evs, np.zeros((100, 1, 6), dtype=int)], axis=1)
+    assert np.array_equal(
+        ivs.candidate_ivs(base_stats, natures, levels, stats, evs),
+        ivs.candidate_ivs(base_stats, natures, padded_levels, padded_stats, padded_evs),
+    )
+
+
+def test_infer():
+    iv = Stats(24, 12, 30, 16, 23, 5)
+    ev = Stats(74, 190, 91, 48, 84, 23)
+    observations = [
+        (level, _calc_stats(level, BASE_STATS, iv, ev, "adamant"), ev) for level in (50, 78, 100)
+    ]
+    low, high = ivs.infer(BASE_STATS, "adamant", observations)
+    assert low == high == iv
+
+
+def test_infer_inconsistent():
+    ev = Stats.zeros()
+    stats = _calc_stats(50, BASE_STATS, Stats(*[31] * 6), ev, "hardy") + 10
+    with pytest.raises(ValueError, match="hp"):
+        ivs.infer(BASE_STATS, "hardy", [(50, stats, ev)])
+
+
+def test_nature_modifiers_table():
+    for index, nature in enumerate(NATURES):
+        modifiers = Stats.nature_modifiers(nature)
+        assert [getattr(modifiers, stat) for stat in STAT_NAMES] == ivs.NATURE_MODIFIERS[
+            index
+        ].tolist()
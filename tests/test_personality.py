@@ -0,0 +1,100 @@
+"""Tests for `pokemaster2.personality` module."""
+import attr
+import numpy as np
+
+from pokemaster2 import personality
+from pokemaster2.db.arrays import SpeciesArrays
+from pokemaster2.pokemon import NATURES, Stats
+
+
+def make_species() -> SpeciesArrays:
+    """Species 1: 1/8 female, 2: all male, 3: all female, 4: genderless."""
+    return SpeciesArrays.from_rows(
+        [
+            [1, 1, 45, 20, 0, 0],
+            [2, 0, 45, 20, 0, 0],
+            [3, 8, 45, 20, 0, 0],
+            [4, -1, 45, 20, 0, 0],
+        ]
+    )
+
+
+def test_gender_thresholds():
+    """Gender rates map onto the in-game thresholds."""
+    thresholds = personality.gender_thresholds([-1, 0, 1, 2, 4, 6, 8])
+    assert [-1, 0, 31, 63, 127, 191, 256] == thresholds.tolist()
+
+
+def test_genders():
+    """The lowest byte of the PID decides the gender."""
+    species = make_species()
+    pids = np.array([0x1E, 0x1F, 0xFF, 0x00, 0xFF, 0x00, 0x1E], dtype=np.uint32)
+    species_ids = np.array([1, 1, 3, 2, 2, 4, 4])
+    expected = [
+        personality.FEMALE,
+        personality.MALE,
+        personality.FEMALE,
+        personality.MALE,
+        personality.MALE,
+        personality.GENDERLESS,
+        personality.GENDERLESS,
+    ]
+    assert expected == personality.genders(pids, species_ids, species).tolist()
+
+
+def test_genders_scalar_species():
+    """A scalar species id applies to every PID."""
+    species = make_species()
+    assert [1, 0] == personality.genders([0x00, 0xFF], 1, species).tolist()
+
+
+def test_ability_slots_and_natures():
+    """Ability slot is the PID parity and nature is `pid % 25`."""
+    pids = [0x7E482751, 0xFFFFFFFF, 24]
+    assert [1, 1, 0] == personality.ability_slots(pids).tolist()
+    assert [0x7E482751 % 25, 0xFFFFFFFF % 25, 24] == personality.natures(pids).tolist()
+    assert "quirky" == NATURES[personality.natures(24)]
+
+
+def test_shiny_flags():
+    """Shininess compares the XOR of PID halves with `tid ^ sid`."""
+    pid = 0x7E482751
+    xor = (pid >> 16) ^ (pid & 0xFFFF)
+    pids = np.array([pid, pid, pid], dtype=np.uint32)
+    tids = np.array([xor, xor ^ 7, xor ^ 8])
+    assert [True, True, False] == personality.shiny_flags(pids, tids, 0).tolist()
+    assert personality.shiny_flags(pid, 0, xor ^ 15, threshold=16)
+
+
+def test_unpack_ivs_matches_create_iv():
+    """`unpack_ivs` returns the same IVs as `Stats.create_iv`."""
+    genes = [0x5EE9629C, 0x7FFF7FFF, 0]
+    for gene, ivs in zip(genes, personality.unpack_ivs(genes)):
+        assert attr.astuple(Stats.create_iv(gene)) == tuple(ivs)
+    # Genes with only the bits of one IV set.
+    genes = 31 << personality.IV_OFFSETS
+    assert (31 * np.eye(6)).tolist() == personality.unpack_ivs(genes).tolist()
+
+
+def test_hidden_powers():
+    """Hidden Power type and power are packed into one integer."""
+    packed = personality.hidden_powers([0x7FFF7FFF, 0x7BDE7BDE, 0])
+    assert [15, 0, 0] == (packed & 0xF).tolist()
+    assert [70, 70, 30] == (packed >> 4).tolist()
+    assert "dark" == personality.HIDDEN_POWER_TYPES[packed[0] & 0xF]
+
+
+def test_characteristics():
+    """The highest IV decides the characteristic, ties start at `pid % 6`."""
+    all_31 = 0x7FFF7FFF
+    index = personality.characteristics([0, 3, 5], [all_31] * 3)
+    assert [1, 16, 26] == index.tolist()
+    assert "takes-plenty-of-siestas" == personality.CHARACTERISTICS[index[0]]
+    # Only Sp. Def is 31, every other IV is 0.
+    assert 26 == personality.characteristics(0, 31 << 26)
+
+
+def test_pack_ivs():
+    """`pack_ivs` reverses `unpack_ivs`."""
+    genes = np.array([0x5EE9629C, 0x7FFF7FFF, 0], dtype=np.uint32)
+    assert genes.tolist() == personality.pack_ivs(personality.unpack_ivs(genes)).tolist()
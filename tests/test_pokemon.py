@@ -1,5 +1,32 @@
 """Tests for `pokemaster2.pokemon` module."""
-from pokemaster2.pokemon import Stats
+import os
+import subprocess  # noqa: S404
+import sys
+from unittest import mock
+
+from pokemaster2 import pokemon
+from pokemaster2.pokemon import BasePokemon, NatureModifiers, Stats, _calc_stats
+
+
+def _garchomp(**kwargs):
+    attributes = dict(
+        national_id=445,
+        species="garchomp",
+        types=["dragon", "ground"],
+        item_held=None,
+        exp=0,
+        level=78,
+        base_stats=Stats(108, 130, 95, 80, 85, 102),
+        iv=Stats(24, 12, 30, 16, 23, 5),
+        current_stats=Stats.zeros(),
+        ev=Stats(74, 190, 91, 48, 84, 23),
+        pid=0,
+        gender="male",
+        nature="adamant",
+        ability="sand-veil",
+    )
+    attributes.update(kwargs)
+    return BasePokemon(**attributes)
 
 
 def test_stats_add() -> None:
@@ -29,6 +56,83 @@ def test_stats_floor_division():
     assert Stats(0, 1, 2, 2, 3, 4) == Stats(2, 4, 6, 8, 10, 12) // Stats(3, 3, 3, 3, 3, 3)
 
 
+def test_nature_modifiers():
+    """Natures raise one stat by 10% and lower another by 10%."""
+    assert NatureModifiers(1, 1.1, 1, 0.9, 1, 1) == Stats.nature_modifiers("adamant")
+    assert NatureModifiers(1, 1, 1, 1, 1, 1) == Stats.nature_modifiers("serious")
+
+
+def test_pokemon_does_not_import_the_database():
+    """The core model does not depend on the database layer."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", "import sys, pokemaster2.pokemon; print(sorted(sys.modules))"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    assert "'peewee'" not in result.stdout
+    assert "'pokemaster2.db'" not in result.stdout
+
+
+def test_calc_stats():
+    """Garchomp from https://bulbapedia.bulbagarden.net/wiki/Stat#Example_2."""
+    stats = _calc_stats(
+        level=78,
+        base_stats=Stats(108, 130, 95, 80, 85, 102),
+        iv=Stats(24, 12, 30, 16, 23, 5),
+        ev=Stats(74, 190, 91, 48, 84, 23),
+        nature="adamant",
+    )
+    assert Stats(289, 278, 193, 135, 171, 171) == stats
+
+
+def test_base_pokemon_stats_are_lazy_and_cached():
+    garchomp = _garchomp()
+    assert garchomp.stale
+    with mock.patch.object(pokemon, "_calc_stats", wraps=_calc_stats) as calc_stats:
+        assert Stats(289, 278, 193, 135, 171, 171) == garchomp.stats
+        assert garchomp.stats is garchomp.stats
+        assert 1 == calc_stats.call_count
+        garchomp.item_held = "choice-band"
+        garchomp.stats
+        assert 1 == calc_stats.call_count
+
+
+def test_base_pokemon_stats_follow_their_inputs():
+    garchomp = _garchomp()
+    garchomp.stats
+    garchomp.level = 100
+    assert garchomp.stale
+    assert _calc_stats(100, garchomp.base_stats, garchomp.iv, garchomp.ev, "adamant") == (
+        garchomp.stats
+    )
+    garchomp.nature = "jolly"
+    assert garchomp.stats.spd > garchomp.stats.spatk
+    garchomp.gain_ev(Stats(0, 0, 0, 0, 0, 200))
+    assert garchomp.stale
+    assert 223 == garchomp.ev.spd
+    assert _calc_stats(100, garchomp.base_stats, garchomp.iv, garchomp.ev, "jolly") == (
+        garchomp.stats
+    )
+
+
+def test_refresh_only_recomputes_stale_stats():
+    population = [_garchomp(level=level) for level in range(1, 101)]
+    assert 100 == pokemon.refresh(population)
+    assert 0 == pokemon.refresh(population)
+    for member in population[::10]:
+        member.gain_ev(Stats(4, 0, 0, 0, 0, 0))
+    cached = population[1].stats
+    assert 10 == pokemon.refresh(population)
+    assert cached is population[1].stats
+    for member in population:
+        assert not member.stale
+        expected = _calc_stats(member.level, member.base_stats, member.iv, member.ev, "adamant")
+        assert expected == member.stats
+
+
 # @pytest.mark.xfail()
 # def test_base_pokemon_from_pokedex_by_id():
 #     """`BasePokemon` can be initialized from `pokedex` by national id."""
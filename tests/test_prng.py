@@ -4,10 +4,11 @@ The seed and the results are from the following link:
 https://www.smogon.com/ingame/rng/pid_iv_creation#pokemon_random_number_generator
 """
 
+import numpy as np
 import pytest
 from loguru import logger
 
-from pokemaster2.prng import PRNG
+from pokemaster2.prng import PRNG, MersenneTwister, lcg64_seeds, lcg_seeds, mt_outputs
 
 
 def test_prng_generation_3():
@@ -20,9 +21,11 @@ def test_prng_generation_3():
 
 
 def test_prng_generation_exception():
-    prng = PRNG(gen=4)
+    prng = PRNG(gen=6)
     with pytest.raises(ValueError):
         prng()
+    with pytest.raises(ValueError):
+        prng.next_array(1)
 
 
 def test_prng_default_seed_is_0():
@@ -47,3 +50,99 @@ def test_reset_prng():
 def test_pid_ivs_creation():
     prng = PRNG(0x560B9CE3)
     assert (0x7E482751, 0x5EE9629C) == prng.generate_pid_and_iv(method=2)
+
+
+def test_next_array():
+    prng = PRNG(0x1A56B091)
+    assert [0x01DB, 0x7B06, 0x5233, 0xE470] == prng.next_array(4).tolist()
+    assert prng() == 0x5CC4
+
+
+def test_jump():
+    prng = PRNG(0x1A56B091)
+    prng.jump(4)
+    assert prng() == 0x5CC4
+    prng.jump(100_000)
+    expected = PRNG(0x1A56B091)
+    expected.next_(100_005)
+    assert expected.seed == prng.seed
+
+
+def test_lcg_seeds_with_stride():
+    prng = PRNG(0x560B9CE3)
+    seeds = lcg_seeds(0x560B9CE3, 5, stride=3)
+    expected = []
+    for _ in range(5):
+        expected.append(prng.seed)
+        prng.next_(3)
+    assert expected == seeds.tolist()
+
+
+def test_prng_generation_4_uses_the_gen_3_lcg():
+    prng = PRNG(0x1A56B091, gen=4)
+    assert prng.next_(4) == [0x01DB, 0x7B06, 0x5233, 0xE470]
+
+
+def test_prng_generation_5():
+    seed = 0x0123456789ABCDEF
+    prng = PRNG(seed, gen=5)
+    expected = []
+    for _ in range(3):
+        seed = (0x5D588B656C078965 * seed + 0x269EC3) % 2**64
+        expected.append(seed >> 32)
+    assert prng.next_(3) == expected
+    assert prng.seed == seed
+    assert 0 <= prng.random() < 1
+    with pytest.raises(ValueError):
+        prng.generate_pid_and_iv(method=1)
+
+
+def test_prng_generation_5_array_and_jump():
+    prng = PRNG(0x0123456789ABCDEF, gen=5)
+    array = prng.next_array(1000)
+    expected = PRNG(0x0123456789ABCDEF, gen=5)
+    assert array.dtype == np.uint32
+    assert array.tolist() == expected.next_(1000)
+    assert prng.seed == expected.seed
+
+    prng.jump(100_000)
+    expected.next_(100_000)
+    assert prng.seed == expected.seed
+
+
+def test_lcg64_seeds_with_stride():
+    prng = PRNG(0x0123456789ABCDEF, gen=5)
+    expected = []
+    for _ in range(5):
+        expected.append(prng.seed)
+        prng.next_(3)
+    assert lcg64_seeds(0x0123456789ABCDEF, 5, stride=3).tolist() == expected
+
+
+def test_mersenne_twister_reference_outputs():
+    mt = MersenneTwister(5489)
+    assert mt.next_(3) == [3499211612, 581869302, 3890346734]
+    mt.jump(9996)
+    assert mt() == 4123659995
+    mt.reset()
+    assert mt() == 3499211612
+
+
+def test_mersenne_twister_array_matches_calls():
+    mt = MersenneTwister(0x1A56B091)
+    expected = MersenneTwister(0x1A56B091)
+    for n in (1, 623, 625, 2000):
+        assert mt.next_array(n).tolist() == [expected() for _ in range(n)]
+    mt.jump(624 * 3 - 1)
+    expected.next_(624 * 3 - 1)
+    assert mt() == expected()
+
+
+def test_mt_outputs():
+    seeds = np.array([[0, 5489], [0x1A56B091, 0xFFFFFFFF]], dtype=np.uint32)
+    outputs = mt_outputs(seeds, 5, skip=620)
+    assert outputs.shape == (2, 2, 5)
+    for seed, row in zip(seeds.ravel(), outputs.reshape(4, 5)):
+        mt = MersenneTwister(int(seed))
+        mt.jump(620)
+        assert row.tolist() == mt.next_(5)
@@ -0,0 +1,58 @@
+"""Tests for `pokemaster2.seeds` module."""
+import datetime
+
+from pokemaster2 import seeds
+from pokemaster2.pokemon import Stats
+from pokemaster2.prng import PRNG
+
+DATES = [datetime.date(2008, 3, 14), datetime.date(2008, 12, 31)]
+
+
+def test_initial_seeds():
+    # AB = (3 * 14 + 25 + 7) % 256 = 74, CD = 13, EFGH = 600 + 8.
+    assert [0x4A0D0260] == seeds.initial_seeds(2008, 3, 14, 13, 25, 7, [600]).tolist()
+
+
+def test_hits_match_prng_and_times():
+    """Every hit is reproduced by the scalar `PRNG` from one of its times."""
+    hits = list(
+        seeds.search(
+            2008, range(600, 620), frames=5, min_ivs=Stats(20, 0, 0, 0, 0, 20), dates=DATES
+        )
+    )
+    assert hits
+    for hit in hits[:20]:
+        assert hit.ivs.hp >= 20 and hit.ivs.spd >= 20
+        prng = PRNG(hit.seed, gen=4)
+        prng.next_(hit.frame - 1)
+        assert (hit.pid, hit.gene) == prng.generate_pid_and_iv(method=1)
+        time = next(hit.times(DATES))
+        assert time.date() in DATES and time.hour == hit.hour
+        seed = seeds.initial_seeds(
+            2008, time.month, time.day, time.hour, time.minute, time.second, hit.delay
+        )
+        assert hit.seed == seed
+
+
+def test_hits_do_not_depend_on_chunks_or_workers():
+    kwargs = dict(frames=3, min_ivs=Stats(25, 25, 0, 0, 0, 0), natures=["adamant"])
+    single = sorted(seeds.search(2008, range(500, 540), chunk_size=40, **kwargs), key=str)
+    assert single
+    assert single == sorted(seeds.search(2008, range(500, 540), chunk_size=7, **kwargs), key=str)
+    assert single == sorted(
+        seeds.search(2008, range(500, 540), chunk_size=10, workers=2, **kwargs), key=str
+    )
+
+
+def test_natures_and_shininess():
+    (hit,) = seeds.best(seeds.search(2008, [700], hours=[5], natures=["jolly"]), 1)
+    assert hit.nature == "jolly"
+    tid = (hit.pid >> 16) ^ (hit.pid & 0xFFFF)
+    assert hit in seeds.search(2008, [700], hours=[5], tid=tid, sid=0)
+
+
+def test_best_ranks_by_ivs_then_frame():
+    hits = seeds.best(seeds.search(2008, range(600, 610), frames=4, hours=[0]), 5)
+    assert [hit.rank for hit in hits] == sorted(hit.rank for hit in hits)
+    totals = [sum(vars(hit.ivs).values()) for hit in hits]
+    assert totals == sorted(totals, reverse=True)